@@ -28,6 +28,36 @@ MAKE_PLOTS = True  # True = Plots anzeigen, False = ohne Plots laufen lassen
 FIG_DIR = PROJECT_ROOT / "output" / "figures"
 FIG_DIR.mkdir(parents=True, exist_ok=True)  # falls du später speichern willst
 
+# Geodaten-Karte (src/geodata_merit_order) nach dem Lauf direkt mit den Ergebnissen
+# im Speicher öffnen - ohne die Excel-Datei wieder einzulesen.
+SHOW_MAP = False
+# Szenario der Karte (Schlüssel aus geodata_merit_order/config.py, z.B. "z4_diff");
+# None = SCENARIO in Kleinbuchstaben
+MAP_SCENARIO = None
+
+# =============================================================================
+# Cache-Einstellungen
+# =============================================================================
+# Geparste SMARD-Dateien als Parquet zwischenspeichern (braucht pyarrow).
+# Schlüssel: Pfad, Dateigröße, mtime, Inhalts-Hash -> geänderte Dateien werden neu gelesen.
+USE_SMARD_CACHE = True
+CACHE_DIR = PROJECT_ROOT / "output" / "cache"
+
+# Stage-Cache für main.py (stage_cache.py): Ergebnis jeder Stufe (Einlesen, Szenario/Stacks,
+# Insel, Coupling, KPIs, Export) wird unter einem Schlüssel aus ihren Eingaben abgelegt
+# (Vorstufe, gelesene Config-Werte, Quellcode, Eingabedateien). Ein neuer Lauf rechnet nur,
+# was sich geändert hat - z.B. nur NTC_SCENARIO geändert -> nur Coupling, KPIs, Export.
+# Belegt Platz unter STAGE_CACHE_DIR (ganze Zeitreihen je Stufe) -> standardmäßig aus.
+USE_STAGE_CACHE = False
+STAGE_CACHE_DIR = CACHE_DIR / "stages"
+# Aufräumen nach jedem Lauf: Einträge, die so lange nicht benutzt wurden, werden gelöscht;
+# danach die ältesten, bis der Ordner höchstens STAGE_CACHE_MAX_MB groß ist (None = keine Grenze)
+STAGE_CACHE_MAX_AGE_DAYS = 30
+STAGE_CACHE_MAX_MB = 5000
+
+# Anzahl Prozesse für das Einlesen der SMARD-Dateien (1 = nacheinander, 4 = eine Zone pro Prozess)
+INGEST_WORKERS = 4
+
 # =============================================================================
 # 1) Szenario-Auswahl
 # =============================================================================
@@ -39,14 +69,35 @@ FIG_DIR.mkdir(parents=True, exist_ok=True)  # falls du später speichern willst
 # - "NS_COUPLED"  : Nord/Süd mit Handel (LP)
 SCENARIO = "Z4_INSEL"
 
+# Batch-Lauf (python main.py --batch bzw. main.run_batch()): diese Szenarien in einem
+# Lauf rechnen; SMARD-Zeitreihen und Kraftwerkslisten werden nur einmal geladen.
+BATCH_SCENARIOS = ["DE_SINGLE", "Z4_INSEL", "Z4_COUPLED", "NS_INSEL", "NS_COUPLED"]
+# Anzahl Prozesse im Batch (1 = nacheinander; >1 = Szenarien parallel, Coupling dann seriell)
+BATCH_WORKERS = 3
+
 # Zeitauflösung: "15min" oder "h"
 TIME_FREQ = "15min"
 
+# Zeitraum (lokale Zeit Europe/Berlin, Ende exklusiv). None = alles, was in den Dateien steht.
+# Beispiel: TIME_START = "2024-01-01", TIME_END = "2024-07-01"
+TIME_START = None
+TIME_END = None
+
+# Jahres-partitionierter Zeitreihen-Speicher (Parquet, braucht pyarrow):
+# Die SMARD-Dateien werden einmal pro Zone und Jahr abgelegt; ein Lauf liest dann nur
+# die Jahre, die TIME_START..TIME_END berührt (z.B. für mehrjährige Backtests).
+USE_TS_STORE = False
+TS_STORE_DIR = PROJECT_ROOT / "output" / "store"
+
 
 # =============================================================================
 # 2) SMARD Input-Dateien (4 ÜNB)
 # =============================================================================
 # Diese Dateien müssen in data/smard liegen.
+# Statt .xlsx können auch die SMARD-CSV-Exports (";" getrennt, deutsches Zahlenformat)
+# eingetragen werden -> Dateiendung .csv wird automatisch erkannt (deutlich schneller).
+# Mehrere Jahre: load_xlsx / gen_xlsx dürfen auch Listen sein (z.B. ein Export pro Jahr,
+# gleiche Reihenfolge in beiden Listen). Die Zeitachse kommt aus "Datum von".
 ZONES_4 = {
     "TransnetBW": {
         "load_xlsx": SMARD_DIR / "Realisierter_Stromverbrauch_202401010000_202501010000_Viertelstunde_TransnetBW.xlsx",
@@ -152,6 +203,25 @@ NTC_BASE_MID = {
 DEFAULT_TRADE_COST = 5.0
 EDGE_TRADE_COSTS = {}  # optional: {("A","B"): cost}
 
+# LP-Blockgröße: wie viele Zeitschritte in EIN (blockdiagonales) LP gestapelt werden
+# - 1  : ein LP pro Zeitschritt (klassisch, Standard)
+# - 96 : ein Tag bei 15min (bzw. 4 Tage bei "h"), ca. 1.5-2x schneller
+# Dualpreise bleiben gleich; bei mehreren gleich teuren Optima kann der Dispatch
+# (Erzeugung, Flüsse, Unserved) und damit price_eur_mwh / price_molike abweichen.
+COUPLING_BLOCK_SIZE = 1
+
+# LP-Solver:
+# - "linprog" : scipy.optimize.linprog (blockweise, siehe COUPLING_BLOCK_SIZE)
+# - "highs"   : persistentes HiGHS-Modell mit Warmstart (deutlich schneller, braucht highspy);
+#               gleiche Dualpreise wie "linprog", aber an degenerierten Zeitschritten kann der
+#               Dispatch und damit price_eur_mwh / price_molike abweichen (auch je nach COUPLING_WORKERS)
+# - "radial"  : Clearing ohne LP für baumförmige NTC-Netze (z.B. NS), sonst Fallback auf "linprog"
+COUPLING_SOLVER = "linprog"
+
+# Anzahl Prozesse für das Coupling (1 = seriell). Die Zeitachse wird in
+# zusammenhängende Chunks geteilt und parallel gelöst.
+COUPLING_WORKERS = 1
+
 
 # =============================================================================
 # 8) Nord/Süd-Shares (TenneT-Split gemäß Screenshot)
@@ -175,7 +245,30 @@ NS_TRADE_COST = 5.0
 
 
 # =============================================================================
-# 9) Output-Dateiname
+# 9) Output-Dateiname + Export-Formate
+# =============================================================================
+# Beliebige Kombination aus:
+# - "xlsx"    : Excel wie bisher (bei 15min langsam, hält die ganze Mappe im Speicher)
+# - "xlsx_stream": dieselbe Excel-Datei, zeilenweise per xlsxwriter (constant_memory),
+#                  Speicher bleibt flach -> für große/mehrjährige 15min-Exports (mit "xlsx" -> ValueError)
+# - "parquet" : ein File pro Tabelle + manifest.json in <Name>_parquet/ (braucht pyarrow)
+# - "feather" : wie parquet, nur Feather (<Name>_feather/)
+# Laden z.B. im Notebook: export_excel.load_results(".../UENB_Model_h_Z4_COUPLED_parquet")
+EXPORT_FORMATS = ["xlsx"]
+
+
+# =============================================================================
+# 10) Laufzeit-Protokoll
 # =============================================================================
-def out_xlsx_name() -> str:
-    return str(OUT_DIR / f"UENB_Model_{TIME_FREQ}_{SCENARIO}.xlsx")
+# Dauer und Speicher (RSS/Peak-RSS) je Stufe plus Statistik der einzelnen LP-Lösungen
+# -> <Excel-Name>_profile.json neben dem Export (zum Vergleichen zwischen Versionen).
+# Standardmäßig aus (zusätzliche Ausgabedatei pro Lauf).
+PROFILE_RUN = False
+# zusätzlich Python-Speicher-Peak je Stufe über tracemalloc (genauer, aber deutlich langsamer -
+# Einlesen ~5x, Coupling mit linprog ein Vielfaches davon)
+PROFILE_TRACEMALLOC = False
+# zusätzlich <Excel-Name>_trace.json zum Ansehen in chrome://tracing oder ui.perfetto.dev
+PROFILE_CHROME_TRACE = False
+
+def out_xlsx_name(scenario=None) -> str:
+    return str(OUT_DIR / f"UENB_Model_{TIME_FREQ}_{scenario or SCENARIO}.xlsx")
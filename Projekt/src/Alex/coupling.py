@@ -13,190 +13,545 @@ ee_used + sum(g) + imports - exports + unserved = load
 
 Preisreporting:
 - Dualpreis (Schattenpreis) oder MO-like Proxy (aus Dispatch)
+
+Lösungsmodi:
+- block_size = 1 : ein linprog-Aufruf pro Zeitschritt (klassisch)
+- block_size > 1 : block_size Zeitschritte werden zu EINEM dünnbesetzten,
+  blockdiagonalen LP gestapelt. Die Zeitschritte sind unabhängig, daher
+  sind Zielfunktion und Dualpreise pro Zeitschritt dieselben; bei
+  degenerierten Zeitschritten (mehrere gleich teure Optima) kann der Solver
+  aber einen anderen Dispatch wählen -> Flüsse, Unserved und der MO-like
+  Preis können abweichen. Spart den Python-/HiGHS-Overhead pro Aufruf.
+- solver="highs" : ein persistentes HiGHS-Modell; pro Zeitschritt ändern
+  sich nur EE-Schranken und Last (RHS), gelöst wird mit Warmstart. Gleiche
+  Zielfunktion und Dualpreise wie linprog; an degenerierten Zeitschritten
+  hängt das gewählte Optimum (Dispatch, MO-like Preis) aber von der
+  Warmstart-Basis ab, also auch von der Chunk-Aufteilung (workers).
+- solver="radial": kombinatorisches Clearing ohne LP für baumförmige
+  NTC-Netze (siehe radial.py), vermaschte Netze fallen auf das LP zurück.
+- workers > 1    : die Zeitachse wird in zusammenhängende Chunks geteilt,
+  die parallel in einem Prozesspool gelöst werden.
 """
 
+from time import perf_counter
+
 import numpy as np
 import pandas as pd
 
+import profiling
+from radial import edges_form_forest, solve_radial
+from supply_curve import SupplyCurve
 
-def run_market_coupling(
-    zones, zone_ts, zone_plants, ntc_edges, dt_hours,
-    voll: float,
-    scarcity_pricing_in_price: bool,
-    price_nan_when_no_conv: bool,
-    reserve_price_max: bool
-):
-    """
-    Löst pro Zeitschritt ein LP mit scipy.optimize.linprog.
-    Gibt DataFrame 'coupled' zurück.
-    """
+
+def _import_linprog():
     try:
         from scipy.optimize import linprog
     except Exception as e:
         raise ImportError("Für Market Coupling brauchst du scipy: pip install scipy") from e
+    return linprog
+
+
+def supply_segments_for(plants_info) -> SupplyCurve:
+    """
+    Konventionelle Segmente einer Zone als SupplyCurve (nach mc sortiert,
+    nur cap > 0 und vorhandenes mc). Nutzt die Kurve aus plants, wenn vorhanden.
+    """
+    if "curve" in plants_info:
+        return plants_info["curve"]
+    return SupplyCurve.from_frame(plants_info["plants_stack"])
+
+
+def build_lp_layout(zones, supply, ntc_edges, voll: float) -> dict:
+    """
+    Baut die zeitunabhängige Struktur des LP eines Zeitschritts.
+
+    Variablenvektor x:
+    [ee_used_z, g_zk..., unserved_z] für alle z
+    plus [flows...] für alle gerichteten Kanten
 
-    # Konventionelle Segmente pro Zone (cap, mc)
-    def supply_segments_for(z):
-        ps = zone_plants[z]["plants_stack"].copy()
-        ps = ps.dropna(subset=["cap_mw", "mc"])
-        ps = ps[ps["cap_mw"] > 0].sort_values("mc").reset_index(drop=True)
-        return list(zip(ps["cap_mw"].to_numpy(), ps["mc"].to_numpy()))
-
-    supply = {z: supply_segments_for(z) for z in zones}
-
-    # Hilfsfunktion: "MO-like" Preis aus tatsächlich genutzten Segmenten
-    def molike_price_from_dispatch(z, x, idx_g, supply_segments, eps=1e-6):
-        used_mcs = []
-        for local_i, var_i in enumerate(idx_g[z]):
-            if float(x[var_i]) > eps:
-                used_mcs.append(float(supply_segments[z][local_i][1]))
-        return float(max(used_mcs)) if used_mcs else np.nan
-
-    time_index = zone_ts[zones[0]].index
-    rows = []
-
-    for t in time_index:
-        # Last und EE-Verfügbarkeit (MW)
-        L = {z: float(zone_ts[z].loc[t, "load_mw"]) for z in zones}
-        EE_av = {z: float(zone_ts[z].loc[t, "vre_mw"]) for z in zones}
-
-        # Wir bauen LP-Variablen als Vektor x:
-        # [ee_used_z, g_zk..., unserved_z] für alle z
-        # plus [flows...] für alle gerichteten Kanten
-        var_names, bounds, c = [], [], []
-
-        idx_ee = {}
-        idx_unserved = {}
-        idx_g = {z: [] for z in zones}
-        idx_flow = {}
-
-        # --- Variablen pro Zone ---
-        for z in zones:
-            # EE Nutzung (0..EE_av)
-            idx_ee[z] = len(var_names)
-            var_names.append(f"ee_used_{z}")
-            bounds.append((0.0, EE_av[z]))
-            c.append(0.0)
-
-            # Konventionelle Segmente
-            for k, (cap, mc) in enumerate(supply[z]):
-                idx_g[z].append(len(var_names))
-                var_names.append(f"g_{z}_{k}")
-                bounds.append((0.0, float(cap)))
-                c.append(float(mc))
-
-            # Unserved (sehr teuer)
-            idx_unserved[z] = len(var_names)
-            var_names.append(f"unserved_{z}")
-            bounds.append((0.0, None))
-            c.append(float(voll))
-
-        # --- Flussvariablen pro Kante (a->b) ---
+    Zeitabhängig sind nur die oberen Schranken von ee_used_z (EE_av)
+    und die rechte Seite der Bilanz (Last). Alles andere steht hier.
+    """
+    var_names, lb, ub, c = [], [], [], []
+
+    idx_ee = {}
+    idx_unserved = {}
+    idx_g = {z: [] for z in zones}
+    idx_flow = {}
+
+    # --- Variablen pro Zone ---
+    for z in zones:
+        # EE Nutzung (0..EE_av) -> Schranke wird pro Zeitschritt gesetzt
+        idx_ee[z] = len(var_names)
+        var_names.append(f"ee_used_{z}")
+        lb.append(0.0)
+        ub.append(0.0)
+        c.append(0.0)
+
+        # Konventionelle Segmente
+        for k, (cap, mc) in enumerate(zip(supply[z].cap, supply[z].mc)):
+            idx_g[z].append(len(var_names))
+            var_names.append(f"g_{z}_{k}")
+            lb.append(0.0)
+            ub.append(float(cap))
+            c.append(float(mc))
+
+        # Unserved (sehr teuer)
+        idx_unserved[z] = len(var_names)
+        var_names.append(f"unserved_{z}")
+        lb.append(0.0)
+        ub.append(np.inf)
+        c.append(float(voll))
+
+    # --- Flussvariablen pro Kante (a->b) ---
+    for (a, b, ntc, tc) in ntc_edges:
+        idx_flow[(a, b)] = len(var_names)
+        var_names.append(f"f_{a}_to_{b}")
+        lb.append(0.0)
+        ub.append(float(ntc))
+        c.append(float(tc))
+
+    n = len(var_names)
+
+    # --- Bilanzmatrix A_eq (eine Zeile pro Zone) ---
+    A_eq = np.zeros((len(zones), n))
+    for i, z in enumerate(zones):
+        # lokale Quellen
+        A_eq[i, idx_ee[z]] = 1.0
+        for gi in idx_g[z]:
+            A_eq[i, gi] = 1.0
+        A_eq[i, idx_unserved[z]] = 1.0
+
+        # Flüsse: Import +, Export -
         for (a, b, ntc, tc) in ntc_edges:
-            idx_flow[(a, b)] = len(var_names)
-            var_names.append(f"f_{a}_to_{b}")
-            bounds.append((0.0, float(ntc)))
-            c.append(float(tc))
-
-        n = len(var_names)
-
-        # --- Bilanzgleichungen A_eq x = b_eq ---
-        A_eq, b_eq = [], []
-        for z in zones:
-            row = np.zeros(n)
-
-            # lokale Quellen
-            row[idx_ee[z]] = 1.0
-            for gi in idx_g[z]:
-                row[gi] = 1.0
-            row[idx_unserved[z]] = 1.0
-
-            # Flüsse: Import +, Export -
-            for (a, b, ntc, tc) in ntc_edges:
-                if b == z:
-                    row[idx_flow[(a, b)]] += 1.0
-                if a == z:
-                    row[idx_flow[(a, b)]] -= 1.0
-
-            A_eq.append(row)
-            b_eq.append(L[z])
-
-        A_eq = np.vstack(A_eq)
-        b_eq = np.array(b_eq)
-
-        # --- LP lösen ---
-        res = linprog(c=c, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method="highs")
+            if b == z:
+                A_eq[i, idx_flow[(a, b)]] += 1.0
+            if a == z:
+                A_eq[i, idx_flow[(a, b)]] -= 1.0
+
+    return {
+        "n": n,
+        "var_names": var_names,
+        "c": np.array(c, dtype=float),
+        "lb": np.array(lb, dtype=float),
+        "ub": np.array(ub, dtype=float),
+        "A_eq": A_eq,
+        "idx_ee": idx_ee,
+        "idx_g": idx_g,
+        "idx_unserved": idx_unserved,
+        "idx_flow": idx_flow,
+    }
+
+
+def _zone_arrays(zones, zone_ts, time_index):
+    """Last und EE-Verfügbarkeit (MW) als Arrays (T x Zonen)."""
+    L = np.column_stack([
+        zone_ts[z]["load_mw"].reindex(time_index).to_numpy(dtype=float) for z in zones
+    ])
+    EE_av = np.column_stack([
+        zone_ts[z]["vre_mw"].reindex(time_index).to_numpy(dtype=float) for z in zones
+    ])
+    return L, EE_av
+
+
+def _solve_stepwise(layout, zones, time_index, L, EE_av):
+    """Ein linprog-Aufruf pro Zeitschritt. Gibt X (T x n) und Duals (T x Zonen) zurück."""
+    linprog = _import_linprog()
+
+    n = layout["n"]
+    ee_cols = [layout["idx_ee"][z] for z in zones]
+    X = np.empty((len(time_index), n))
+    duals = np.full((len(time_index), len(zones)), np.nan)
+
+    ub = layout["ub"].copy()
+    for i, t in enumerate(time_index):
+        ub[ee_cols] = EE_av[i]
+        bounds = np.column_stack([layout["lb"], ub])
+
+        t0 = perf_counter()
+        res = linprog(c=layout["c"], A_eq=layout["A_eq"], b_eq=L[i], bounds=bounds, method="highs")
+        profiling.record("lp_solve", t0)
         if not res.success:
             raise RuntimeError(f"LP failed at {t}: {res.message}")
 
-        x = res.x
-        out = {"time": t}
-
-        # --- Ergebnisse pro Zone ---
-        for z in zones:
-            ee_used = float(x[idx_ee[z]])
-            gen_conv = float(sum(x[gi] for gi in idx_g[z]))
-            unserved = float(x[idx_unserved[z]])
-            curtail = float(max(EE_av[z] - ee_used, 0.0))
-
-            imp = 0.0
-            exp = 0.0
-            for (a, b, ntc, tc) in ntc_edges:
-                f = float(x[idx_flow[(a, b)]])
-                if b == z:
-                    imp += f
-                if a == z:
-                    exp += f
-
-            out[f"{z}_ee_used_mw"] = ee_used
-            out[f"{z}_curtail_mw"] = curtail
-            out[f"{z}_gen_conv_mw"] = gen_conv
-            out[f"{z}_unserved_mw"] = unserved
-            out[f"{z}_import_mw"] = imp
-            out[f"{z}_export_mw"] = exp
-
-        # --- Preisberechnung: Dual vs MO-like ---
-        # A) Dualpreise (Schattenpreise der Bilanzrestriktionen)
-        dual_price = {}
+        X[i] = res.x
         try:
-            duals = res.eqlin.marginals
-            for i, z in enumerate(zones):
-                dual_price[z] = float(duals[i])
+            duals[i] = res.eqlin.marginals
         except Exception:
-            for z in zones:
-                dual_price[z] = np.nan
-
-        # B) MO-like Preis
-        mo_like_price = {}
-        for z in zones:
-            unserved = float(x[idx_unserved[z]])
-            conv_gen = float(sum(x[gi] for gi in idx_g[z]))
-
-            if unserved > 1e-6:
-                # Unserved -> nicht VOLL (wenn scarcity_pricing_in_price=False),
-                # sondern "Insel-Fallback" (Reserve max oder max overall).
-                max_mc_res = zone_plants[z]["max_mc_reserve"]
-                max_mc_all = zone_plants[z]["max_mc_all"]
-
-                if reserve_price_max and not np.isnan(max_mc_res):
-                    mo_like_price[z] = float(max_mc_res)
-                else:
-                    mo_like_price[z] = float(max_mc_all) if not np.isnan(max_mc_all) else np.nan
-            else:
-                if conv_gen > 1e-6:
-                    mo_like_price[z] = molike_price_from_dispatch(z, x, idx_g, supply)
-                else:
-                    # nur EE / keine konv. Erzeugung
-                    mo_like_price[z] = np.nan if price_nan_when_no_conv else 0.0
+            pass
 
-        # Reporteter Preis je nach Schalter
-        for z in zones:
-            out[f"{z}_price_eur_mwh"] = dual_price[z] if scarcity_pricing_in_price else mo_like_price[z]
-            # Debug: beide Preisreihen mitschreiben
-            out[f"{z}_price_dual_eur_mwh"] = dual_price[z]
-            out[f"{z}_price_molike_eur_mwh"] = mo_like_price[z]
+    return X, duals
+
+
+def _solve_batched(layout, zones, time_index, L, EE_av, block_size: int):
+    """
+    Stapelt jeweils block_size Zeitschritte zu einem blockdiagonalen LP:
+      A_block = diag(A_eq, ..., A_eq), c/Schranken gekachelt.
+    Da die Blöcke nicht gekoppelt sind, ist das Optimum des Block-LP
+    genau die Menge der Einzeloptima.
+    """
+    linprog = _import_linprog()
+    try:
+        from scipy import sparse
+    except Exception as e:
+        raise ImportError("Für Market Coupling brauchst du scipy: pip install scipy") from e
+
+    n = layout["n"]
+    nz = len(zones)
+    ee_cols = np.array([layout["idx_ee"][z] for z in zones])
+    A_sparse = sparse.csr_matrix(layout["A_eq"])
+
+    T = len(time_index)
+    X = np.empty((T, n))
+    duals = np.full((T, nz), np.nan)
+
+    for start in range(0, T, block_size):
+        stop = min(start + block_size, T)
+        k = stop - start
+
+        A_block = sparse.kron(sparse.identity(k, format="csr"), A_sparse, format="csr")
+        c_block = np.tile(layout["c"], k)
+        lb_block = np.tile(layout["lb"], k)
+        ub_block = np.tile(layout["ub"], (k, 1))
+        ub_block[:, ee_cols] = EE_av[start:stop]
+        b_block = L[start:stop].ravel()
+
+        t0 = perf_counter()
+        res = linprog(
+            c=c_block, A_eq=A_block, b_eq=b_block,
+            bounds=np.column_stack([lb_block, ub_block.ravel()]),
+            method="highs",
+        )
+        profiling.record("lp_solve_block", t0)
+        if not res.success:
+            raise RuntimeError(
+                f"LP failed in block {time_index[start]} .. {time_index[stop - 1]}: {res.message}"
+            )
+
+        X[start:stop] = res.x.reshape(k, n)
+        try:
+            duals[start:stop] = np.asarray(res.eqlin.marginals).reshape(k, nz)
+        except Exception:
+            pass
+
+    return X, duals
+
+
+def _solve_highs_persistent(layout, zones, time_index, L, EE_av):
+    """
+    Baut das LP EINMAL direkt über die HiGHS-API (highspy) und ändert pro
+    Zeitschritt nur die EE-Schranken und die rechte Seite der Bilanz.
+    HiGHS startet dann vom Basis-Optimum des Vorgängers (Warmstart):
+    aufeinanderfolgende Viertelstunden brauchen nur wenige Simplex-Iterationen.
+    """
+    try:
+        import highspy
+    except Exception as e:
+        raise ImportError("Für solver='highs' brauchst du highspy: pip install highspy") from e
+
+    n = layout["n"]
+    nz = len(zones)
+    A = layout["A_eq"]
+
+    # Spaltenweise (CSC) Matrix für HiGHS
+    start, index, value = [0], [], []
+    for j in range(n):
+        rows = np.nonzero(A[:, j])[0]
+        index.extend(rows.tolist())
+        value.extend(A[rows, j].tolist())
+        start.append(len(index))
+
+    lp = highspy.HighsLp()
+    lp.num_col_ = n
+    lp.num_row_ = nz
+    lp.col_cost_ = layout["c"]
+    lp.col_lower_ = layout["lb"]
+    lp.col_upper_ = np.where(np.isinf(layout["ub"]), highspy.kHighsInf, layout["ub"])
+    lp.row_lower_ = np.zeros(nz)
+    lp.row_upper_ = np.zeros(nz)
+    lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+    lp.a_matrix_.start_ = np.array(start, dtype=np.int32)
+    lp.a_matrix_.index_ = np.array(index, dtype=np.int32)
+    lp.a_matrix_.value_ = np.array(value, dtype=float)
+
+    h = highspy.Highs()
+    h.setOptionValue("output_flag", False)
+    h.passModel(lp)
+
+    ee_cols = np.array([layout["idx_ee"][z] for z in zones], dtype=np.int32)
+    ee_lower = np.zeros(nz)
+    rows = np.arange(nz, dtype=np.int32)
+
+    X = np.empty((len(time_index), n))
+    duals = np.full((len(time_index), nz), np.nan)
+
+    for i, t in enumerate(time_index):
+        t0 = perf_counter()
+        h.changeColsBounds(nz, ee_cols, ee_lower, EE_av[i])
+        h.changeRowsBounds(nz, rows, L[i], L[i])
+        h.run()
+        profiling.record("lp_solve", t0)
+
+        status = h.getModelStatus()
+        if status != highspy.HighsModelStatus.kOptimal:
+            raise RuntimeError(f"LP failed at {t}: {h.modelStatusToString(status)}")
+
+        sol = h.getSolution()
+        X[i] = sol.col_value
+        if sol.dual_valid:
+            duals[i] = sol.row_dual
+
+    return X, duals
+
+
+def _solve(layout, zones, time_index, L, EE_av, solver: str, block_size: int):
+    """Verteilt auf den gewählten Lösungsmodus. Gibt X (T x n) und Duals (T x Zonen) zurück."""
+    if solver == "highs":
+        return _solve_highs_persistent(layout, zones, time_index, L, EE_av)
+    if int(block_size) == 1:
+        return _solve_stepwise(layout, zones, time_index, L, EE_av)
+    return _solve_batched(layout, zones, time_index, L, EE_av, int(block_size))
+
+
+# -----------------------------------------------------------------------------
+# Parallel: Zeitachse in zusammenhängende Chunks, ein Chunk pro Task
+# -----------------------------------------------------------------------------
+# Zustand pro Worker-Prozess. Wird EINMAL im Initializer gesetzt, damit
+# Supply-Segmente und NTC-Kanten nicht mit jedem Task übertragen werden.
+_WORKER = {}
+
+
+def _init_worker(zones, supply, ntc_edges, voll, solver, block_size):
+    _WORKER["zones"] = zones
+    _WORKER["layout"] = build_lp_layout(zones, supply, ntc_edges, voll)
+    _WORKER["solver"] = solver
+    _WORKER["block_size"] = block_size
+
+
+def _solve_chunk(time_index, L, EE_av):
+    return _solve(
+        _WORKER["layout"], _WORKER["zones"], time_index, L, EE_av,
+        _WORKER["solver"], _WORKER["block_size"],
+    )
+
+
+def _chunk_bounds(T: int, workers: int, block_size: int) -> list:
+    """
+    Teilt 0..T in höchstens `workers` zusammenhängende Chunks.
+    Chunkgrenzen liegen auf Vielfachen von block_size, damit die
+    Blöcke exakt dieselben sind wie im seriellen Lauf.
+    """
+    n_blocks = -(-T // block_size)
+    blocks_per_chunk = -(-n_blocks // workers)
+    step = blocks_per_chunk * block_size
+    return [(s, min(s + step, T)) for s in range(0, T, step)]
+
+
+def _solve_parallel(zones, supply, ntc_edges, voll, time_index, L, EE_av,
+                    solver: str, block_size: int, workers: int):
+    from concurrent.futures import ProcessPoolExecutor
+
+    n = build_lp_layout(zones, supply, ntc_edges, voll)["n"]
+    X = np.empty((len(time_index), n))
+    duals = np.empty((len(time_index), len(zones)))
+
+    bounds = _chunk_bounds(len(time_index), workers, block_size)
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(zones, supply, ntc_edges, voll, solver, block_size),
+    ) as pool:
+        futures = [
+            pool.submit(_solve_chunk, time_index[s:e], L[s:e], EE_av[s:e])
+            for (s, e) in bounds
+        ]
+        # Ergebnisse in Chunk-Reihenfolge wieder zusammensetzen
+        for (s, e), fut in zip(bounds, futures):
+            X[s:e], duals[s:e] = fut.result()
 
-        rows.append(out)
+    return X, duals
 
-    coupled = pd.DataFrame(rows).set_index("time")
+
+def build_coupled_frame(
+    time_index, zones, zone_res, duals, EE_av, zone_plants,
+    scarcity_pricing_in_price: bool,
+    price_nan_when_no_conv: bool,
+    reserve_price_max: bool,
+    eps: float = 1e-6,
+) -> pd.DataFrame:
+    """
+    Baut das 'coupled'-DataFrame (eine Zeile pro Zeitschritt) aus
+    Mengen pro Zone und den Dualpreisen (T x Zonen).
+
+    zone_res[z] enthält Arrays (Länge T):
+    - ee_used, gen_conv, unserved, import, export
+    - max_used_mc: höchstes mc der genutzten Segmente (NaN wenn keins)
+    """
+    out = {}
+
+    # --- Ergebnisse pro Zone ---
+    for j, z in enumerate(zones):
+        r = zone_res[z]
+        out[f"{z}_ee_used_mw"] = r["ee_used"]
+        out[f"{z}_curtail_mw"] = np.maximum(EE_av[:, j] - r["ee_used"], 0.0)
+        out[f"{z}_gen_conv_mw"] = r["gen_conv"]
+        out[f"{z}_unserved_mw"] = r["unserved"]
+        out[f"{z}_import_mw"] = r["import"]
+        out[f"{z}_export_mw"] = r["export"]
+
+    # --- Preisberechnung: Dual vs MO-like ---
+    for j, z in enumerate(zones):
+        r = zone_res[z]
+
+        # A) Dualpreise (Schattenpreise der Bilanzrestriktionen)
+        dual_price = duals[:, j]
+
+        # B) MO-like Preis aus tatsächlich genutzten Segmenten
+        # nur EE / keine konv. Erzeugung
+        no_conv_price = np.nan if price_nan_when_no_conv else 0.0
+        molike = np.where(r["gen_conv"] > eps, r["max_used_mc"], no_conv_price)
+
+        # Unserved -> nicht VOLL (wenn scarcity_pricing_in_price=False),
+        # sondern "Insel-Fallback" (Reserve max oder max overall).
+        max_mc_res = zone_plants[z]["max_mc_reserve"]
+        max_mc_all = zone_plants[z]["max_mc_all"]
+        if reserve_price_max and not np.isnan(max_mc_res):
+            fallback = float(max_mc_res)
+        else:
+            fallback = float(max_mc_all) if not np.isnan(max_mc_all) else np.nan
+        molike = np.where(r["unserved"] > eps, fallback, molike)
+
+        # Reporteter Preis je nach Schalter
+        out[f"{z}_price_eur_mwh"] = dual_price if scarcity_pricing_in_price else molike
+        # Debug: beide Preisreihen mitschreiben
+        out[f"{z}_price_dual_eur_mwh"] = dual_price
+        out[f"{z}_price_molike_eur_mwh"] = molike
+
+    coupled = pd.DataFrame(out, index=pd.Index(time_index, name="time"))
     return coupled
+
+
+def zone_results_from_solution(X, zones, ntc_edges, layout, supply, eps: float = 1e-6) -> dict:
+    """
+    Wertet die LP-Lösungen (X: T x n) vektorisiert aus:
+    Mengen pro Zone + höchstes mc der genutzten Segmente.
+    """
+    zone_res = {}
+    for z in zones:
+        g = X[:, layout["idx_g"][z]]
+
+        imp = np.zeros(len(X))
+        exp = np.zeros(len(X))
+        for (a, b, ntc, tc) in ntc_edges:
+            f = X[:, layout["idx_flow"][(a, b)]]
+            if b == z:
+                imp += f
+            if a == z:
+                exp += f
+
+        # höchstes mc der Segmente mit g > eps
+        mcs = supply[z].mc
+        used = g > eps
+        if len(mcs):
+            max_used_mc = np.where(used, mcs, -np.inf).max(axis=1)
+            max_used_mc = np.where(used.any(axis=1), max_used_mc, np.nan)
+        else:
+            max_used_mc = np.full(len(X), np.nan)
+
+        zone_res[z] = {
+            "ee_used": X[:, layout["idx_ee"][z]],
+            "gen_conv": g.sum(axis=1),
+            "unserved": X[:, layout["idx_unserved"][z]],
+            "import": imp,
+            "export": exp,
+            "max_used_mc": max_used_mc,
+        }
+    return zone_res
+
+
+def run_market_coupling(
+    zones, zone_ts, zone_plants, ntc_edges, dt_hours,
+    voll: float,
+    scarcity_pricing_in_price: bool,
+    price_nan_when_no_conv: bool,
+    reserve_price_max: bool,
+    block_size: int = 1,
+    solver: str = "linprog",
+    workers: int = 1,
+):
+    """
+    Löst das Market-Coupling-LP für alle Zeitschritte.
+
+    solver:
+    - "linprog" -> scipy.optimize.linprog (HiGHS), siehe block_size
+    - "highs"   -> ein persistentes HiGHS-Modell, pro Zeitschritt nur
+                   Schranken/RHS ändern + Warmstart (braucht highspy)
+    - "radial"  -> kombinatorisches Clearing ohne LP (radial.py), alle
+                   Zeitschritte auf einmal. Nur für baumförmige NTC-Kanten;
+                   bei vermaschten Netzen Fallback auf "linprog".
+
+    block_size (nur solver="linprog"):
+    - 1  -> ein linprog-Aufruf pro Zeitschritt
+    - >1 -> block_size Zeitschritte pro (blockdiagonalem) LP,
+            z.B. 96 = ein Tag bei 15min, 672 = eine Woche; gleiche Dualpreise,
+            Dispatch/MO-like Preis können an degenerierten Zeitschritten abweichen
+
+    workers:
+    - 1  -> alles im aktuellen Prozess
+    - >1 -> time_index wird in `workers` zusammenhängende Chunks geteilt und
+            in einem ProcessPoolExecutor gelöst. Bei solver="linprog" ist das
+            Ergebnis identisch zum seriellen Lauf. Bei solver="highs" beginnt
+            jeder Chunk kalt (ohne Warmstart-Basis); die Werte können dann
+            numerisch minimal abweichen, bei degenerierten LPs auch ein
+            anderes, gleich teures Optimum sein.
+
+    Gibt DataFrame 'coupled' zurück.
+    """
+    if int(block_size) < 1:
+        raise ValueError("block_size muss >= 1 sein.")
+    if solver not in ("linprog", "highs", "radial"):
+        raise ValueError("solver muss 'linprog', 'highs' oder 'radial' sein.")
+    if int(workers) < 1:
+        raise ValueError("workers muss >= 1 sein.")
+
+    with profiling.stage("coupling_setup"):
+        supply = {z: supply_segments_for(zone_plants[z]) for z in zones}
+        layout = build_lp_layout(zones, supply, ntc_edges, voll)
+
+        time_index = zone_ts[zones[0]].index
+        L, EE_av = _zone_arrays(zones, zone_ts, time_index)
+
+    if solver == "radial":
+        if edges_form_forest(zones, ntc_edges):
+            with profiling.stage("coupling_solve", solver="radial"):
+                zone_res, duals = solve_radial(zones, supply, ntc_edges, voll, L, EE_av)
+            with profiling.stage("coupling_frame"):
+                return build_coupled_frame(
+                    time_index, zones, zone_res, duals, EE_av, zone_plants,
+                    scarcity_pricing_in_price=scarcity_pricing_in_price,
+                    price_nan_when_no_conv=price_nan_when_no_conv,
+                    reserve_price_max=reserve_price_max,
+                )
+        print("[Coupling] NTC-Netz ist vermascht -> Fallback auf LP (linprog).")
+        solver = "linprog"
+
+    # Einzelne LP-Lösungen (profiling.record) gibt es nur bei workers=1;
+    # in den Worker-Prozessen ist kein Protokoll aktiv.
+    with profiling.stage("coupling_solve", solver=solver, block_size=int(block_size), workers=int(workers)):
+        if int(workers) > 1:
+            X, duals = _solve_parallel(
+                zones, supply, ntc_edges, voll, time_index, L, EE_av,
+                solver, int(block_size), int(workers),
+            )
+        else:
+            X, duals = _solve(layout, zones, time_index, L, EE_av, solver, int(block_size))
+
+    with profiling.stage("coupling_frame"):
+        zone_res = zone_results_from_solution(X, zones, ntc_edges, layout, supply)
+        return build_coupled_frame(
+            time_index, zones, zone_res, duals, EE_av, zone_plants,
+            scarcity_pricing_in_price=scarcity_pricing_in_price,
+            price_nan_when_no_conv=price_nan_when_no_conv,
+            reserve_price_max=reserve_price_max,
+        )
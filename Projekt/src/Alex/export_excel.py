@@ -1,11 +1,263 @@
 # export_excel.py
 """
-Excel-Export: schreibt Insel- und optional Coupled-Daten.
-Wichtig: Zeitzonen entfernen, sonst meckert Excel.
+Ergebnis-Export: schreibt Insel- und optional Coupled-Daten.
+
+Formate (EXPORT_BACKENDS, beliebig kombinierbar):
+- "xlsx":    eine Excel-Datei, ein Sheet pro Tabelle.
+             Wichtig: Zeitzonen entfernen, sonst meckert Excel.
+- "xlsx_stream": dieselbe Excel-Datei, aber mit xlsxwriter (constant_memory) Zeile
+             für Zeile geschrieben, Zone für Zone, ohne die Long-Form-Tabellen
+             zusammenzukleben -> Speicher bleibt flach (mehrjährige 15min-Exports)
+- "parquet": ein Parquet-File pro Tabelle + manifest.json in <Excel-Name>_parquet/
+- "feather": wie parquet, aber Feather (<Excel-Name>_feather/)
+  (beide brauchen pyarrow; Zeitspalte bleibt tz-aware, Spalten wie in Excel)
+
+Zusätzlich: Merit-Order-Kurven binär (<Excel>_curves/<Zone>.npy) für den Visualizer.
 """
 
+import json
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
 
+from supply_curve import curves_dir_for
+
+
+class TimeTable:
+    """
+    Zeitreihen-Tabelle aus {Zone: DataFrame} mit Spalten time (+ zone) + Frame-Spalten.
+    Wird erst bei Bedarf zusammengeklebt (to_frame); blocks() liefert sie stückweise.
+    """
+
+    __slots__ = ("frames", "tz_naive", "with_zone")
+
+    def __init__(self, frames: dict, tz_naive: bool = True, with_zone: bool = True):
+        self.frames = frames
+        self.tz_naive = tz_naive
+        self.with_zone = with_zone
+
+    def _time(self, index):
+        return index.tz_localize(None) if self.tz_naive else index
+
+    @property
+    def columns(self) -> list:
+        cols = list(next(iter(self.frames.values())).columns) if self.frames else []
+        return (["time", "zone"] if self.with_zone else ["time"]) + cols
+
+    def __len__(self) -> int:
+        return sum(len(df) for df in self.frames.values())
+
+    def blocks(self, rows: int = 10_000):
+        """(zone, time, DataFrame)-Stücke mit höchstens `rows` Zeilen, ohne Kopie der Frames."""
+        for z, df in self.frames.items():
+            for i in range(0, len(df), rows):
+                part = df.iloc[i:i + rows]
+                yield z, self._time(part.index), part
+
+    def to_frame(self) -> pd.DataFrame:
+        parts = []
+        for z, df in self.frames.items():
+            tmp = df.copy()
+            tmp.insert(0, "time", self._time(tmp.index))
+            if self.with_zone:
+                tmp.insert(1, "zone", z)
+            parts.append(tmp.reset_index(drop=True))
+        return pd.concat(parts, ignore_index=True)
+
+
+def _frame(table) -> pd.DataFrame:
+    return table.to_frame() if isinstance(table, TimeTable) else table
+
+
+def collect_sheets(kpi_island_df,
+                   zone_results,
+                   zone_vre_tech,
+                   zone_plants,
+                   coupled=None,
+                   kpi_coupled_df=None,
+                   tz_naive: bool = True) -> dict:
+    """
+    Alle Export-Tabellen als {Name: DataFrame oder TimeTable}, in Sheet-Reihenfolge.
+    Zeitreihen bleiben TimeTables (nicht zusammengeklebt).
+    tz_naive=True entfernt die Zeitzone (für Excel).
+    """
+    # KPIs + Zeitreihen (Insel TS und EE by tech als long-form: zone + time)
+    sheets = {
+        "kpi_zone_insel": kpi_island_df,
+        "timeseries_insel": TimeTable(zone_results, tz_naive),
+        "ee_by_tech_mw": TimeTable(zone_vre_tech, tz_naive),
+    }
+
+    # Plants exports
+    for z in zone_plants.keys():
+        for part in ("plants_cap", "plants_stack", "plants_no_mc", "plants_with_cap"):
+            sheets[f"{part}_{z}"[:31]] = zone_plants[z][part]
+
+    # Coupled exports
+    if kpi_coupled_df is not None:
+        sheets["kpi_zone_coupled"] = kpi_coupled_df
+    if coupled is not None:
+        sheets["timeseries_coupled"] = TimeTable({None: coupled}, tz_naive, with_zone=False)
+
+    return sheets
+
+
+# -----------------------------------------------------------------------------
+# Backends
+# -----------------------------------------------------------------------------
+def write_xlsx(out_xlsx, sheets: dict, meta=None) -> Path:
+    with pd.ExcelWriter(out_xlsx, engine="openpyxl") as writer:
+        for name, table in sheets.items():
+            _frame(table).to_excel(writer, index=False, sheet_name=name)
+    return Path(out_xlsx)
+
+
+def _is_inf(v) -> bool:
+    return isinstance(v, (float, np.floating)) and np.isinf(v)
+
+
+def _cells(values: np.ndarray) -> np.ndarray:
+    """
+    Werte als object-Array, fehlende Werte -> None (leere Zelle wie bei to_excel).
+    ±inf ebenfalls -> None (xlsxwriter lehnt inf ab).
+    """
+    missing = pd.isna(values)
+    if values.dtype.kind == "f":
+        missing |= np.isinf(values)
+    elif values.dtype == object:
+        missing |= np.frompyfunc(_is_inf, 1, 1)(values).astype(bool)
+    out = values.astype(object)
+    out[missing] = None
+    return out
+
+
+def write_xlsx_stream(out_xlsx, sheets: dict, meta=None) -> Path:
+    """
+    Excel mit xlsxwriter im constant_memory-Modus: jede Zeile wird sofort auf die
+    Platte geschrieben. TimeTables werden blockweise (Zone für Zone) geschrieben.
+    """
+    try:
+        import xlsxwriter
+    except Exception as e:
+        raise ImportError("Für den Excel-Streaming-Export brauchst du xlsxwriter: pip install xlsxwriter") from e
+
+    wb = xlsxwriter.Workbook(str(out_xlsx), {
+        "constant_memory": True,
+        "default_date_format": "YYYY-MM-DD HH:MM:SS",
+        "remove_timezone": True,
+    })
+    try:
+        for name, table in sheets.items():
+            ws = wb.add_worksheet(name)
+            ws.write_row(0, 0, [str(c) for c in table.columns])
+            r = 1
+
+            if isinstance(table, TimeTable):
+                for z, time, part in table.blocks():
+                    times = time.to_pydatetime()
+                    values = _cells(part.to_numpy())
+                    lead = [None, z] if table.with_zone else [None]
+                    for t, row in zip(times, values):
+                        lead[0] = t
+                        ws.write_row(r, 0, lead)
+                        ws.write_row(r, len(lead), row)
+                        r += 1
+            else:
+                for row in _cells(table.to_numpy()):
+                    ws.write_row(r, 0, row)
+                    r += 1
+    finally:
+        wb.close()
+    return Path(out_xlsx)
+
+
+def _columnar_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Arrow kann gemischte object-Spalten (z.B. Zahlen + "-" aus der Kraftwerksliste)
+    nicht speichern -> diese als Text ablegen. Reine Text-/Zahlenspalten bleiben.
+    """
+    out = df.reset_index(drop=True)
+    mixed = [
+        c for c in out.columns
+        if out[c].dtype == object and pd.api.types.infer_dtype(out[c], skipna=True).startswith("mixed")
+    ]
+    if mixed:
+        out = out.copy()
+        for c in mixed:
+            out[c] = out[c].where(out[c].isna(), out[c].astype(str))
+    out.columns = [str(c) for c in out.columns]
+    return out
+
+
+def _write_columnar(out_xlsx, sheets: dict, fmt: str, meta=None) -> Path:
+    """Ein File pro Tabelle + manifest.json in <Excel-Name>_<fmt>/."""
+    try:
+        import pyarrow  # noqa: F401
+    except Exception as e:
+        raise ImportError(f"Für den {fmt}-Export brauchst du pyarrow: pip install pyarrow") from e
+
+    p = Path(out_xlsx)
+    out_dir = p.with_name(f"{p.stem}_{fmt}")
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    tables = {}
+    for name, table in sheets.items():
+        data = _columnar_frame(_frame(table))
+        file = f"{name}.{fmt}"
+        if fmt == "parquet":
+            data.to_parquet(out_dir / file, index=False)
+        else:
+            data.to_feather(out_dir / file)
+        tables[name] = {
+            "file": file,
+            "rows": int(len(data)),
+            "columns": {c: str(t) for c, t in data.dtypes.items()},
+        }
+
+    manifest = {
+        "format": fmt,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "source": p.stem,
+        "meta": meta or {},
+        "tables": tables,
+        "curves_dir": str(curves_dir_for(p)),
+    }
+    (out_dir / "manifest.json").write_text(json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8")
+    return out_dir
+
+
+def write_parquet(out_xlsx, sheets: dict, meta=None) -> Path:
+    return _write_columnar(out_xlsx, sheets, "parquet", meta)
+
+
+def write_feather(out_xlsx, sheets: dict, meta=None) -> Path:
+    return _write_columnar(out_xlsx, sheets, "feather", meta)
+
+
+# Format -> (Schreibfunktion, Zeitspalte ohne tz?)
+EXPORT_BACKENDS = {
+    "xlsx": (write_xlsx, True),
+    "xlsx_stream": (write_xlsx_stream, True),
+    "parquet": (write_parquet, False),
+    "feather": (write_feather, False),
+}
+
+
+def load_results(path, tables=None) -> dict:
+    """
+    Liest einen parquet/feather-Export zurück: {Name: DataFrame}.
+    path: Export-Ordner oder dessen manifest.json; tables: optional nur diese Tabellen.
+    """
+    p = Path(path)
+    manifest_path = p if p.suffix == ".json" else p / "manifest.json"
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    read = pd.read_parquet if manifest["format"] == "parquet" else pd.read_feather
+    names = tables if tables is not None else list(manifest["tables"].keys())
+    return {n: read(manifest_path.parent / manifest["tables"][n]["file"]) for n in names}
+
 
 def export_all(out_xlsx,
                kpi_island_df,
@@ -13,46 +265,40 @@ def export_all(out_xlsx,
                zone_vre_tech,
                zone_plants,
                coupled=None,
-               kpi_coupled_df=None):
-    # Insel TS long-form (zone + time)
-    ts_long = []
-    for z, ts in zone_results.items():
-        tmp = ts.copy()
-        tmp.insert(0, "time", tmp.index.tz_localize(None))  # tz entfernen
-        tmp.insert(1, "zone", z)
-        ts_long.append(tmp.reset_index(drop=True))
-    timeseries_all = pd.concat(ts_long, ignore_index=True)
-
-    # EE by tech long-form
-    ee_long = []
-    for z, ee in zone_vre_tech.items():
-        tmp = ee.copy()
-        tmp.insert(0, "time", tmp.index.tz_localize(None))
-        tmp.insert(1, "zone", z)
-        ee_long.append(tmp.reset_index(drop=True))
-    ee_by_tech_all = pd.concat(ee_long, ignore_index=True)
-
-    coupled_export = None
-    if coupled is not None:
-        coupled_export = coupled.copy()
-        coupled_export.insert(0, "time", coupled_export.index.tz_localize(None))
-        coupled_export = coupled_export.reset_index(drop=True)
+               kpi_coupled_df=None,
+               formats=("xlsx",),
+               meta=None) -> dict:
+    """
+    Schreibt alle Ergebnisse in die gewünschten Formate (siehe EXPORT_BACKENDS).
+    out_xlsx legt Name und Ordner fest, auch wenn kein "xlsx" exportiert wird.
+    meta: optionale Infos fürs Manifest (Szenario, Auflösung, ...).
 
-    with pd.ExcelWriter(out_xlsx, engine="openpyxl") as writer:
-        # KPIs + Zeitreihen
-        kpi_island_df.to_excel(writer, index=False, sheet_name="kpi_zone_insel")
-        timeseries_all.to_excel(writer, index=False, sheet_name="timeseries_insel")
-        ee_by_tech_all.to_excel(writer, index=False, sheet_name="ee_by_tech_mw")
-
-        # Plants exports
-        for z in zone_plants.keys():
-            zone_plants[z]["plants_cap"].to_excel(writer, index=False, sheet_name=f"plants_cap_{z}"[:31])
-            zone_plants[z]["plants_stack"].to_excel(writer, index=False, sheet_name=f"plants_stack_{z}"[:31])
-            zone_plants[z]["plants_no_mc"].to_excel(writer, index=False, sheet_name=f"plants_no_mc_{z}"[:31])
-            zone_plants[z]["plants_with_cap"].to_excel(writer, index=False, sheet_name=f"plants_with_cap_{z}"[:31])
-
-        # Coupled exports
-        if kpi_coupled_df is not None:
-            kpi_coupled_df.to_excel(writer, index=False, sheet_name="kpi_zone_coupled")
-        if coupled_export is not None:
-            coupled_export.to_excel(writer, index=False, sheet_name="timeseries_coupled")
+    Gibt {Format: geschriebener Pfad} zurück.
+    """
+    unknown = [f for f in formats if f not in EXPORT_BACKENDS]
+    if unknown:
+        raise ValueError(f"Unbekannte Export-Formate: {unknown} (erlaubt: {list(EXPORT_BACKENDS)})")
+    if "xlsx" in formats and "xlsx_stream" in formats:
+        # beide schreiben dieselbe Datei out_xlsx
+        raise ValueError('"xlsx" und "xlsx_stream" schließen sich aus (beide schreiben out_xlsx).')
+
+    written = {}
+    sheets_by_tz = {}
+    for fmt in formats:
+        writer, tz_naive = EXPORT_BACKENDS[fmt]
+        if tz_naive not in sheets_by_tz:
+            sheets_by_tz[tz_naive] = collect_sheets(
+                kpi_island_df, zone_results, zone_vre_tech, zone_plants,
+                coupled=coupled, kpi_coupled_df=kpi_coupled_df, tz_naive=tz_naive,
+            )
+        written[fmt] = writer(out_xlsx, sheets_by_tz[tz_naive], meta=meta)
+
+    # Merit-Order-Kurven binär (SupplyCurve aller nutzbaren Anlagen, wie Sheet plants_cap),
+    # der Visualizer liest sie ohne Excel-Umweg
+    curves_dir = curves_dir_for(out_xlsx)
+    curves_dir.mkdir(parents=True, exist_ok=True)
+    for z, info in zone_plants.items():
+        if "curve_effective" in info:
+            info["curve_effective"].save(curves_dir / f"{z}.npy")
+
+    return written
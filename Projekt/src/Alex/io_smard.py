@@ -1,31 +1,312 @@
 # io_smard.py
 """
 Alles rund um SMARD-Excel einlesen und Zeitreihen pro Zone bauen.
+
+Einlesen:
+- Die Zeilen werden mit openpyxl (read_only) in EINEM Durchgang gestreamt,
+  die Headerzeile ("Datum von") wird dabei erkannt.
+- read_smard_columns() baut nur die Spalten, die wirklich gebraucht werden
+  (Last bzw. EE_NEEDLES), und konvertiert sie direkt nach float.
+- SMARD-CSV-Exports (";" getrennt, Dezimalkomma, Tausenderpunkt, "-" = fehlend)
+  werden direkt und vektorisiert mit pd.read_csv gelesen (Dateiendung .csv).
+
+Zeitachse:
+- kommt aus der Spalte "Datum von" (beliebige Jahre, Sommer-/Winterzeit über
+  die Reihenfolge der doppelten Oktober-Stunde), siehe parse_smard_time().
+- Mehrjährige Läufe: mehrere Dateien pro Zone und/oder der jahres-partitionierte
+  Speicher (ingest_zone_to_store / load_zone_from_store).
+
+Cache:
+- Geparste Workbooks können als Parquet unter cache_dir abgelegt werden.
+- Schlüssel: Pfad, Dateigröße, mtime und SHA-256 des Dateiinhalts.
+- Warmer Lauf: kein openpyxl, nur read_parquet (braucht pyarrow; ohne pyarrow
+  wird ohne Cache gelesen).
 """
 
+import hashlib
+import json
+from pathlib import Path
+
 import numpy as np
 import pandas as pd
 
 
-def read_smard_excel(path, sheet=0) -> pd.DataFrame:
+# Zeitspalte der SMARD-Exports (Beginn des Intervalls, lokale Zeit)
+_TIME_COL = "datum von"
+SMARD_TZ = "Europe/Berlin"
+
+
+# -----------------------------------------------------------------------------
+# Cache
+# -----------------------------------------------------------------------------
+def _cache_key(path, sheet, extra="") -> str:
+    """Schlüssel aus Pfad, Größe, mtime und Inhalts-Hash der Datei."""
+    p = Path(path).resolve()
+    st = p.stat()
+    content = hashlib.sha256(p.read_bytes()).hexdigest()
+    raw = f"{p}|{st.st_size}|{st.st_mtime_ns}|{content}|{sheet}|{extra}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _cache_paths(path, cache_dir, kind):
+    """Parquet + Metadaten-JSON; ein Eintrag pro Quelldatei und Art (wird überschrieben)."""
+    p = Path(path).resolve()
+    tag = hashlib.sha1(str(p).encode("utf-8")).hexdigest()[:8]
+    base = Path(cache_dir) / f"{p.stem}_{kind}_{tag}"
+    return base.with_suffix(".parquet"), base.with_suffix(".json")
+
+
+def _read_cached(path, cache_dir, kind, key):
+    """Gibt (df, meta) zurück oder None, wenn kein passender Eintrag existiert."""
+    data_path, meta_path = _cache_paths(path, cache_dir, kind)
+    if not (data_path.exists() and meta_path.exists()):
+        return None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        if meta.get("key") != key:
+            return None
+        return pd.read_parquet(data_path), meta
+    except Exception:
+        return None
+
+
+def _parquet_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Gemischte object-Spalten (Zahlen + "-") kann Parquet nicht speichern.
+    Als Text ablegen: to_num() liefert daraus dieselben Werte.
+    """
+    out = df.copy()
+    for c in out.columns:
+        if out[c].dtype == object:
+            out[c] = out[c].astype(str)
+    return out
+
+
+def _write_cached(df, path, sheet, cache_dir, kind, key, extra_meta=None):
+    data_path, meta_path = _cache_paths(path, cache_dir, kind)
+    data_path.parent.mkdir(parents=True, exist_ok=True)
+
+    try:
+        _parquet_safe(df).to_parquet(data_path, index=False)
+    except ImportError:
+        print("[SMARD-Cache] pyarrow nicht installiert -> Cache deaktiviert.")
+        return
+
+    meta = {"source": str(Path(path).resolve()), "sheet": sheet, "key": key}
+    meta.update(extra_meta or {})
+    meta_path.write_text(json.dumps(meta, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+# -----------------------------------------------------------------------------
+# Streaming-Reader
+# -----------------------------------------------------------------------------
+def _header_names(row) -> list:
+    """Spaltennamen wie bei pd.read_excel: leere -> 'Unnamed: i', Duplikate -> 'X.1'."""
+    names, seen = [], {}
+    for i, v in enumerate(row):
+        name = f"Unnamed: {i}" if v is None else str(v)
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        names.append(name.strip())
+    return names
+
+
+def _iter_smard_rows(path, sheet=0):
+    """
+    Streamt ein SMARD-Sheet (openpyxl read_only) in einem Durchgang.
+    Gibt (Spaltennamen, Iterator über Datenzeilen) zurück.
+    Leere Zeilen werden übersprungen, Zeilen auf Headerlänge gebracht.
+    """
+    try:
+        import openpyxl
+    except Exception as e:
+        raise ImportError("Für SMARD-Excel brauchst du openpyxl: pip install openpyxl") from e
+
+    wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    ws = wb.worksheets[sheet] if isinstance(sheet, int) else wb[sheet]
+    ws.reset_dimensions()  # SMARD-Exports haben teils falsche Dimensionsangaben
+    rows = ws.iter_rows(values_only=True)
+
+    header = None
+    for row in rows:
+        if any(v is not None and "datum von" in str(v).casefold() for v in row):
+            header = row
+            break
+
+    if header is None:
+        wb.close()
+        raise ValueError(f"Headerzeile mit 'Datum von' nicht gefunden in {path}")
+
+    names = _header_names(header)
+    n = len(names)
+
+    def data_rows():
+        try:
+            for row in rows:
+                if all(v is None or v == "" for v in row):
+                    continue
+                if len(row) < n:
+                    row = tuple(row) + (None,) * (n - len(row))
+                yield row[:n]
+        finally:
+            wb.close()
+
+    return names, data_rows()
+
+
+def _parse_smard_excel(path, sheet=0) -> pd.DataFrame:
+    if _is_csv(path):
+        return _read_smard_csv(path, numeric=False)[0]
+
+    names, rows = _iter_smard_rows(path, sheet)
+
+    # wie pandas: ganzzahlige floats als int
+    def conv(v):
+        return int(v) if isinstance(v, float) and v.is_integer() else v
+
+    return pd.DataFrame([[conv(v) for v in row] for row in rows], columns=names)
+
+
+def read_smard_excel(path, sheet=0, cache_dir=None) -> pd.DataFrame:
     """
     SMARD-Exports haben oft mehrere Kopfzeilen.
     Wir suchen die Zeile, in der "Datum von" vorkommt und nutzen sie als Header.
+    Liefert das komplette Sheet (alle Spalten, Rohwerte). Bei .csv: alle Werte als Text.
+
+    cache_dir: wenn gesetzt, wird das Ergebnis als Parquet gecacht
+    (Schlüssel: Pfad, Größe, mtime, Inhalts-Hash). Object-Spalten kommen dann immer
+    als Text zurück (auch beim ersten Lesen), damit das Ergebnis nicht vom Cache abhängt.
     """
-    raw = pd.read_excel(path, sheet_name=sheet, header=None)
-    header_row = None
+    if cache_dir is not None:
+        key = _cache_key(path, sheet)
+        cached = _read_cached(path, cache_dir, "raw", key)
+        if cached is not None:
+            return cached[0]
+        df = _parquet_safe(_parse_smard_excel(path, sheet))
+        _write_cached(df, path, sheet, cache_dir, "raw", key)
+        return df
+
+    return _parse_smard_excel(path, sheet)
+
+
+# -----------------------------------------------------------------------------
+# CSV (SMARD-Download als CSV: ";" getrennt, deutsches Zahlenformat)
+# -----------------------------------------------------------------------------
+def _is_csv(path) -> bool:
+    return Path(path).suffix.casefold() == ".csv"
 
-    for i in range(len(raw)):
-        if raw.iloc[i].astype(str).str.contains("Datum von", case=False, na=False).any():
-            header_row = i
+
+def _csv_header_row(path, encoding):
+    """Index der Zeile, die 'Datum von' enthält (SMARD-CSV: meist die erste)."""
+    with open(path, "r", encoding=encoding) as f:
+        for i, line in enumerate(f):
+            if "datum von" in line.casefold():
+                return i
+    raise ValueError(f"Headerzeile mit 'Datum von' nicht gefunden in {path}")
+
+
+def _read_smard_csv(path, usecols=None, numeric=True):
+    """
+    Vektorisiertes Einlesen einer SMARD-CSV:
+    sep=';', decimal=',', thousands='.', '-' = fehlend.
+    Gibt (df, alle Spaltennamen) zurück.
+    """
+    for encoding in ("utf-8-sig", "latin-1"):
+        try:
+            skip = _csv_header_row(path, encoding)
             break
+        except UnicodeDecodeError:
+            continue
+    else:
+        raise ValueError(f"{path}: unbekannte Kodierung")
 
-    if header_row is None:
-        raise ValueError(f"Headerzeile mit 'Datum von' nicht gefunden in {path}")
+    opts = dict(sep=";", skiprows=skip, encoding=encoding)
+    names = [str(c).strip() for c in pd.read_csv(path, nrows=0, **opts).columns]
+
+    if not numeric:
+        df = pd.read_csv(path, dtype=str, keep_default_na=False, **opts)
+        df.columns = names
+        return df, names
 
-    df = pd.read_excel(path, sheet_name=sheet, header=header_row)
+    df = pd.read_csv(
+        path,
+        usecols=usecols,
+        decimal=",",
+        thousands=".",
+        na_values=["-"],
+        **opts,
+    )
     df.columns = [str(c).strip() for c in df.columns]
-    return df
+    for c in df.columns:
+        if _is_time_col(c):
+            df[c] = df[c].astype(str)  # Zeitstempel bleiben Text -> parse_smard_time()
+            continue
+        # Spalten, die nicht sauber numerisch sind, wie bei Excel behandeln
+        df[c] = to_num(df[c]) if not pd.api.types.is_numeric_dtype(df[c]) else df[c].fillna(0.0)
+        df[c] = df[c].astype(float)
+    return df, names
+
+
+def _is_time_col(name) -> bool:
+    return _TIME_COL in str(name).casefold()
+
+
+def _parse_smard_columns(path, needles, sheet=0):
+    ns = [str(n).casefold() for n in needles]
+
+    def wanted(c):
+        return _is_time_col(c) or any(n in str(c).casefold() for n in ns)
+
+    if _is_csv(path):
+        return _read_smard_csv(path, usecols=wanted)
+
+    names, rows = _iter_smard_rows(path, sheet)
+    keep = [i for i, c in enumerate(names) if wanted(c)]
+
+    cols = {i: [] for i in keep}
+    n_rows = 0
+    for row in rows:
+        n_rows += 1
+        for i in keep:
+            cols[i].append(row[i])
+
+    data = {}
+    for i in keep:
+        s = pd.Series(cols[i], dtype=object)
+        if _is_time_col(names[i]):
+            data[names[i]] = s.to_numpy()
+        else:
+            data[names[i]] = to_num(s).astype(float).to_numpy()
+
+    df = pd.DataFrame(data, index=pd.RangeIndex(n_rows))
+    return df, names
+
+
+def read_smard_columns(path, needles, sheet=0, cache_dir=None):
+    """
+    Liest aus einem SMARD-Sheet nur die Spalten, deren Name einen der
+    Suchstrings enthält (case-insensitive), bereits als float (to_num).
+    Die Zeitspalte "Datum von" ist immer dabei (als Text, siehe parse_smard_time).
+
+    Gibt (df, all_columns) zurück:
+    - df: nur die benötigten Spalten, Reihenfolge wie in der Datei
+    - all_columns: alle Spaltennamen des Sheets (für Debug/Meta)
+    """
+    needles = list(needles)
+    if cache_dir is not None:
+        key = _cache_key(path, sheet, extra="|".join([_TIME_COL] + needles))
+        cached = _read_cached(path, cache_dir, "cols", key)
+        if cached is not None:
+            df, meta = cached
+            return df, meta["columns"]
+        df, names = _parse_smard_columns(path, needles, sheet)
+        _write_cached(df, path, sheet, cache_dir, "cols", key, extra_meta={"columns": names})
+        return df, names
+
+    return _parse_smard_columns(path, needles, sheet)
 
 
 def to_num(s: pd.Series) -> pd.Series:
@@ -58,69 +339,132 @@ def find_col_contains_required(df: pd.DataFrame, needle: str) -> str:
     return c
 
 
-def build_zone_timeseries(load_xlsx, gen_xlsx, time_freq: str, ee_needles: dict):
+# -----------------------------------------------------------------------------
+# Zeitachse
+# -----------------------------------------------------------------------------
+def parse_smard_time(values) -> pd.DatetimeIndex:
     """
-    Baut Zeitreihen pro Zone (MW + abgeleitete MWh).
+    Zeitachse aus der SMARD-Spalte "Datum von" (z.B. "01.01.2024 00:00", lokale Zeit).
 
-    Output:
-    - ts: DataFrame mit load_mw, vre_mw, residual_raw_mw, abregelung_mw, konv_bedarf_mw + MWh-Spalten
-    - vre_by_tech: DataFrame mit EE-Leistung pro Technologie (MW)
-    - meta: dict mit Debug-Infos (dt_hours, fehlende Techs, ...)
+    Sommer-/Winterzeit:
+    - März: 02:00-02:45 fehlt in den Exports -> beim Lokalisieren nichts zu tun
+    - Oktober: 02:00-02:45 steht zweimal drin; das erste Vorkommen ist Sommerzeit (CEST),
+      das zweite Winterzeit (CET) -> Zuordnung über die Reihenfolge in der Datei
     """
-    load_df = read_smard_excel(load_xlsx)
-    gen_df = read_smard_excel(gen_xlsx)
+    s = pd.Series(values).reset_index(drop=True)
+    t = pd.to_datetime(s.astype(str).str.strip(), format="%d.%m.%Y %H:%M", errors="coerce")
+    if t.isna().any():
+        # Excel-Zellen können auch echte Datumswerte enthalten
+        t = pd.to_datetime(s, dayfirst=True, errors="coerce")
+    if t.isna().any():
+        raise ValueError(f"Zeitstempel nicht lesbar: {s[t.isna()].iloc[0]!r}")
+
+    first = ~t.duplicated(keep="first").to_numpy()
+    idx = pd.DatetimeIndex(t).tz_localize(SMARD_TZ, ambiguous=first).rename(None)
+    if not idx.is_unique:
+        raise ValueError("Zeitstempel doppelt (nicht durch die Zeitumstellung erklärbar)")
+    return idx
+
+
+def _to_local(ts) -> pd.Timestamp:
+    t = pd.Timestamp(ts)
+    return t.tz_localize(SMARD_TZ) if t.tzinfo is None else t.tz_convert(SMARD_TZ)
 
-    # Erwarteter Viertelstundenindex für 2024 (Berlin TZ)
-    idx_15 = pd.date_range(
-        "2024-01-01 00:00", "2025-01-01 00:00",
-        freq="15min", tz="Europe/Berlin", inclusive="left"
-    )
 
-    load_df = load_df.reset_index(drop=True)
-    gen_df = gen_df.reset_index(drop=True)
+def _slice_range(df: pd.DataFrame, start=None, end=None) -> pd.DataFrame:
+    """Zeilen mit start <= t < end (lokale Zeit, wenn ohne Zeitzone angegeben)."""
+    mask = np.ones(len(df), dtype=bool)
+    if start is not None:
+        mask &= df.index >= _to_local(start)
+    if end is not None:
+        mask &= df.index < _to_local(end)
+    return df.loc[mask]
+
+
+def _combine(parts) -> pd.DataFrame:
+    """Mehrere Basis-Zeitreihen zusammenführen (bei Überschneidung gewinnt die spätere)."""
+    df = pd.concat(parts)
+    df = df[~df.index.duplicated(keep="last")]
+    return df.sort_index()
+
+
+def _file_pairs(load_xlsx, gen_xlsx):
+    """Ein Pfad oder Listen von Pfaden (z.B. ein SMARD-Export pro Jahr) -> Liste von Paaren."""
+    loads = list(load_xlsx) if isinstance(load_xlsx, (list, tuple)) else [load_xlsx]
+    gens = list(gen_xlsx) if isinstance(gen_xlsx, (list, tuple)) else [gen_xlsx]
+    if len(loads) != len(gens):
+        raise ValueError(f"Anzahl Last-/Erzeugungsdateien passt nicht: {len(loads)} / {len(gens)}")
+    return list(zip(loads, gens))
+
+
+# -----------------------------------------------------------------------------
+# Zeitreihen pro Zone
+# -----------------------------------------------------------------------------
+def _read_zone_base(load_xlsx, gen_xlsx, ee_needles: dict, cache_dir=None):
+    """
+    Liest ein Dateipaar (Last + Erzeugung) einer Zone.
+
+    Gibt (base, meta) zurück:
+    - base: Zeitreihe in Originalauflösung, Spalten load_mw + EE-Techs (MW)
+    - meta: load_col, missing_ee, all_gen_cols
+    """
+    load_needles = ["Netzlast inkl. Pumpspeicher", "Netzlast"]
+    load_df, _ = read_smard_columns(load_xlsx, load_needles, cache_dir=cache_dir)
+    gen_df, all_gen_cols = read_smard_columns(gen_xlsx, ee_needles.values(), cache_dir=cache_dir)
 
-    # Wichtiger Safety Check: SMARD-Dateien müssen exakt 2024 in 15min enthalten
-    assert len(idx_15) == len(load_df) == len(gen_df), f"Längen passen nicht: {load_xlsx} / {gen_xlsx}"
+    idx = parse_smard_time(load_df[find_col_contains_required(load_df, "Datum von")])
+    gen_idx = parse_smard_time(gen_df[find_col_contains_required(gen_df, "Datum von")])
 
-    load_df.index = idx_15
-    gen_df.index = idx_15
+    # Wichtiger Safety Check: Last und Erzeugung müssen dieselbe Zeitachse haben
+    if not idx.equals(gen_idx):
+        raise ValueError(f"Zeitachsen passen nicht: {load_xlsx} / {gen_xlsx}")
 
     # Lastspalte robust finden
     load_col = find_col_contains_optional(load_df, "Netzlast inkl. Pumpspeicher")
     if load_col is None:
         load_col = find_col_contains_required(load_df, "Netzlast")
 
-    # SMARD: MWh pro 15min -> MW = *4
-    load_mw_15 = to_num(load_df[load_col]) * 4.0
+    # SMARD: MWh pro Intervall -> MW (15min: *4, h: *1)
+    step_h = pd.Series(idx).diff().median().total_seconds() / 3600.0 if len(idx) > 1 else 0.25
+    to_mw = 1.0 / step_h
 
-    # EE-Spalten suchen
-    ee_cols = {}
+    base = pd.DataFrame({"load_mw": load_df[load_col].to_numpy() * to_mw}, index=idx)
+
+    # EE nach Tech (fehlende Techs = 0)
     missing = []
     for tech, needle in ee_needles.items():
         c = find_col_contains_optional(gen_df, needle)
         if c is None:
             missing.append(tech)
+            base[tech] = 0.0
         else:
-            ee_cols[tech] = c
+            base[tech] = gen_df[c].to_numpy() * to_mw
+
+    meta = {"load_col": load_col, "missing_ee": missing, "all_gen_cols": list(all_gen_cols)}
+    return base, meta
 
-    # EE nach Tech
-    vre_by_tech_mw_15 = pd.DataFrame(index=idx_15)
-    for tech in ee_needles.keys():
-        if tech in ee_cols:
-            vre_by_tech_mw_15[tech] = to_num(gen_df[ee_cols[tech]]) * 4.0
-        else:
-            vre_by_tech_mw_15[tech] = 0.0
 
-    # EE-Summe
+def _derive_zone_timeseries(base: pd.DataFrame, time_freq: str, ee_needles: dict, meta: dict):
+    """Resample + abgeleitete Größen aus der Basis-Zeitreihe (siehe build_zone_timeseries)."""
+    if len(base) == 0:
+        raise ValueError("Keine Daten im gewählten Zeitraum.")
+
+    # EE nach Tech und EE-Summe
+    vre_by_tech_mw_15 = base[list(ee_needles.keys())]
     vre_mw_15 = vre_by_tech_mw_15.sum(axis=1)
 
     # Grund-TS
-    ts_15 = pd.DataFrame({"load_mw": load_mw_15, "vre_mw": vre_mw_15}, index=idx_15)
+    ts_15 = pd.DataFrame({"load_mw": base["load_mw"], "vre_mw": vre_mw_15}, index=base.index)
 
     # Resample auf gewünschte Auflösung
     ts = ts_15.resample(time_freq).mean()
     vre_by_tech = vre_by_tech_mw_15.resample(time_freq).mean()
 
+    # Lücken zwischen Dateien (z.B. fehlendes Jahr) nicht als NaN-Zeitschritte mitschleppen
+    has_data = ts["load_mw"].notna()
+    if not has_data.all():
+        ts, vre_by_tech = ts[has_data], vre_by_tech[has_data]
+
     # Abgeleitete Größen
     ts["residual_raw_mw"] = ts["load_mw"] - ts["vre_mw"]
     ts["abregelung_mw"] = (-ts["residual_raw_mw"]).clip(lower=0.0)   # max(EE-Last, 0)
@@ -136,11 +480,174 @@ def build_zone_timeseries(load_xlsx, gen_xlsx, time_freq: str, ee_needles: dict)
     ts["abregel_mwh"] = ts["abregelung_mw"] * dt_hours
 
     meta = {
-        "load_col": load_col,
-        "missing_ee": missing,
+        "load_col": meta["load_col"],
+        "missing_ee": list(meta["missing_ee"]),
         "dt_hours": dt_hours,
         "tech_max_mw": vre_by_tech.max().to_dict(),
         "tech_mean_mw": vre_by_tech.mean().to_dict(),
-        "all_gen_cols": list(gen_df.columns),
+        "all_gen_cols": list(meta["all_gen_cols"]),
     }
     return ts, vre_by_tech, meta
+
+
+def build_zone_timeseries(load_xlsx, gen_xlsx, time_freq: str, ee_needles: dict, cache_dir=None,
+                          start=None, end=None):
+    """
+    Baut Zeitreihen pro Zone (MW + abgeleitete MWh).
+
+    load_xlsx / gen_xlsx: ein Pfad oder Listen von Pfaden (z.B. ein Export pro Jahr).
+    Die Zeitachse kommt aus der Spalte "Datum von" (beliebige Jahre, Sommer-/Winterzeit).
+    cache_dir: optionaler Parquet-Cache für die geparsten SMARD-Dateien.
+    start / end: optionaler Zeitraum (start <= t < end, lokale Zeit).
+
+    Output:
+    - ts: DataFrame mit load_mw, vre_mw, residual_raw_mw, abregelung_mw, konv_bedarf_mw + MWh-Spalten
+    - vre_by_tech: DataFrame mit EE-Leistung pro Technologie (MW)
+    - meta: dict mit Debug-Infos (dt_hours, fehlende Techs, ...)
+    """
+    parts, meta = [], None
+    for load_path, gen_path in _file_pairs(load_xlsx, gen_xlsx):
+        base, meta = _read_zone_base(load_path, gen_path, ee_needles, cache_dir=cache_dir)
+        parts.append(_slice_range(base, start, end))
+
+    if meta is None:
+        raise ValueError("Keine SMARD-Dateien angegeben.")
+
+    return _derive_zone_timeseries(_combine(parts), time_freq, ee_needles, meta)
+
+
+# -----------------------------------------------------------------------------
+# Jahres-partitionierter Zeitreihen-Speicher
+# -----------------------------------------------------------------------------
+# Layout: store_dir/<Zone>/<Jahr>.parquet  (Basis-Zeitreihe: load_mw + EE-Techs in MW)
+#         store_dir/<Zone>/manifest.json   (Jahre, eingelesene Dateien, Meta)
+# Ein Lauf über einen Zeitraum liest nur die Jahres-Dateien, die er braucht.
+def _store_manifest_path(store_dir, zone) -> Path:
+    return Path(store_dir) / str(zone) / "manifest.json"
+
+
+def _read_store_manifest(store_dir, zone) -> dict:
+    p = _store_manifest_path(store_dir, zone)
+    if p.exists():
+        return json.loads(p.read_text(encoding="utf-8"))
+    return {"years": [], "ingested": [], "ee_needles": None}
+
+
+def ingest_zone_to_store(store_dir, zone, load_xlsx, gen_xlsx, ee_needles: dict, cache_dir=None) -> dict:
+    """
+    Schreibt die SMARD-Dateien einer Zone jahresweise in den Speicher.
+
+    - Dateipaare, die schon eingelesen sind (gleicher Inhalt), werden übersprungen.
+    - Es wird immer nur ein Dateipaar gleichzeitig im Speicher gehalten.
+    - Andere EE_NEEDLES als beim letzten Einlesen -> Zone wird neu aufgebaut.
+
+    Gibt das Manifest der Zone zurück.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except Exception as e:
+        raise ImportError("Für den Zeitreihen-Speicher brauchst du pyarrow: pip install pyarrow") from e
+
+    zone_dir = Path(store_dir) / str(zone)
+    zone_dir.mkdir(parents=True, exist_ok=True)
+    manifest = _read_store_manifest(store_dir, zone)
+
+    needles = dict(ee_needles)
+    if manifest["ee_needles"] is not None and manifest["ee_needles"] != needles:
+        for year in manifest["years"]:
+            (zone_dir / f"{year}.parquet").unlink(missing_ok=True)
+        manifest = {"years": [], "ingested": [], "ee_needles": None}
+    manifest["ee_needles"] = needles
+
+    for load_path, gen_path in _file_pairs(load_xlsx, gen_xlsx):
+        key = _cache_key(load_path, 0, extra=_cache_key(gen_path, 0))
+        if key in manifest["ingested"]:
+            continue
+
+        base, meta = _read_zone_base(load_path, gen_path, needles, cache_dir=cache_dir)
+        years = set(manifest["years"])
+        for year, part in base.groupby(base.index.year):
+            path = zone_dir / f"{year}.parquet"
+            if path.exists():
+                part = _combine([pd.read_parquet(path), part])
+            part.to_parquet(path)
+            years.add(int(year))
+
+        manifest.update(meta)
+        manifest["years"] = sorted(years)
+        manifest["ingested"].append(key)
+        _store_manifest_path(store_dir, zone).write_text(
+            json.dumps(manifest, indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+
+    return manifest
+
+
+def load_zone_from_store(store_dir, zone, time_freq: str, ee_needles: dict, start=None, end=None):
+    """
+    Wie build_zone_timeseries, aber aus dem Jahres-Speicher.
+    Es werden nur die Jahre gelesen, die start..end berührt.
+    """
+    manifest = _read_store_manifest(store_dir, zone)
+    if not manifest["years"]:
+        raise FileNotFoundError(f"Keine Daten für Zone {zone} in {store_dir}")
+
+    y_from = _to_local(start).year if start is not None else manifest["years"][0]
+    y_to = (_to_local(end) - pd.Timedelta(1, "ns")).year if end is not None else manifest["years"][-1]
+    years = [y for y in manifest["years"] if y_from <= y <= y_to]
+    if not years:
+        raise ValueError(f"Zeitraum {start} - {end} nicht im Speicher (Jahre: {manifest['years']})")
+
+    zone_dir = Path(store_dir) / str(zone)
+    base = _combine([pd.read_parquet(zone_dir / f"{y}.parquet") for y in years])
+    return _derive_zone_timeseries(_slice_range(base, start, end), time_freq, ee_needles, manifest)
+
+
+def _build_zone_task(args):
+    """Worker-Funktion (muss auf Modulebene liegen, damit sie picklebar ist)."""
+    zone, load_xlsx, gen_xlsx, time_freq, ee_needles, cache_dir, start, end, store_dir = args
+    if store_dir is None:
+        return build_zone_timeseries(
+            load_xlsx, gen_xlsx, time_freq, ee_needles, cache_dir=cache_dir, start=start, end=end
+        )
+    ingest_zone_to_store(store_dir, zone, load_xlsx, gen_xlsx, ee_needles, cache_dir=cache_dir)
+    return load_zone_from_store(store_dir, zone, time_freq, ee_needles, start=start, end=end)
+
+
+def build_all_zone_timeseries(zones_cfg: dict, time_freq: str, ee_needles: dict,
+                              cache_dir=None, workers: int = 1,
+                              start=None, end=None, store_dir=None):
+    """
+    Baut die Zeitreihen aller Zonen aus zones_cfg (z.B. config.ZONES_4).
+
+    workers:
+    - 1  -> nacheinander im aktuellen Prozess
+    - >1 -> Zonen parallel in einem ProcessPoolExecutor (Excel-Parsing ist CPU-gebunden)
+
+    start / end: optionaler Zeitraum (start <= t < end, lokale Zeit).
+    store_dir: wenn gesetzt, laufen die Dateien über den Jahres-Speicher
+    (neue Dateien werden eingelesen, dann nur die benötigten Jahre geladen).
+
+    Gibt (zone_results, zone_vre_tech, meta) als dicts in der Reihenfolge von zones_cfg zurück.
+    """
+    zones = list(zones_cfg.keys())
+    tasks = [
+        (z, zones_cfg[z]["load_xlsx"], zones_cfg[z]["gen_xlsx"], time_freq, dict(ee_needles),
+         cache_dir, start, end, store_dir)
+        for z in zones
+    ]
+
+    if int(workers) > 1 and len(tasks) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=min(int(workers), len(tasks))) as pool:
+            results = list(pool.map(_build_zone_task, tasks))
+    else:
+        results = [_build_zone_task(t) for t in tasks]
+
+    zone_results, zone_vre_tech, meta = {}, {}, {}
+    for z, (ts, vre_by_tech, m) in zip(zones, results):
+        zone_results[z] = ts
+        zone_vre_tech[z] = vre_by_tech
+        meta[z] = m
+    return zone_results, zone_vre_tech, meta
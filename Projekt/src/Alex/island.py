@@ -38,6 +38,26 @@ def make_island_price_rule(cumcap_mo, mc_mo, max_mc_reserve, max_mc_all, reserve
     return price_rule
 
 
+def island_prices(need_mw, curve_mo, max_mc_reserve, max_mc_all, reserve_price_max: bool):
+    """
+    Vektorisierte Preisregel (gleiche Logik wie make_island_price_rule)
+    über die SupplyCurve der Merit-Order-Anlagen.
+    """
+    # außerhalb MO -> Reserve / max
+    if reserve_price_max and not np.isnan(max_mc_reserve):
+        fallback = float(max_mc_reserve)
+    elif not np.isnan(max_mc_all):
+        fallback = float(max_mc_all)
+    else:
+        fallback = np.nan
+
+    # innerhalb MO-Kapazität -> mc der marginalen MO-Anlage, Bedarf <= 0 -> NaN
+    price = curve_mo.price_at(need_mw, below=np.nan, above=fallback)
+    # wie price_rule: fehlender Bedarf (NaN) fällt durch alle Vergleiche -> Fallback
+    price[np.isnan(np.asarray(need_mw, dtype=np.float64))] = fallback
+    return price
+
+
 def run_island_model(ts, plants_info, dt_hours: float, voll: float,
                      scarcity_pricing_in_price: bool,
                      price_nan_when_no_conv: bool,
@@ -51,15 +71,14 @@ def run_island_model(ts, plants_info, dt_hours: float, voll: float,
 
     ts = ts.copy()
 
-    # Preisregel bauen und anwenden
-    pr = make_island_price_rule(
-        plants_info["cumcap_mo"],
-        plants_info["mc_mo"],
+    # Preisregel auf das ganze Array anwenden
+    ts["price_eur_mwh"] = island_prices(
+        ts["konv_bedarf_mw"].to_numpy(),
+        plants_info["curve_mo"],
         plants_info["max_mc_reserve"],
         plants_info["max_mc_all"],
         reserve_price_max=reserve_price_max
     )
-    ts["price_eur_mwh"] = ts["konv_bedarf_mw"].apply(pr)
 
     # Kapazität (nur mit mc)
     cap = float(plants_info["stack_cap_effective"])
@@ -8,8 +8,10 @@ Hauptprogramm:
 - baut Plants-Stacks pro Modellzone
 - rechnet Inselmodell
 - optional: Market Coupling (LP)
-- exportiert alles nach Excel
+- exportiert alles nach Excel und/oder Parquet/Feather (EXPORT_FORMATS)
 - optional: Plots
+- optional: Geodaten-Karte direkt aus dem Speicher (SHOW_MAP)
+- run_batch(): mehrere Szenarien mit einmal geladenen SMARD-Daten/Kraftwerkslisten
 
 WICHTIG:
 - Coupled-Plots werden NUR ausgeführt, wenn coupled != None
@@ -29,8 +31,8 @@ if str(SRC_DIR) not in sys.path:
 
 import config as C
 
-from io_smard import build_zone_timeseries
-from plants import load_plants_excel, build_plants_stack_for_zone, guess_zone_column
+from io_smard import build_all_zone_timeseries
+from plants import load_plants_excel, build_plants_stacks, guess_zone_column
 from island import run_island_model
 from coupling import run_market_coupling
 from scenarios import (
@@ -40,7 +42,7 @@ from scenarios import (
     build_ns_from_4zones,
 )
 from kpi import kpi_island, kpi_coupled
-from export_excel import export_all
+from export_excel import export_all, curves_dir_for
 
 # Plot-Funktionen (optional)
 from plots import (
@@ -52,82 +54,176 @@ from plots import (
     plot_coupled_price_heatmaps
 )
 from reporting import print_kpi_table
+from stage_cache import StageCache, stage_key, file_sig
+import profiling
 
 
-def main():
-    # =============================================================================
-    # 1) SMARD Zeitreihen für 4 ÜNB bauen (Basis für alle Szenarien)
-    # =============================================================================
-    zone_results_4 = {}
-    zone_vre_tech_4 = {}
-    meta_4 = {}
+SCENARIOS_ALL = ("DE_SINGLE", "Z4_INSEL", "Z4_COUPLED", "NS_INSEL", "NS_COUPLED")
+
+
+def _stage_cache() -> StageCache:
+    return StageCache(C.STAGE_CACHE_DIR if C.USE_STAGE_CACHE else None)
+
+
+def _prune_stage_cache():
+    _stage_cache().prune(max_mb=C.STAGE_CACHE_MAX_MB, max_age_days=C.STAGE_CACHE_MAX_AGE_DAYS)
+
+
+def stage_keys(scenario=None, coupling_workers=None) -> dict:
+    """
+    Stage-Cache-Schlüssel (siehe stage_cache.py). Jede Stufe enthält den Schlüssel
+    ihrer Vorstufe plus genau die Config-Werte, die sie liest. Ohne scenario nur "ingest".
+    coupling_workers: None = C.COUPLING_WORKERS
+    """
+    keys = {}
+    keys["ingest"] = stage_key("ingest", (
+        [(z, file_sig(cfg["load_xlsx"]), file_sig(cfg["gen_xlsx"])) for z, cfg in C.ZONES_4.items()],
+        C.TIME_FREQ, C.EE_NEEDLES, C.TIME_START, C.TIME_END,
+    ), modules=("io_smard.py",))
+    if scenario is None:
+        return keys
 
+    if scenario in ("NS_INSEL", "NS_COUPLED"):
+        plants = (file_sig(C.PLANTS_XLSX_NS), C.PLANTS_SHEET_NS, C.NS_PLANTS_ZONE_COL,
+                  C.NS_SHARES, C.NS_LOAD_SHARE)
+    else:
+        plants = (file_sig(C.PLANTS_XLSX_Z4), C.PLANTS_SHEET_Z4,
+                  {z: cfg["uenb"] for z, cfg in C.ZONES_4.items()})
+    keys["scenario"] = stage_key("scenario", (
+        keys["ingest"], scenario, plants, C.CAP_MODE, C.FILTER_ACTIVE_ONLY,
+    ), modules=("main.py", "scenarios.py", "plants.py", "supply_curve.py"))
+
+    pricing = (C.VOLL, C.SCARCITY_PRICING_IN_PRICE, C.PRICE_NAN_WHEN_NO_CONV, C.RESERVE_PRICE_MAX)
+    keys["island"] = stage_key("island", (keys["scenario"], pricing), modules=("island.py",))
+
+    if scenario == "Z4_COUPLED":
+        ntc = (C.NTC_BASE_MID, C.NTC_SCALE, C.DEFAULT_TRADE_COST, C.EDGE_TRADE_COSTS)
+    elif scenario == "NS_COUPLED":
+        ntc = (C.NS_NTC_MW, C.NS_TRADE_COST)
+    else:
+        ntc = None
+    if ntc is not None:
+        # highs: jeder Chunk startet ohne Warmstart -> Ergebnis hängt von der Prozesszahl ab
+        workers = None
+        if C.COUPLING_SOLVER == "highs":
+            workers = int(C.COUPLING_WORKERS if coupling_workers is None else coupling_workers)
+        keys["coupling"] = stage_key("coupling", (
+            keys["island"], ntc, pricing, C.COUPLING_BLOCK_SIZE, C.COUPLING_SOLVER, workers,
+        ), modules=("coupling.py", "radial.py", "supply_curve.py"))
+
+        keys["kpi_coupled"] = stage_key("kpi_coupled", (keys["coupling"],), modules=("kpi.py",))
+
+    keys["kpi_island"] = stage_key("kpi_island", (keys["island"],), modules=("kpi.py",))
+    keys["export"] = stage_key("export", (
+        keys["kpi_island"], keys.get("kpi_coupled"), C.EXPORT_FORMATS, C.out_xlsx_name(scenario), C.TIME_FREQ,
+    ), modules=("export_excel.py",))
+    return keys
+
+
+def _output_sig(path):
+    """Größe/mtime einer Export-Datei (bei Ordnern: deren manifest.json); None = fehlt."""
+    p = Path(path)
+    if p.is_dir():
+        p = p / "manifest.json"
+    return file_sig(p) if p.exists() else None
+
+
+def _curves_sig(out_xlsx):
+    """Größe/mtime der Merit-Order-Kurven in <Name>_curves/ (export_all); None = Ordner fehlt."""
+    d = curves_dir_for(out_xlsx)
+    return file_sig(sorted(d.glob("*.npy"))) if d.is_dir() else None
+
+
+def load_base_timeseries():
+    """
+    SMARD-Zeitreihen der 4 ÜNB (Basis für alle Szenarien).
+    Gibt (zone_results_4, zone_vre_tech_4, dt_hours_4) zurück.
+    """
     print("=" * 90)
     print("BAUE 4-ZONEN SMARD-ZEITREIHEN")
     print("=" * 90)
 
-    for z, cfg in C.ZONES_4.items():
-        ts, vre_by_tech, meta = build_zone_timeseries(
-            cfg["load_xlsx"],
-            cfg["gen_xlsx"],
+    zone_results_4, zone_vre_tech_4, meta_4 = _stage_cache().run(
+        "ingest",
+        stage_keys()["ingest"],
+        lambda: build_all_zone_timeseries(
+            C.ZONES_4,
             time_freq=C.TIME_FREQ,
             ee_needles=C.EE_NEEDLES,
-        )
-        zone_results_4[z] = ts
-        zone_vre_tech_4[z] = vre_by_tech
-        meta_4[z] = meta
+            cache_dir=C.CACHE_DIR if C.USE_SMARD_CACHE else None,
+            workers=C.INGEST_WORKERS,
+            start=C.TIME_START,
+            end=C.TIME_END,
+            store_dir=C.TS_STORE_DIR if C.USE_TS_STORE else None,
+        ),
+    )
 
+    for z, meta in meta_4.items():
         print(f"[{z}] load_col={meta['load_col']} | missing_ee={meta['missing_ee']}")
 
     # dt_hours ist konstant (abhängig von TIME_FREQ)
     any_zone = next(iter(meta_4.keys()))
     dt_hours_4 = meta_4[any_zone]["dt_hours"]
-
-    # =============================================================================
-    # 2) Szenario wählen: Welche Modellzonen sollen gerechnet werden?
-    # =============================================================================
-    print("\n" + "=" * 90)
-    print("SCENARIO:", C.SCENARIO)
-    print("=" * 90)
-
-    # Diese Variablen müssen wir am Ende gefüllt haben:
-    # - zone_results: dict zone -> ts
-    # - zone_vre_tech: dict zone -> ee_by_tech
-    # - zone_plants: dict zone -> stack-info
-    # - zones: Liste der Zonennamen
-    # - dt_hours: Zeitschritt in Stunden
-    zone_results = None
-    zone_vre_tech = None
-    zone_plants = None
-    zones = None
-    dt_hours = None
-
-    if C.SCENARIO in ("Z4_INSEL", "Z4_COUPLED"):
+    return zone_results_4, zone_vre_tech_4, dt_hours_4
+
+
+def load_plant_lists(scenarios):
+    """
+    Lädt jede von den Szenarien benötigte Kraftwerksliste genau einmal.
+    Gibt {"Z4": df, "NS": df} zurück (nur die benötigten Schlüssel).
+    """
+    plant_lists = {}
+    if any(s in ("Z4_INSEL", "Z4_COUPLED", "DE_SINGLE") for s in scenarios):
+        plant_lists["Z4"] = load_plants_excel(C.PLANTS_XLSX_Z4, sheet_name=C.PLANTS_SHEET_Z4)
+    if any(s in ("NS_INSEL", "NS_COUPLED") for s in scenarios):
+        plant_lists["NS"] = load_plants_excel(C.PLANTS_XLSX_NS, sheet_name=C.PLANTS_SHEET_NS)
+    return plant_lists
+
+
+def _ensure_plant_lists(plant_lists, scenario):
+    """
+    Gibt plant_lists zurück, ergänzt um die Liste, die scenario braucht, falls sie fehlt
+    (z.B. im Batch vorab nicht geladen, weil die Szenario-Stufe im Cache lag, die
+    Cache-Datei dann aber nicht lesbar war).
+    """
+    need = "NS" if scenario in ("NS_INSEL", "NS_COUPLED") else "Z4"
+    if plant_lists and need in plant_lists:
+        return plant_lists
+    return {**(plant_lists or {}), **load_plant_lists([scenario])}
+
+
+def build_scenario(scenario, zone_results_4, zone_vre_tech_4, dt_hours_4, plant_lists):
+    """
+    Leitet die Modellzonen eines Szenarios aus den 4-Zonen-Zeitreihen ab und baut
+    die Plants-Stacks. Die Eingaben werden nicht verändert (mehrere Szenarien
+    können dieselbe Basis nutzen).
+
+    Gibt (zone_results, zone_vre_tech, zone_plants, zones, dt_hours) zurück.
+    """
+    if scenario in ("Z4_INSEL", "Z4_COUPLED"):
         # --- 4 Zonen unverändert ---
-        zone_results = zone_results_4
-        zone_vre_tech = zone_vre_tech_4
+        zone_results = dict(zone_results_4)
+        zone_vre_tech = dict(zone_vre_tech_4)
         zones = list(zone_results.keys())
         dt_hours = dt_hours_4
 
-        # Plants-Liste 4Z laden
-        plants_raw = load_plants_excel(C.PLANTS_XLSX_Z4, sheet_name=C.PLANTS_SHEET_Z4)
+        # Plants-Liste 4Z
+        plants_raw = plant_lists["Z4"]
 
         # In 4Z ist die Zonen-Spalte typischerweise "ÜNB"
         zone_col = "ÜNB"
 
-        # Stacks bauen
-        zone_plants = {}
-        for z in zones:
-            uenb_name = C.ZONES_4[z]["uenb"]
-            zone_plants[z] = build_plants_stack_for_zone(
-                plants_raw,
-                zone_name=uenb_name,
-                zone_col=zone_col,
-                cap_mode=C.CAP_MODE,
-                filter_active_only=C.FILTER_ACTIVE_ONLY,
-            )
+        # Stacks bauen (alle Zonen in einem Durchgang)
+        stacks = build_plants_stacks(
+            plants_raw,
+            zone_names=[C.ZONES_4[z]["uenb"] for z in zones],
+            zone_col=zone_col,
+            cap_mode=C.CAP_MODE,
+            filter_active_only=C.FILTER_ACTIVE_ONLY,
+        )
+        zone_plants = {z: stacks[C.ZONES_4[z]["uenb"]] for z in zones}
 
-    elif C.SCENARIO == "DE_SINGLE":
+    elif scenario == "DE_SINGLE":
         # --- Deutschland als eine Zone ---
         zone_results, zone_vre_tech, dt_hours = build_de_single_from_4zones(
             zone_results_4, zone_vre_tech_4
@@ -135,20 +231,18 @@ def main():
         zones = ["DE"]
 
         # Plants: wir nehmen 4Z Liste und labeln alles als "DE"
-        plants_raw = load_plants_excel(C.PLANTS_XLSX_Z4, sheet_name=C.PLANTS_SHEET_Z4).copy()
+        plants_raw = plant_lists["Z4"].copy()
         plants_raw["ÜNB"] = "DE"
 
-        zone_plants = {
-            "DE": build_plants_stack_for_zone(
-                plants_raw,
-                zone_name="DE",
-                zone_col="ÜNB",
-                cap_mode=C.CAP_MODE,
-                filter_active_only=C.FILTER_ACTIVE_ONLY,
-            )
-        }
+        zone_plants = build_plants_stacks(
+            plants_raw,
+            zone_names=["DE"],
+            zone_col="ÜNB",
+            cap_mode=C.CAP_MODE,
+            filter_active_only=C.FILTER_ACTIVE_ONLY,
+        )
 
-    elif C.SCENARIO in ("NS_INSEL", "NS_COUPLED"):
+    elif scenario in ("NS_INSEL", "NS_COUPLED"):
         # --- Nord/Süd aus 4Z ableiten ---
         zone_results, zone_vre_tech, dt_hours = build_ns_from_4zones(
             zone_results_4,
@@ -158,8 +252,8 @@ def main():
         )
         zones = ["NORD", "SUED"]
 
-        # Plants: NS Liste laden
-        plants_raw = load_plants_excel(C.PLANTS_XLSX_NS, sheet_name=C.PLANTS_SHEET_NS)
+        # Plants: NS Liste (Kopie, die Zonen-Spalte wird unten umgeschrieben)
+        plants_raw = plant_lists["NS"].copy()
 
         # Welche Spalte enthält die Zone?
         zone_col = C.NS_PLANTS_ZONE_COL or guess_zone_column(plants_raw)
@@ -180,49 +274,83 @@ def main():
         print("[NS] Einzigartige Zonenwerte nach Mapping:", sorted(plants_raw[zone_col].dropna().unique().tolist()))
 
 
-        zone_plants = {}
-        for z in zones:
-            zone_plants[z] = build_plants_stack_for_zone(
-                plants_raw,
-                zone_name=z,
-                zone_col=zone_col,
-                cap_mode=C.CAP_MODE,
-                filter_active_only=C.FILTER_ACTIVE_ONLY,
-            )
+        zone_plants = build_plants_stacks(
+            plants_raw,
+            zone_names=zones,
+            zone_col=zone_col,
+            cap_mode=C.CAP_MODE,
+            filter_active_only=C.FILTER_ACTIVE_ONLY,
+        )
     else:
-        raise ValueError(f"Unbekanntes SCENARIO: {C.SCENARIO}")
+        raise ValueError(f"Unbekanntes SCENARIO: {scenario}")
+
+    return zone_results, zone_vre_tech, zone_plants, zones, dt_hours
+
 
-    # Double-check: alles gesetzt?
-    assert zone_results is not None and zone_vre_tech is not None and zone_plants is not None
-    assert zones is not None and dt_hours is not None
+def run_scenario(scenario, base, plant_lists=None, make_plots=False, show_map=False, coupling_workers=None):
+    """
+    Rechnet ein Szenario komplett (Insel, ggf. Coupling, KPIs, Export).
+    Jede Stufe läuft über den Stage-Cache (USE_STAGE_CACHE, siehe stage_keys).
+
+    base: (zone_results_4, zone_vre_tech_4, dt_hours_4) aus load_base_timeseries()
+    plant_lists: Ergebnis von load_plant_lists(); None = bei Bedarf selbst laden
+    coupling_workers: None = C.COUPLING_WORKERS
+
+    Gibt ein dict mit zone_results, zone_vre_tech, zone_plants, coupled,
+    kpi_island, kpi_coupled, dt_hours und written (Format -> Pfad) zurück.
+    """
+    cache = _stage_cache()
+    keys = stage_keys(scenario, coupling_workers)
 
     # =============================================================================
-    # 3) Inselmodell pro Zone laufen lassen
+    # 2) Szenario: Welche Modellzonen sollen gerechnet werden?
     # =============================================================================
     print("\n" + "=" * 90)
-    print("RUN INSEL-MODELL")
+    print("SCENARIO:", scenario)
     print("=" * 90)
 
-    for z in zones:
-        zone_results[z] = run_island_model(
-            zone_results[z],
-            plants_info=zone_plants[z],
-            dt_hours=dt_hours,
-            voll=C.VOLL,
-            scarcity_pricing_in_price=C.SCARCITY_PRICING_IN_PRICE,
-            price_nan_when_no_conv=C.PRICE_NAN_WHEN_NO_CONV,
-            reserve_price_max=C.RESERVE_PRICE_MAX,
-        )
+    zone_results, zone_vre_tech, zone_plants, zones, dt_hours = cache.run(
+        "scenario",
+        keys["scenario"],
+        lambda: build_scenario(scenario, *base, _ensure_plant_lists(plant_lists, scenario)),
+        label=scenario,
+    )
 
-    kpi_island_df = kpi_island(zone_results, zone_plants)
+    # =============================================================================
+    # 3) Inselmodell pro Zone laufen lassen
+    # =============================================================================
+    print("\n" + "=" * 90)
+    print(f"RUN INSEL-MODELL ({scenario})")
+    print("=" * 90)
+
+    def island():
+        out = {}
+        for z in zones:
+            with profiling.stage("island_zone", zone=z):
+                out[z] = run_island_model(
+                    zone_results[z],
+                    plants_info=zone_plants[z],
+                    dt_hours=dt_hours,
+                    voll=C.VOLL,
+                    scarcity_pricing_in_price=C.SCARCITY_PRICING_IN_PRICE,
+                    price_nan_when_no_conv=C.PRICE_NAN_WHEN_NO_CONV,
+                    reserve_price_max=C.RESERVE_PRICE_MAX,
+                )
+        return out
+
+    zone_results = cache.run("island", keys["island"], island, label=scenario)
+
+    kpi_island_df = cache.run(
+        "kpi_island", keys["kpi_island"], lambda: kpi_island(zone_results, zone_plants), label=scenario
+    )
     print("\nKPIs (INSEL):")
-    print_kpi_table(kpi_island_df, f"KPIs (INSEL) – {C.SCENARIO}")
+    print_kpi_table(kpi_island_df, f"KPIs (INSEL) – {scenario}")
 
 
     # =============================================================================
     # 4) Insel-Plots (optional)
     # =============================================================================
-    if getattr(C, "MAKE_PLOTS", False):
+    if make_plots:
         print("\n" + "=" * 90)
         print("PLOTS (INSEL)")
         print("=" * 90)
@@ -237,12 +365,12 @@ def main():
     coupled = None
     kpi_coupled_df = None
 
-    if C.SCENARIO in ("Z4_COUPLED", "NS_COUPLED"):
+    if scenario in ("Z4_COUPLED", "NS_COUPLED"):
         print("\n" + "=" * 90)
-        print("RUN MARKET COUPLING (LP)")
+        print(f"RUN MARKET COUPLING (LP, {scenario})")
         print("=" * 90)
 
-        if C.SCENARIO == "Z4_COUPLED":
+        if scenario == "Z4_COUPLED":
             ntc_edges = build_ntc_edges_4zone(
                 C.NTC_BASE_MID,
                 C.NTC_SCALE,
@@ -252,26 +380,36 @@ def main():
         else:
             ntc_edges = build_ntc_edges_ns(C.NS_NTC_MW, C.NS_TRADE_COST)
 
-        coupled = run_market_coupling(
-            zones=zones,
-            zone_ts=zone_results,
-            zone_plants=zone_plants,
-            ntc_edges=ntc_edges,
-            dt_hours=dt_hours,
-            voll=C.VOLL,
-            scarcity_pricing_in_price=C.SCARCITY_PRICING_IN_PRICE,
-            price_nan_when_no_conv=C.PRICE_NAN_WHEN_NO_CONV,
-            reserve_price_max=C.RESERVE_PRICE_MAX,
+        coupled = cache.run(
+            "coupling",
+            keys["coupling"],
+            lambda: run_market_coupling(
+                zones=zones,
+                zone_ts=zone_results,
+                zone_plants=zone_plants,
+                ntc_edges=ntc_edges,
+                dt_hours=dt_hours,
+                voll=C.VOLL,
+                scarcity_pricing_in_price=C.SCARCITY_PRICING_IN_PRICE,
+                price_nan_when_no_conv=C.PRICE_NAN_WHEN_NO_CONV,
+                reserve_price_max=C.RESERVE_PRICE_MAX,
+                block_size=C.COUPLING_BLOCK_SIZE,
+                solver=C.COUPLING_SOLVER,
+                workers=C.COUPLING_WORKERS if coupling_workers is None else coupling_workers,
+            ),
+            label=scenario,
         )
 
-        kpi_coupled_df = kpi_coupled(coupled, zones, dt_hours)
+        kpi_coupled_df = cache.run(
+            "kpi_coupled", keys["kpi_coupled"], lambda: kpi_coupled(coupled, zones, dt_hours), label=scenario
+        )
         print("\nKPIs (COUPLED):")
-        print_kpi_table(kpi_coupled_df, f"KPIs (COUPLED) – {C.SCENARIO}")
+        print_kpi_table(kpi_coupled_df, f"KPIs (COUPLED) – {scenario}")
 
     # =============================================================================
     # 6) Coupled-Plots (optional) - ABER NUR wenn coupled wirklich existiert!
     # =============================================================================
-    if getattr(C, "MAKE_PLOTS", False) and (coupled is not None):
+    if make_plots and (coupled is not None):
         print("\n" + "=" * 90)
         print("PLOTS (COUPLED)")
         print("=" * 90)
@@ -281,21 +419,198 @@ def main():
         plot_coupled_price_heatmaps(coupled, zones)
 
     # =============================================================================
-    # 7) Export Excel
+    # 7) Export (Excel und/oder Parquet/Feather, siehe EXPORT_FORMATS)
+    # =============================================================================
+    out_xlsx = C.out_xlsx_name(scenario)
+
+    def export():
+        written = export_all(
+            out_xlsx=out_xlsx,
+            kpi_island_df=kpi_island_df,
+            zone_results=zone_results,
+            zone_vre_tech=zone_vre_tech,
+            zone_plants=zone_plants,
+            coupled=coupled,
+            kpi_coupled_df=kpi_coupled_df,
+            formats=C.EXPORT_FORMATS,
+            meta={"scenario": scenario, "time_freq": C.TIME_FREQ, "dt_hours": dt_hours},
+        )
+        return written, {fmt: _output_sig(p) for fmt, p in written.items()}, _curves_sig(out_xlsx)
+
+    # Hit nur, wenn die Dateien (inkl. <Name>_curves/) noch genau die von damals sind
+    # (nicht gelöscht/überschrieben)
+    written, _, _ = cache.run(
+        "export",
+        keys["export"],
+        export,
+        label=scenario,
+        valid=lambda v: (all(_output_sig(p) == v[1][fmt] for fmt, p in v[0].items())
+                         and _curves_sig(out_xlsx) == v[2]),
+    )
+
+    print()
+    for fmt, path in written.items():
+        print(f"Fertig. {fmt} geschrieben: {path}")
+    cache.print_summary(scenario)
+
+    # =============================================================================
+    # 8) Geodaten-Karte (optional) - direkt aus dem Speicher, ohne Excel
+    # =============================================================================
+    if show_map:
+        if str(SRC_DIR.parent) not in sys.path:
+            sys.path.insert(0, str(SRC_DIR.parent))
+        from geodata_merit_order.main import run_from_results
+
+        run_from_results(
+            C.MAP_SCENARIO or scenario.lower(),
+            zone_results=zone_results,
+            zone_plants=zone_plants,
+            coupled=coupled,
+        )
+
+    return {
+        "zone_results": zone_results,
+        "zone_vre_tech": zone_vre_tech,
+        "zone_plants": zone_plants,
+        "coupled": coupled,
+        "kpi_island": kpi_island_df,
+        "kpi_coupled": kpi_coupled_df,
+        "dt_hours": dt_hours,
+        "written": written,
+    }
+
+
+def main():
+    # =============================================================================
+    # 1) SMARD Zeitreihen für 4 ÜNB bauen (Basis für alle Szenarien)
     # =============================================================================
-    out_xlsx = C.out_xlsx_name()
-    export_all(
-        out_xlsx=out_xlsx,
-        kpi_island_df=kpi_island_df,
-        zone_results=zone_results,
-        zone_vre_tech=zone_vre_tech,
-        zone_plants=zone_plants,
-        coupled=coupled,
-        kpi_coupled_df=kpi_coupled_df,
+    with _profile_run(C.out_xlsx_name(C.SCENARIO), C.SCENARIO):
+        base = load_base_timeseries()
+
+        # Kraftwerksliste lädt run_scenario nur, wenn die Szenario-Stufe nicht im Cache liegt
+        res = run_scenario(
+            C.SCENARIO,
+            base,
+            make_plots=getattr(C, "MAKE_PLOTS", False),
+            show_map=getattr(C, "SHOW_MAP", False),
+        )
+    _prune_stage_cache()
+    return res
+
+
+def _profile_run(out_xlsx, scenario):
+    """Laufzeit-Protokoll (PROFILE_RUN) mit den Config-Werten, die die Laufzeit bestimmen."""
+    meta = {
+        "scenario": scenario,
+        "time_freq": C.TIME_FREQ,
+        "time_start": C.TIME_START,
+        "time_end": C.TIME_END,
+        "coupling_solver": C.COUPLING_SOLVER,
+        "coupling_block_size": C.COUPLING_BLOCK_SIZE,
+        "coupling_workers": C.COUPLING_WORKERS,
+        "ingest_workers": C.INGEST_WORKERS,
+        "export_formats": C.EXPORT_FORMATS,
+        "stage_cache": C.USE_STAGE_CACHE,
+    }
+    return profiling.profile_run(
+        out_xlsx,
+        meta=meta,
+        enabled=C.PROFILE_RUN,
+        trace_malloc=C.PROFILE_TRACEMALLOC,
+        chrome_trace=C.PROFILE_CHROME_TRACE,
     )
 
-    print("\nFertig. Excel geschrieben:", out_xlsx)
+
+# =============================================================================
+# Batch: mehrere Szenarien mit einmal geladenen Daten
+# =============================================================================
+_BATCH = {}
+
+
+def _init_batch_worker(base, plant_lists, coupling_workers):
+    """Legt Basis-Zeitreihen und Kraftwerkslisten einmal pro Prozess ab."""
+    _BATCH["base"] = base
+    _BATCH["plant_lists"] = plant_lists
+    _BATCH["coupling_workers"] = coupling_workers
+
+
+def _run_batch_task(scenario):
+    """Worker-Funktion (muss auf Modulebene liegen, damit sie picklebar ist)."""
+    # eigenes Protokoll pro Szenario (läuft ggf. in einem anderen Prozess)
+    with _profile_run(C.out_xlsx_name(scenario), scenario):
+        res = run_scenario(
+            scenario,
+            _BATCH["base"],
+            _BATCH["plant_lists"],
+            coupling_workers=_BATCH["coupling_workers"],
+        )
+    # nur das Kleine zurück an den Hauptprozess
+    return {k: res[k] for k in ("kpi_island", "kpi_coupled", "written")}
+
+
+def run_batch(scenarios=None, workers=None):
+    """
+    Rechnet mehrere Szenarien in einem Lauf: SMARD-Zeitreihen und Kraftwerkslisten
+    werden nur einmal geladen, jedes Szenario wird daraus über scenarios.build_*
+    abgeleitet und exportiert (Dateiname je Szenario, siehe C.out_xlsx_name).
+
+    scenarios: None = C.BATCH_SCENARIOS
+    workers: None = C.BATCH_WORKERS; >1 -> Szenarien parallel in einem
+             ProcessPoolExecutor (Coupling dann je Szenario mit 1 Prozess).
+             Plots und Karte gibt es im Batch nicht.
+
+    Gibt {scenario: {"kpi_island", "kpi_coupled", "written"}} zurück.
+    """
+    scenarios = list(C.BATCH_SCENARIOS if scenarios is None else scenarios)
+    unknown = [s for s in scenarios if s not in SCENARIOS_ALL]
+    if unknown:
+        raise ValueError(f"Unbekannte Szenarien: {unknown} (erlaubt: {list(SCENARIOS_ALL)})")
+    workers = int(C.BATCH_WORKERS if workers is None else workers)
+
+    # Protokoll des Hauptprozesses (Einlesen + Gesamtdauer); jedes Szenario schreibt sein eigenes
+    with _profile_run(C.out_xlsx_name("BATCH"), scenarios):
+        base = load_base_timeseries()
+        # Kraftwerkslisten vorab nur für nicht gecachte Szenarien laden; fehlt eine doch
+        # (Cache-Datei nicht lesbar), lädt run_scenario sie nach
+        cache = _stage_cache()
+        plant_lists = load_plant_lists(
+            [s for s in scenarios if not cache.has("scenario", stage_keys(s)["scenario"])]
+        )
+
+        # Coupling-Szenarien sind am teuersten -> zuerst starten
+        order = sorted(scenarios, key=lambda s: not s.endswith("_COUPLED"))
+
+        with profiling.stage("scenarios", workers=workers):
+            if workers > 1 and len(scenarios) > 1:
+                from concurrent.futures import ProcessPoolExecutor
+
+                with ProcessPoolExecutor(
+                    max_workers=min(workers, len(scenarios)),
+                    initializer=_init_batch_worker,
+                    initargs=(base, plant_lists, 1),
+                ) as pool:
+                    futures = {s: pool.submit(_run_batch_task, s) for s in order}
+                    results = {s: futures[s].result() for s in scenarios}
+            else:
+                _init_batch_worker(base, plant_lists, None)
+                done = {s: _run_batch_task(s) for s in order}
+                results = {s: done[s] for s in scenarios}
+
+    _prune_stage_cache()
+
+    print("\n" + "=" * 90)
+    print("BATCH FERTIG")
+    print("=" * 90)
+    for s in scenarios:
+        for fmt, path in results[s]["written"].items():
+            print(f"[{s}] {fmt}: {path}")
+    return results
 
 
 if __name__ == "__main__":
-    main()
+    # python main.py            -> C.SCENARIO
+    # python main.py --batch    -> C.BATCH_SCENARIOS (oder: --batch Z4_INSEL NS_COUPLED)
+    if "--batch" in sys.argv[1:]:
+        run_batch([a for a in sys.argv[1:] if a != "--batch"] or None)
+    else:
+        main()
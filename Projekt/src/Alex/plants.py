@@ -14,6 +14,8 @@ Wichtige Modellentscheidung:
 import numpy as np
 import pandas as pd
 
+from supply_curve import SupplyCurve
+
 
 def load_plants_excel(path, sheet_name=None) -> pd.DataFrame:
     """
@@ -83,38 +85,28 @@ def _derive_cap_mw(df: pd.DataFrame, cap_mode: str) -> pd.Series:
     raise ValueError("cap_mode muss 'priority', 'mean_available' oder 'netto' sein.")
 
 
-def build_plants_stack_for_zone(
+def _prepare_plants(
     plants_raw: pd.DataFrame,
-    zone_name: str,
-    zone_col: str = "ÜNB",
-    cap_mode: str = "priority",
-    filter_active_only: bool = True,
-) -> dict:
+    zone_col: str,
+    cap_mode: str,
+    filter_active_only: bool,
+):
     """
-    Baut Angebotsstack für zone_name.
+    Normalisiert die Kraftwerksliste EINMAL für alle Zonen.
 
-    Wichtig:
-    - Filtert nach plants_raw[zone_col] == zone_name (case-insensitive)
-    - Berechnet cap_mw
-    - Liest mc
-    - Anlagen ohne mc werden NICHT genutzt, aber exportiert
+    Gibt (df, zone_key, is_mo, is_reserve) zurück:
+    - df: gefilterte Kopie mit cap_mw und mc
+    - zone_key: Zonenspalte als strip/casefold
+    - is_mo / is_reserve: Merit-Order- bzw. Netzreserve-Flag
+    (alle Series mit demselben Index wie df)
     """
-
     if zone_col not in plants_raw.columns:
         raise KeyError(
             f"Zone-Spalte '{zone_col}' nicht in Kraftwerksliste vorhanden. "
             f"Verfügbare Spalten: {list(plants_raw.columns)}"
         )
 
-    # Filter auf Zone
-    mask = (
-        plants_raw[zone_col]
-        .astype(str)
-        .str.strip()
-        .str.casefold()
-        .eq(str(zone_name).casefold())
-    )
-    df = plants_raw.loc[mask].copy()
+    df = plants_raw.copy()
 
     # Statusfilter (heuristisch)
     if filter_active_only and "Status" in df.columns:
@@ -135,6 +127,8 @@ def build_plants_stack_for_zone(
         raise KeyError(f"mc-Spalte '{mc_col}' nicht gefunden in Kraftwerksliste.")
     df["mc"] = pd.to_numeric(df[mc_col].replace("-", np.nan), errors="coerce")
 
+    zone_key = df[zone_col].astype(str).str.strip().str.casefold()
+
     # Netzreserve erkennen
     status = df["Status"].astype(str).str.casefold() if "Status" in df.columns else pd.Series("", index=df.index)
     is_reserve = status.str.contains("netzreserve", na=False)
@@ -145,22 +139,31 @@ def build_plants_stack_for_zone(
     else:
         is_mo = pd.Series(True, index=df.index)
 
+    return df, zone_key, is_mo, is_reserve
+
+
+def _zone_stack(df: pd.DataFrame, is_mo: np.ndarray, is_reserve: np.ndarray) -> dict:
+    """Stack-dict für die (bereits normalisierten) Anlagen EINER Zone."""
+    cap = df["cap_mw"].to_numpy(dtype=float)
+    has_mc = df["mc"].notna().to_numpy()
+
     # Physikalische Kapazität (inkl. ohne mc)
-    plants_with_cap = df.dropna(subset=["cap_mw"]).copy()
-    plants_with_cap = plants_with_cap[plants_with_cap["cap_mw"] > 0].copy()
+    with_cap = cap > 0  # NaN > 0 ist False
+    plants_with_cap = df[with_cap]
     stack_cap_physical = float(plants_with_cap["cap_mw"].sum())
 
     # Anlagen ohne mc (nicht genutzt)
-    plants_no_mc = plants_with_cap[plants_with_cap["mc"].isna()].copy()
+    plants_no_mc = df[with_cap & ~has_mc]
     missing_mc_cap = float(plants_no_mc["cap_mw"].sum())
 
     # Effektiv nutzbar: cap>0 UND mc vorhanden
-    plants_cap = plants_with_cap.dropna(subset=["mc"]).copy()
+    usable = with_cap & has_mc
+    plants_cap = df[usable]
     stack_cap_effective = float(plants_cap["cap_mw"].sum())
 
     # Stacks
-    mo_stack = plants_cap[is_mo & ~is_reserve].copy()
-    reserve_stack = plants_cap[is_reserve].copy()
+    mo_stack = df[usable & is_mo & ~is_reserve].copy()
+    reserve_stack = df[usable & is_reserve].copy()
 
     mo_stack["stack_class"] = "MERIT_ORDER"
     reserve_stack["stack_class"] = "NETZRESERVE"
@@ -172,8 +175,15 @@ def build_plants_stack_for_zone(
     plants_stack = plants_stack.sort_values("mc").reset_index(drop=True)
     plants_stack["cumcap_mw"] = plants_stack["cap_mw"].cumsum()
 
-    cumcap_mo = mo_stack["cap_mw"].cumsum().to_numpy() if len(mo_stack) else np.array([])
-    mc_mo = mo_stack["mc"].to_numpy() if len(mo_stack) else np.array([])
+    # Angebotskurven als SupplyCurve (cumcap_mo / mc_mo sind Views auf curve_mo)
+    # - curve:           Stack (Merit-Order + Netzreserve), Basis für das Coupling
+    # - curve_mo:        nur Merit-Order, Basis für die Inselpreise
+    # - curve_effective: alle nutzbaren Anlagen (cap > 0 und mc), für den Visualizer
+    curve = SupplyCurve.from_frame(plants_stack)
+    curve_mo = SupplyCurve.from_frame(mo_stack)
+    curve_effective = SupplyCurve.from_frame(plants_cap)
+    cumcap_mo = curve_mo.cumcap
+    mc_mo = curve_mo.mc
 
     max_mc_reserve = float(reserve_stack["mc"].max()) if len(reserve_stack) else np.nan
     max_mc_all = float(plants_stack["mc"].max()) if len(plants_stack) else np.nan
@@ -192,6 +202,9 @@ def build_plants_stack_for_zone(
         "mo_cap": float(mo_stack["cap_mw"].sum()),
         "res_cap": float(reserve_stack["cap_mw"].sum()),
 
+        "curve": curve,
+        "curve_mo": curve_mo,
+        "curve_effective": curve_effective,
         "cumcap_mo": cumcap_mo,
         "mc_mo": mc_mo,
         "max_mc_reserve": max_mc_reserve,
@@ -199,6 +212,64 @@ def build_plants_stack_for_zone(
     }
 
 
+def build_plants_stacks(
+    plants_raw: pd.DataFrame,
+    zone_names,
+    zone_col: str = "ÜNB",
+    cap_mode: str = "priority",
+    filter_active_only: bool = True,
+) -> dict:
+    """
+    Baut die Angebotsstacks für alle zone_names in einem Durchgang.
+
+    - Kraftwerksliste wird einmal normalisiert (Zonenspalte, Status, cap_mw, mc)
+    - danach ein groupby über die Zonenspalte (case-insensitive)
+    - Zonen ohne Anlagen bekommen einen leeren Stack
+
+    Gibt {zone_name: stack-dict} zurück (gleiches Format wie build_plants_stack_for_zone).
+    """
+    df, zone_key, is_mo, is_reserve = _prepare_plants(plants_raw, zone_col, cap_mode, filter_active_only)
+    is_mo = is_mo.to_numpy(dtype=bool)
+    is_reserve = is_reserve.to_numpy(dtype=bool)
+
+    # Zeilenpositionen je Zone (ein groupby über die normalisierte Zonenspalte)
+    positions = df.groupby(zone_key.to_numpy(), sort=False).indices
+    empty = np.array([], dtype=np.int64)
+
+    stacks = {}
+    for z in zone_names:
+        pos = positions.get(str(z).casefold(), empty)
+        stacks[z] = _zone_stack(df.iloc[pos], is_mo[pos], is_reserve[pos])
+    return stacks
+
+
+def build_plants_stack_for_zone(
+    plants_raw: pd.DataFrame,
+    zone_name: str,
+    zone_col: str = "ÜNB",
+    cap_mode: str = "priority",
+    filter_active_only: bool = True,
+) -> dict:
+    """
+    Baut Angebotsstack für zone_name.
+
+    Wichtig:
+    - Filtert nach plants_raw[zone_col] == zone_name (case-insensitive)
+    - Berechnet cap_mw
+    - Liest mc
+    - Anlagen ohne mc werden NICHT genutzt, aber exportiert
+
+    Für mehrere Zonen ist build_plants_stacks() schneller (Liste nur einmal normalisiert).
+    """
+    return build_plants_stacks(
+        plants_raw,
+        [zone_name],
+        zone_col=zone_col,
+        cap_mode=cap_mode,
+        filter_active_only=filter_active_only,
+    )[zone_name]
+
+
 def guess_zone_column(df: pd.DataFrame):
     """
     Heuristik: finde eine Spalte, die wie eine Zonen-Spalte aussieht.
@@ -0,0 +1,302 @@
+# profiling.py
+"""
+Laufzeit-Protokoll für main.py:
+- stage(name): Kontextmanager um eine Stufe (Dauer, RSS, Peak-RSS der Stufe, optional
+  tracemalloc-Peak). Stufen dürfen geschachtelt sein. Der Peak-RSS einer Stufe kommt
+  aus einem Hintergrund-Thread, der den RSS alle RSS_SAMPLE_INTERVAL_S abfragt.
+- record(name, t0): ein kurzes Ereignis (z.B. eine LP-Lösung) von t0 bis jetzt;
+  im Report nur als Statistik (Anzahl, Summe, Median, p95, Max).
+- profile_run(out_xlsx): aktiviert ein Protokoll für einen Lauf und schreibt am
+  Ende <Name>_profile.json (optional <Name>_trace.json für chrome://tracing /
+  Perfetto) neben den Export.
+
+Ohne aktives Protokoll sind stage() und record() praktisch kostenlos.
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+SRC_DIR = Path(__file__).resolve().parent
+
+# Stapel der aktiven Protokolle (innerstes zuletzt)
+_ACTIVE = []
+
+# Chrome-Trace: Einzelereignisse (record) nur bis zu dieser Anzahl je Name
+MAX_TRACE_EVENTS = 200_000
+
+# Abtastintervall für den Peak-RSS je Stufe (Sekunden)
+RSS_SAMPLE_INTERVAL_S = 0.02
+
+
+# =============================================================================
+# Speicher
+# =============================================================================
+def rss_mb():
+    """Aktueller Arbeitsspeicher (RSS) des Prozesses in MB; None wenn unbekannt."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import psutil
+    except ImportError:
+        return None
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def peak_rss_mb():
+    """
+    Bisheriger Spitzenwert des RSS in MB seit Prozessstart (nur steigend, nicht je Stufe);
+    None wenn unbekannt.
+    """
+    try:
+        import resource
+    except ImportError:
+        resource = None
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux: KB, macOS: Bytes
+        return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+    try:
+        import psutil
+    except ImportError:
+        return None
+    info = psutil.Process().memory_info()
+    return getattr(info, "peak_wset", info.rss) / 2**20
+
+
+def _max(a, b):
+    # Peak-RSS wird vom System nur grob nachgeführt -> nie kleiner als der aktuelle RSS
+    vals = [v for v in (a, b) if v is not None]
+    return max(vals) if vals else None
+
+
+def git_commit():
+    """Kurzer Hash des aktuellen Git-Commits (None außerhalb eines Repos)."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SRC_DIR,
+            capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+# =============================================================================
+# Protokoll
+# =============================================================================
+class RunProfiler:
+    """Sammelt Stufen und Ereignisse eines Laufs (ein Prozess)."""
+
+    def __init__(self, meta=None, trace_malloc=False):
+        self.meta = dict(meta or {})
+        self.trace_malloc = trace_malloc
+        self.t0 = time.perf_counter()
+        self.created = datetime.now().isoformat(timespec="seconds")
+        self.stages = []      # abgeschlossene Stufen (dicts)
+        self.events = {}      # name -> Liste (start, ende) in perf_counter-Sekunden
+        self._open = []       # laufende Stufen
+        self._sampler = None  # Thread für den Peak-RSS der offenen Stufen
+        self._stop = threading.Event()
+
+    @contextmanager
+    def stage(self, name, **args):
+        args = {k: v for k, v in args.items() if v is not None}
+        entry = {"name": name, "depth": len(self._open), "args": args}
+        entry["rss_start_mb"] = rss_mb()
+        entry["peak_rss_mb"] = entry["rss_start_mb"]
+        self._start_sampler()
+        if self.trace_malloc:
+            self._fold_tracemalloc_peak()
+            entry["tm_start"] = tracemalloc.get_traced_memory()[0]
+            entry["tm_peak"] = entry["tm_start"]
+        self._open.append(entry)
+        start = time.perf_counter()
+        try:
+            yield entry["args"]
+        finally:
+            end = time.perf_counter()
+            if self.trace_malloc:
+                self._fold_tracemalloc_peak()
+                tm_start, tm_peak = entry.pop("tm_start"), entry.pop("tm_peak")
+                entry["tracemalloc_peak_mb"] = (tm_peak - tm_start) / 2**20
+            self._open.pop()
+            entry["start_s"] = start - self.t0
+            entry["duration_s"] = end - start
+            entry["rss_end_mb"] = rss_mb()
+            entry["peak_rss_mb"] = _max(entry["peak_rss_mb"], entry["rss_end_mb"])
+            self.stages.append(entry)
+
+    def _start_sampler(self):
+        if self._sampler is not None or rss_mb() is None:
+            return
+        self._sampler = threading.Thread(target=self._sample_rss, name="rss-sampler", daemon=True)
+        self._sampler.start()
+
+    def _sample_rss(self):
+        # Peak-RSS je offener Stufe nachführen (kürzere Stufen: nur Start/Ende)
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL_S):
+            rss = rss_mb()
+            for e in list(self._open):
+                e["peak_rss_mb"] = _max(e.get("peak_rss_mb"), rss)
+
+    def close(self):
+        """Beendet den Abtast-Thread."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+            self._sampler = None
+
+    def _fold_tracemalloc_peak(self):
+        # Peak seit dem letzten Reset an alle offenen Stufen weitergeben, dann zurücksetzen
+        peak = tracemalloc.get_traced_memory()[1]
+        for e in self._open:
+            e["tm_peak"] = max(e["tm_peak"], peak)
+        tracemalloc.reset_peak()
+
+    def record(self, name, start, end):
+        self.events.setdefault(name, []).append((start, end))
+
+    # -------------------------------------------------------------------------
+    def report(self) -> dict:
+        """Report als dict (JSON-fähig)."""
+        events = {}
+        for name, spans in self.events.items():
+            d = np.array([e - s for s, e in spans]) * 1000.0
+            events[name] = {
+                "count": int(d.size),
+                "total_s": float(d.sum() / 1000.0),
+                "mean_ms": float(d.mean()),
+                "p50_ms": float(np.percentile(d, 50)),
+                "p95_ms": float(np.percentile(d, 95)),
+                "max_ms": float(d.max()),
+            }
+        stages = sorted(self.stages, key=lambda e: e["start_s"])
+        return {
+            "created": self.created,
+            "git_commit": git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "pid": os.getpid(),
+            "meta": self.meta,
+            "total_s": time.perf_counter() - self.t0,
+            "process_peak_rss_mb": _max(peak_rss_mb(), rss_mb()),
+            "tracemalloc": self.trace_malloc,
+            "stages": stages,
+            "events": events,
+        }
+
+    def chrome_trace(self) -> dict:
+        """Trace im Chrome-Trace-Event-Format (Zeiten in Mikrosekunden)."""
+        pid = os.getpid()
+        out = []
+        for e in self.stages:
+            args = dict(e["args"])
+            args.update({k: e[k] for k in ("rss_end_mb", "peak_rss_mb", "tracemalloc_peak_mb") if k in e})
+            out.append({
+                "name": e["name"], "cat": "stage", "ph": "X", "pid": pid, "tid": 0,
+                "ts": e["start_s"] * 1e6, "dur": e["duration_s"] * 1e6, "args": args,
+            })
+            if e.get("rss_end_mb") is not None:
+                out.append({
+                    "name": "RSS (MB)", "ph": "C", "pid": pid,
+                    "ts": (e["start_s"] + e["duration_s"]) * 1e6, "args": {"rss": e["rss_end_mb"]},
+                })
+        for name, spans in self.events.items():
+            for s, t in spans[:MAX_TRACE_EVENTS]:
+                out.append({
+                    "name": name, "cat": "event", "ph": "X", "pid": pid, "tid": 1,
+                    "ts": (s - self.t0) * 1e6, "dur": (t - s) * 1e6,
+                })
+        return {"traceEvents": out, "displayTimeUnit": "ms"}
+
+    def write(self, out_xlsx, chrome_trace=False) -> dict:
+        """Schreibt <Name>_profile.json (+ <Name>_trace.json) neben out_xlsx."""
+        p = Path(out_xlsx)
+        p.parent.mkdir(parents=True, exist_ok=True)
+        written = {"profile": p.with_name(f"{p.stem}_profile.json")}
+        written["profile"].write_text(json.dumps(self.report(), indent=2, default=str), encoding="utf-8")
+        if chrome_trace:
+            written["trace"] = p.with_name(f"{p.stem}_trace.json")
+            written["trace"].write_text(json.dumps(self.chrome_trace()), encoding="utf-8")
+        return written
+
+    def print_summary(self):
+        print("\n" + "=" * 90)
+        print("LAUFZEIT-PROTOKOLL")
+        print("=" * 90)
+        for e in sorted(self.stages, key=lambda e: e["start_s"]):
+            label = "  " * e["depth"] + e["name"]
+            extra = " ".join(f"{k}={v}" for k, v in e["args"].items())
+            peak = e.get("peak_rss_mb")
+            peak = f"{peak:8.0f} MB" if peak is not None else " " * 11
+            print(f"{label:<36s} {e['duration_s']:9.2f} s  peak RSS {peak}  {extra}")
+        for name, st in self.report()["events"].items():
+            print(f"{name:<36s} {st['total_s']:9.2f} s  n={st['count']}  "
+                  f"p50={st['p50_ms']:.2f} ms  p95={st['p95_ms']:.2f} ms  max={st['max_ms']:.2f} ms")
+
+
+# =============================================================================
+# Modul-Schnittstelle (no-op ohne aktives Protokoll)
+# =============================================================================
+def active():
+    return _ACTIVE[-1] if _ACTIVE else None
+
+
+@contextmanager
+def stage(name, **args):
+    """Misst eine Stufe im aktiven Protokoll; liefert ein dict für zusätzliche Angaben."""
+    prof = active()
+    if prof is None:
+        yield dict(args)
+        return
+    with prof.stage(name, **args) as info:
+        yield info
+
+
+def record(name, t0):
+    """Ereignis name von t0 (time.perf_counter()) bis jetzt."""
+    if _ACTIVE:
+        _ACTIVE[-1].record(name, t0, time.perf_counter())
+
+
+@contextmanager
+def profile_run(out_xlsx, meta=None, enabled=True, trace_malloc=False, chrome_trace=False):
+    """
+    Protokolliert alles im with-Block und schreibt den Report neben out_xlsx
+    (auch wenn der Lauf mit einer Exception endet).
+    enabled=False -> nichts messen, yield None.
+    """
+    if not enabled:
+        yield None
+        return
+
+    started_tm = trace_malloc and not tracemalloc.is_tracing()
+    if started_tm:
+        tracemalloc.start()
+    prof = RunProfiler(meta, trace_malloc=trace_malloc)
+    _ACTIVE.append(prof)
+    try:
+        with prof.stage("run"):
+            yield prof
+    finally:
+        _ACTIVE.remove(prof)
+        prof.close()
+        if started_tm:
+            tracemalloc.stop()
+        prof.print_summary()
+        for kind, path in prof.write(out_xlsx, chrome_trace=chrome_trace).items():
+            print(f"[Profil] {kind}: {path}")
@@ -0,0 +1,270 @@
+# radial.py
+"""
+Market Clearing ohne LP für baumförmige (radiale) NTC-Topologien.
+
+Idee:
+- Pro Zone ist das Angebot eine Treppenfunktion im Preis:
+  EE (mc = 0, Menge EE_av), konventionelle Segmente (mc, cap), Unserved (VOLL, unbegrenzt).
+- Netto-Überschuss einer Zone bei Preis p: E_z(p) = Angebot(p) - Last.
+- In einem Baum sieht der Elternknoten einen Teilbaum als Export-Kurve:
+    X_c(P) = clip(E_c(P - tc_up), 0, ntc_up) + clip(E_c(P + tc_down), -ntc_down, 0)
+  (Export, wenn der Teilbaum mindestens tc billiger ist; Import analog.)
+- Die Wurzel wird geräumt: kleinster Kandidatenpreis P mit E_gesamt(P) >= 0
+  (Binärsuche, vektorisiert über alle Zeitschritte).
+- Danach top-down: Mengen auf Zone/Teilbäume verteilen, Flüsse festlegen,
+  jeder Teilbaum räumt mit seinem Exportziel.
+
+Alle Zeitschritte werden gleichzeitig auf numpy-Arrays gerechnet.
+Für vermaschte Netze (Zyklen) gilt das nicht -> dort bleibt das LP.
+"""
+
+import numpy as np
+
+# Toleranz für Preis-/Mengenvergleiche (Preisverschiebungen um tc sind Float-Arithmetik)
+_TOL = 1e-9
+
+
+def edges_form_forest(zones, ntc_edges) -> bool:
+    """
+    True, wenn die NTC-Kanten (ungerichtet betrachtet) einen Wald bilden:
+    keine Zyklen, keine Mehrfachkanten, keine unbekannten Zonen, tc >= 0.
+    """
+    parent = {z: z for z in zones}
+
+    def find(z):
+        while parent[z] != z:
+            parent[z] = parent[parent[z]]
+            z = parent[z]
+        return z
+
+    seen = set()
+    for (a, b, ntc, tc) in ntc_edges:
+        if a not in parent or b not in parent or a == b or float(tc) < 0:
+            return False
+        if (a, b) in seen:
+            return False  # parallele Kante gleicher Richtung
+        seen.add((a, b))
+
+        pair_known = (b, a) in seen
+        if pair_known:
+            continue  # Gegenrichtung derselben Verbindung
+        ra, rb = find(a), find(b)
+        if ra == rb:
+            return False  # Zyklus
+        parent[ra] = rb
+    return True
+
+
+def _build_tree(zones, ntc_edges):
+    """
+    Wurzelt jede Komponente an der ersten Zone (Reihenfolge von zones).
+    Gibt (roots, children, link) zurück, mit
+    link[c] = (ntc_up, tc_up, ntc_down, tc_down) für die Kante Kind c <-> Eltern.
+    """
+    directed = {(a, b): (float(ntc), float(tc)) for (a, b, ntc, tc) in ntc_edges}
+    neighbours = {z: [] for z in zones}
+    for (a, b) in directed:
+        if b not in neighbours[a]:
+            neighbours[a].append(b)
+        if a not in neighbours[b]:
+            neighbours[b].append(a)
+
+    roots, children, link, visited = [], {z: [] for z in zones}, {}, set()
+    for r in zones:
+        if r in visited:
+            continue
+        roots.append(r)
+        visited.add(r)
+        stack = [r]
+        while stack:
+            p = stack.pop()
+            for c in neighbours[p]:
+                if c in visited:
+                    continue
+                visited.add(c)
+                children[p].append(c)
+                ntc_up, tc_up = directed.get((c, p), (0.0, 0.0))
+                ntc_down, tc_down = directed.get((p, c), (0.0, 0.0))
+                link[c] = (ntc_up, tc_up, ntc_down, tc_down)
+                stack.append(c)
+    return roots, children, link
+
+
+class _RadialMarket:
+    """Hilfsobjekt: Kurven, Baum und Zeitreihen für die Räumung."""
+
+    def __init__(self, zones, supply, ntc_edges, voll, L, EE_av):
+        self.zones = list(zones)
+        self.voll = float(voll)
+        self.roots, self.children, self.link = _build_tree(self.zones, ntc_edges)
+
+        self.mc, self.cumcap = {}, {}
+        self.load, self.ee = {}, {}
+        for j, z in enumerate(self.zones):
+            self.mc[z] = supply[z].mc
+            self.cumcap[z] = np.concatenate([[0.0], supply[z].cumcap])
+            self.load[z] = L[:, j]
+            self.ee[z] = EE_av[:, j]
+
+        # Kandidatenpreise pro Teilbaum (im Preisraum der Teilbaum-Wurzel)
+        self.cand = {}
+        for r in self.roots:
+            self._candidates(r)
+
+    def _candidates(self, z):
+        own = [np.array([0.0, self.voll]), self.mc[z]]
+        for c in self.children[z]:
+            cc = self._candidates(c)
+            _, tc_up, _, tc_down = self.link[c]
+            own.append(cc + tc_up)
+            own.append(cc - tc_down)
+        self.cand[z] = np.unique(np.concatenate(own))
+        return self.cand[z]
+
+    # -------------------------------------------------------------------------
+    # Überschuss-Kurven
+    # -------------------------------------------------------------------------
+    def local_excess(self, z, p, upper: bool):
+        """
+        Netto-Überschuss der Zone z bei Preis p (Array).
+        upper=False: nur Segmente mit Kosten < p (linker Grenzwert)
+        upper=True : Segmente mit Kosten <= p (rechter Grenzwert)
+        """
+        if upper:
+            conv = self.cumcap[z][np.searchsorted(self.mc[z], p + _TOL, side="right")]
+            ee = np.where(p + _TOL >= 0.0, self.ee[z], 0.0)
+            uns = np.where(p + _TOL >= self.voll, np.inf, 0.0)
+        else:
+            conv = self.cumcap[z][np.searchsorted(self.mc[z], p - _TOL, side="left")]
+            ee = np.where(p - _TOL > 0.0, self.ee[z], 0.0)
+            uns = np.where(p - _TOL > self.voll, np.inf, 0.0)
+        return conv + ee + uns - self.load[z]
+
+    def child_export(self, c, p, upper: bool):
+        """Export des Teilbaums c an seinen Elternknoten bei Elternpreis p."""
+        ntc_up, tc_up, ntc_down, tc_down = self.link[c]
+        return (
+            np.clip(self.total_excess(c, p - tc_up, upper), 0.0, ntc_up)
+            + np.clip(self.total_excess(c, p + tc_down, upper), -ntc_down, 0.0)
+        )
+
+    def total_excess(self, z, p, upper: bool):
+        """Netto-Überschuss des Teilbaums mit Wurzel z bei Preis p."""
+        e = self.local_excess(z, p, upper)
+        for c in self.children[z]:
+            e = e + self.child_export(c, p, upper)
+        return e
+
+    def clear(self, z, target):
+        """
+        Kleinster Kandidatenpreis p je Zeitschritt mit total_excess(z, p) >= target.
+        Binärsuche über die sortierten Kandidaten, alle Zeitschritte gleichzeitig.
+        """
+        grid = self.cand[z]
+        lo = np.zeros(len(target), dtype=np.int64)
+        hi = np.full(len(target), len(grid) - 1, dtype=np.int64)
+        while np.any(lo < hi):
+            mid = (lo + hi) // 2
+            ok = self.total_excess(z, grid[mid], upper=True) >= target - _TOL
+            hi = np.where(ok, mid, hi)
+            lo = np.where(ok, lo, mid + 1)
+        return grid[lo]
+
+    # -------------------------------------------------------------------------
+    # Top-down Zuteilung
+    # -------------------------------------------------------------------------
+    def allocate(self, z, price, target, out):
+        """
+        Teilbaum z räumt bei Preis `price` mit Netto-Export `target`.
+        Schreibt Preis, lokalen Überschuss und Flüsse nach `out`.
+        """
+        out["price"][z] = price
+
+        parts = [(self.local_excess(z, price, False), self.local_excess(z, price, True))]
+        for c in self.children[z]:
+            parts.append((self.child_export(c, price, False), self.child_export(c, price, True)))
+
+        # alle Komponenten auf Untergrenze, Rest der Reihe nach bis zur Obergrenze auffüllen
+        rest = np.maximum(target - sum(lo for lo, _ in parts), 0.0)
+        values = []
+        for lo, hi in parts:
+            take = np.minimum(hi - lo, rest)
+            values.append(lo + take)
+            rest = rest - take
+
+        out["excess"][z] = values[0]
+
+        for c, x in zip(self.children[z], values[1:]):
+            ntc_up, tc_up, ntc_down, tc_down = self.link[c]
+            out["flow"][(c, z)] = np.maximum(x, 0.0)
+            out["flow"][(z, c)] = np.maximum(-x, 0.0)
+
+            # Kindpreis: bei nicht ausgelasteter Kante um tc verschoben,
+            # sonst räumt der Teilbaum selbst mit festem Export x
+            exp_inner = (x > _TOL) & (x < ntc_up - _TOL)
+            imp_inner = (x < -_TOL) & (x > -ntc_down + _TOL)
+            own = self.clear(c, x)
+            child_price = np.where(exp_inner, price - tc_up, np.where(imp_inner, price + tc_down, own))
+            self.allocate(c, child_price, x, out)
+
+    def dispatch(self, z, excess, eps):
+        """Füllt den Stack der Zone in Merit-Order bis Produktion = Last + Überschuss."""
+        prod = np.maximum(self.load[z] + excess, 0.0)
+        cumcap, mc, ee = self.cumcap[z], self.mc[z], self.ee[z]
+
+        # EE (mc = 0) liegt in der Merit-Order hinter Segmenten mit mc < 0
+        cap_neg = cumcap[np.searchsorted(mc, 0.0, side="left")]
+        cap_all = cumcap[-1]
+
+        neg_fill = np.minimum(prod, cap_neg)
+        ee_used = np.clip(prod - cap_neg, 0.0, ee)
+        pos_fill = np.clip(prod - cap_neg - ee, 0.0, cap_all - cap_neg)
+        unserved = np.maximum(prod - cap_all - ee, 0.0)
+        gen_conv = neg_fill + pos_fill
+
+        # höchstes genutztes Segment (Segment k genutzt, wenn Füllung über Start + eps)
+        k = np.searchsorted(cumcap[:-1], gen_conv - eps, side="left") - 1
+        max_used_mc = np.where(k >= 0, mc[np.clip(k, 0, None)] if len(mc) else np.nan, np.nan)
+
+        return ee_used, gen_conv, unserved, max_used_mc
+
+
+def solve_radial(zones, supply, ntc_edges, voll, L, EE_av, eps: float = 1e-6):
+    """
+    Räumt alle Zeitschritte auf einmal für einen NTC-Wald.
+
+    Gibt (zone_res, duals) zurück, im selben Format wie die LP-Auswertung
+    in coupling.py (zone_res[z] mit ee_used, gen_conv, unserved, import,
+    export, max_used_mc; duals als T x Zonen = Zonenpreise).
+    """
+    m = _RadialMarket(zones, supply, ntc_edges, voll, L, EE_av)
+    T = L.shape[0]
+
+    out = {"price": {}, "excess": {}, "flow": {}}
+    for r in m.roots:
+        target = np.zeros(T)
+        m.allocate(r, m.clear(r, target), target, out)
+
+    zone_res = {}
+    for z in m.zones:
+        ee_used, gen_conv, unserved, max_used_mc = m.dispatch(z, out["excess"][z], eps)
+
+        imp = np.zeros(T)
+        exp = np.zeros(T)
+        for (a, b), f in out["flow"].items():
+            if b == z:
+                imp += f
+            if a == z:
+                exp += f
+
+        zone_res[z] = {
+            "ee_used": ee_used,
+            "gen_conv": gen_conv,
+            "unserved": unserved,
+            "import": imp,
+            "export": exp,
+            "max_used_mc": max_used_mc,
+        }
+
+    duals = np.column_stack([out["price"][z] for z in m.zones])
+    return zone_res, duals
@@ -0,0 +1,159 @@
+# stage_cache.py
+"""
+Stage-Cache für main.py:
+- jede Stufe (Einlesen, Szenario/Stacks, Insel, Coupling, KPIs, Export) legt ihr
+  Ergebnis als Pickle unter einem Schlüssel ab
+- der Schlüssel kommt aus den Eingaben der Stufe: Schlüssel der Vorstufe, die
+  Config-Werte, die sie liest, Quellcode der beteiligten Module und
+  Größe/mtime der Eingabedateien
+- ein neuer Lauf rechnet nur die Stufen, deren Schlüssel sich geändert hat
+  (z.B. nur NTC_SCENARIO geändert -> Coupling, KPIs, Export)
+- prune() löscht lange unbenutzte Einträge und hält den Ordner unter einer Größe
+"""
+
+import hashlib
+import os
+import pickle
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import profiling
+
+SRC_DIR = Path(__file__).resolve().parent
+
+# erhöhen, wenn sich das Format der gespeicherten Ergebnisse ändert
+STAGE_CACHE_VERSION = 1
+
+
+def file_sig(paths) -> list:
+    """(Pfad, Größe, mtime) je Datei; paths darf ein Pfad oder eine Liste sein."""
+    if isinstance(paths, (str, os.PathLike)):
+        paths = [paths]
+    sig = []
+    for p in paths:
+        st = Path(p).stat()
+        sig.append((str(Path(p).resolve()), st.st_size, st.st_mtime_ns))
+    return sig
+
+
+@lru_cache(maxsize=None)
+def _code_sig(modules: tuple) -> str:
+    """Hash über den Quellcode der Module (Dateinamen relativ zu src/)."""
+    h = hashlib.sha1()
+    for name in modules:
+        h.update(name.encode("utf-8"))
+        h.update((SRC_DIR / name).read_bytes())
+    return h.hexdigest()
+
+
+def stage_key(stage: str, parts, modules=()) -> str:
+    """
+    Schlüssel einer Stufe. parts: alles, wovon das Ergebnis abhängt (über repr
+    gehasht, also nur einfache Werte/Container verwenden).
+    """
+    h = hashlib.sha1()
+    h.update(repr((STAGE_CACHE_VERSION, stage, parts, _code_sig(tuple(modules)))).encode("utf-8"))
+    return h.hexdigest()[:16]
+
+
+class StageCache:
+    """
+    cache_dir=None -> Cache aus, run() rechnet immer.
+    log: Liste (label, stage, hit) aller run()-Aufrufe dieses Objekts.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.log = []
+
+    def path(self, stage: str, key: str) -> Path:
+        return self.cache_dir / f"{stage}_{key}.pkl"
+
+    def has(self, stage: str, key: str) -> bool:
+        return self.cache_dir is not None and self.path(stage, key).exists()
+
+    def run(self, stage: str, key: str, compute, label: str = "", valid=None):
+        """
+        Ergebnis der Stufe aus dem Cache oder per compute() berechnen und ablegen.
+        valid: optionale Prüfung des gecachten Werts (z.B. ob Export-Dateien noch existieren).
+        """
+        # jede Stufe landet (mit hit/miss) im Laufzeit-Protokoll, falls aktiv
+        with profiling.stage(stage, scenario=label or None) as info:
+            if self.cache_dir is None:
+                info["cache"] = "off"
+                return compute()
+
+            prefix = f"[Stage-Cache] {label + ' | ' if label else ''}{stage}"
+            p = self.path(stage, key)
+            if p.exists():
+                try:
+                    with open(p, "rb") as f:
+                        value = pickle.load(f)
+                    if valid is None or valid(value):
+                        print(f"{prefix}: HIT ({key})")
+                        # mtime = letzte Nutzung (für prune)
+                        os.utime(p)
+                        self.log.append((label, stage, True))
+                        info["cache"] = "hit"
+                        return value
+                except Exception as e:
+                    print(f"{prefix}: Cache-Datei nicht lesbar ({e})")
+
+            print(f"{prefix}: MISS ({key}) -> rechne")
+            info["cache"] = "miss"
+            value = compute()
+            self._write(p, value)
+            self.log.append((label, stage, False))
+            return value
+
+    def _write(self, p: Path, value):
+        p.parent.mkdir(parents=True, exist_ok=True)
+        # erst in eine Temp-Datei, dann umbenennen (parallele Batch-Prozesse)
+        tmp = p.with_name(f"{p.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, p)
+
+    def prune(self, max_mb=None, max_age_days=None) -> int:
+        """
+        Räumt den Cache-Ordner auf: löscht Einträge, die länger als max_age_days nicht
+        benutzt wurden, danach die am längsten unbenutzten, bis höchstens max_mb übrig sind.
+        Gibt die Anzahl gelöschter Dateien zurück.
+        """
+        if self.cache_dir is None or not self.cache_dir.exists():
+            return 0
+        files = []
+        for p in self.cache_dir.glob("*.pkl"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, p))
+        files.sort()  # älteste zuerst
+
+        now = time.time()
+        total = sum(size for _, size, _ in files)
+        removed, freed = 0, 0
+        for mtime, size, p in files:
+            too_old = max_age_days is not None and now - mtime > max_age_days * 86400
+            too_big = max_mb is not None and total > max_mb * 2**20
+            if not (too_old or too_big):
+                continue
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            freed += size
+        if removed:
+            print(f"[Stage-Cache] aufgeräumt: {removed} Dateien, {freed / 2**20:.0f} MB")
+        return removed
+
+    def print_summary(self, label: str = ""):
+        entries = [(s, hit) for (l, s, hit) in self.log if not label or l == label]
+        if self.cache_dir is None or not entries:
+            return
+        text = ", ".join(f"{s}={'hit' if hit else 'miss'}" for s, hit in entries)
+        print(f"[Stage-Cache] {label + ': ' if label else ''}{text}")
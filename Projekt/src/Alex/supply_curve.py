@@ -0,0 +1,165 @@
+# supply_curve.py
+"""
+SupplyCurve: Merit-Order einer Zone als unveränderliche Treppenfunktion.
+
+- Segmente (cap, mc) nach mc sortiert, als zusammenhängende float64-Arrays (read-only)
+- price_at(): Preis der marginalen Anlage für ein ganzes Bedarfs-Array
+- dispatch(): gedeckter Bedarf, Unserved und marginales Segment pro Zeitschritt
+- save()/load(): Binärdatei (.npy mit 2 x n: Zeile 0 = cap, Zeile 1 = mc),
+  load() liest per Memory-Map ohne Kopie
+
+Gemeinsam genutzt von plants (Stacks), island (Preisregel), coupling/radial
+(Segmente) und dem Geodaten-Visualizer. Braucht nur numpy.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+
+def _readonly(a) -> np.ndarray:
+    a = np.ascontiguousarray(a, dtype=np.float64)
+    if a.flags.writeable:
+        a.flags.writeable = False
+    return a
+
+
+class SupplyCurve:
+    """
+    Unveränderliche Angebotskurve.
+
+    Attribute (alle float64, read-only):
+    - cap:    Leistung pro Segment (MW)
+    - mc:     Grenzkosten pro Segment (EUR/MWh), aufsteigend
+    - cumcap: kumulierte Leistung (MW), cumcap[k] = Ende von Segment k
+    """
+
+    __slots__ = ("cap", "mc", "cumcap")
+
+    def __init__(self, cap, mc):
+        cap = np.array(cap, dtype=np.float64)  # eigene Kopie
+        mc = np.array(mc, dtype=np.float64)
+        if cap.ndim != 1 or cap.shape != mc.shape:
+            raise ValueError(f"cap und mc müssen 1D und gleich lang sein: {cap.shape} / {mc.shape}")
+        if np.any(np.diff(mc) < 0):
+            raise ValueError("mc muss aufsteigend sortiert sein (SupplyCurve.from_segments sortiert).")
+        self._set(cap, mc)
+
+    def _set(self, cap, mc):
+        object.__setattr__(self, "cap", _readonly(cap))
+        object.__setattr__(self, "mc", _readonly(mc))
+        object.__setattr__(self, "cumcap", _readonly(np.cumsum(self.cap)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("SupplyCurve ist unveränderlich.")
+
+    def __reduce__(self):
+        # für pickle (ProcessPoolExecutor): über den Konstruktor neu aufbauen
+        return (SupplyCurve, (np.asarray(self.cap), np.asarray(self.mc)))
+
+    # -------------------------------------------------------------------------
+    # Konstruktion
+    # -------------------------------------------------------------------------
+    @classmethod
+    def from_segments(cls, cap, mc):
+        """
+        Aus beliebigen Segmenten: ohne cap/mc (NaN) und cap <= 0 raus,
+        stabil nach mc sortiert (gleiche mc behalten ihre Reihenfolge).
+        """
+        cap = np.asarray(cap, dtype=np.float64)
+        mc = np.asarray(mc, dtype=np.float64)
+        keep = ~np.isnan(cap) & ~np.isnan(mc) & (cap > 0)
+        cap, mc = cap[keep], mc[keep]
+        order = np.argsort(mc, kind="stable")
+        return cls(cap[order], mc[order])
+
+    @classmethod
+    def from_frame(cls, df, cap_col: str = "cap_mw", mc_col: str = "mc"):
+        """Aus einem Stack-DataFrame (z.B. plants_stack)."""
+        return cls.from_segments(df[cap_col].to_numpy(dtype=float), df[mc_col].to_numpy(dtype=float))
+
+    # -------------------------------------------------------------------------
+    # Eigenschaften
+    # -------------------------------------------------------------------------
+    def __len__(self) -> int:
+        return len(self.cap)
+
+    @property
+    def total(self) -> float:
+        """Gesamtleistung (MW)."""
+        return float(self.cumcap[-1]) if len(self.cumcap) else 0.0
+
+    def __repr__(self) -> str:
+        if not len(self):
+            return "SupplyCurve(leer)"
+        return (f"SupplyCurve({len(self)} Segmente, {self.total:.0f} MW, "
+                f"mc {self.mc[0]:.1f}..{self.mc[-1]:.1f} EUR/MWh)")
+
+    # -------------------------------------------------------------------------
+    # Auswertung (vektorisiert)
+    # -------------------------------------------------------------------------
+    def price_at(self, demand, below=np.nan, above=np.nan) -> np.ndarray:
+        """
+        Preis der marginalen Anlage für jeden Bedarf:
+        - 0 < d <= total -> mc des Segments, in dem d liegt
+        - d <= 0         -> below
+        - d > total      -> above (z.B. Reservepreis / VOLL)
+        - d = NaN        -> NaN
+        """
+        d = np.asarray(demand, dtype=np.float64)
+        price = np.full(d.shape, above, dtype=np.float64)
+
+        if len(self):
+            inside = d <= self.cumcap[-1]
+            price[inside] = self.mc[np.searchsorted(self.cumcap, d[inside], side="left")]
+
+        price[d <= 0] = below
+        price[np.isnan(d)] = np.nan
+        return price
+
+    def dispatch(self, demand):
+        """
+        Merit-Order-Einsatz für jeden Bedarf.
+
+        Gibt (served, unserved, marginal) zurück:
+        - served:   min(max(d, 0), total)
+        - unserved: max(d - total, 0)
+        - marginal: Index des marginalen Segments (-1, wenn nichts läuft)
+        """
+        d = np.asarray(demand, dtype=np.float64)
+        total = self.total
+
+        served = np.clip(d, 0.0, total)
+        unserved = np.maximum(d - total, 0.0)
+
+        marginal = np.full(d.shape, -1, dtype=np.int64)
+        running = served > 0
+        marginal[running] = np.searchsorted(self.cumcap, served[running], side="left")
+        return served, unserved, marginal
+
+    # -------------------------------------------------------------------------
+    # Binärformat
+    # -------------------------------------------------------------------------
+    def save(self, path):
+        """Speichert die Kurve als .npy (2 x n, float64)."""
+        np.save(path, np.vstack([self.cap, self.mc]))
+
+    @classmethod
+    def load(cls, path, mmap: bool = True):
+        """
+        Lädt eine mit save() geschriebene Kurve.
+        mmap=True: cap/mc sind read-only Views auf die Datei (keine Kopie).
+        """
+        a = np.load(path, mmap_mode="r" if mmap else None)
+        if a.ndim != 2 or a.shape[0] != 2 or a.dtype != np.float64:
+            raise ValueError(f"Keine SupplyCurve-Datei: {path}")
+
+        obj = cls.__new__(cls)
+        obj._set(a[0], a[1])
+        return obj
+
+
+def curves_dir_for(xlsx_path) -> Path:
+    """Ordner mit den Kurven-Dateien (<Zone>.npy) neben einem Ergebnis-Excel."""
+    p = Path(xlsx_path)
+    return p.with_name(f"{p.stem}_curves")
@@ -0,0 +1,10 @@
+"""
+Benchmarks für das Modell in src/Alex mit synthetischen Daten (ohne die SMARD-Dateien).
+
+- synthetic.py: SMARD-förmige Last-/Erzeugungsdateien und Kraftwerkslisten in
+  beliebiger Größe (Zonen, Jahre, Anlagen, Auflösung)
+- run.py: misst Einlesen, Plants-Stacks, Insel, Coupling, KPIs und Export,
+  hängt das Ergebnis an output/bench/results.jsonl an und vergleicht mit früheren Läufen
+
+Start (aus src/):  python -m bench --zones 4 --years 1 --freq h
+"""
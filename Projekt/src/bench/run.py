@@ -0,0 +1,304 @@
+"""
+Benchmark-Lauf mit synthetischen Daten.
+
+Gemessen (je `repeat` Wiederholungen, Bestwert und Median):
+- build_zone_timeseries        alle Zonen, ohne SMARD-Cache
+- build_plants_stack_for_zone  alle Zonen nacheinander
+- build_plants_stacks          alle Zonen in einem Durchgang
+- run_island_model             alle Zonen
+- run_market_coupling          Ring aus NTC-Kanten (bei 2 Zonen eine Kante)
+- kpi_island / kpi_coupled
+- export_all
+
+Jeder Lauf wird als eine JSON-Zeile an results.jsonl angehängt (Commit, Parameter,
+Zeiten, Peak-RSS). compare() vergleicht den letzten Lauf mit dem letzten früheren
+Lauf mit denselben Parametern und meldet Stufen, die langsamer geworden sind.
+
+Aufruf aus src/:
+    python -m bench                                   # 4 Zonen, 1 Jahr, h
+    python -m bench --zones 8 --years 3 --freq 15min --skip coupling
+    python -m bench --compare-only --check            # nur vergleichen, Exit 1 bei Verschlechterung
+"""
+
+import argparse
+import hashlib
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+# Modell liegt in src/Alex -> wie im Visualizer über sys.path einbinden
+ALEX_DIR = Path(__file__).resolve().parent.parent / "Alex"
+if str(ALEX_DIR) not in sys.path:
+    sys.path.append(str(ALEX_DIR))
+
+import config as C
+from io_smard import build_zone_timeseries
+from plants import build_plants_stack_for_zone, build_plants_stacks
+from island import run_island_model
+from coupling import run_market_coupling
+from kpi import kpi_island, kpi_coupled
+from export_excel import export_all
+from profiling import git_commit, peak_rss_mb
+
+from .synthetic import make_case
+
+BENCH_DIR = Path(__file__).resolve().parents[2] / "output" / "bench"
+RESULTS_FILE = BENCH_DIR / "results.jsonl"
+
+STAGES = ("ingest", "plants", "island", "coupling", "kpi", "export")
+
+
+def ring_edges(zones, ntc_mw: float = 2500.0, trade_cost: float = C.DEFAULT_TRADE_COST) -> list:
+    """NTC-Kanten Z1-Z2-...-Zn-Z1 in beide Richtungen (vermascht ab 3 Zonen)."""
+    pairs = list(zip(zones, zones[1:]))
+    if len(zones) > 2:
+        pairs.append((zones[-1], zones[0]))
+    edges = []
+    for a, b in pairs:
+        edges.append((a, b, ntc_mw, trade_cost))
+        edges.append((b, a, ntc_mw, trade_cost))
+    return edges
+
+
+def _timed(fn, repeat: int):
+    """Führt fn repeat-mal aus. Gibt (Ergebnis des letzten Laufs, Zeiten) zurück."""
+    runs, out = [], None
+    for _ in range(max(int(repeat), 1)):
+        t0 = time.perf_counter()
+        out = fn()
+        runs.append(time.perf_counter() - t0)
+    return out, {"best_s": min(runs), "median_s": statistics.median(runs), "runs": runs}
+
+
+def _case_dir(work_dir, params) -> Path:
+    """Ordner der synthetischen Dateien; gleiche Parameter -> Dateien wiederverwenden."""
+    keys = ("zones", "years", "plants", "smard_freq", "smard_format", "seed")
+    tag = hashlib.sha1(repr([params[k] for k in keys]).encode("utf-8")).hexdigest()[:10]
+    return Path(work_dir) / f"case_{tag}"
+
+
+def run_benchmarks(zones=4, years=1, plants=400, freq="h", smard_freq="15min", smard_format="csv",
+                   solver=None, block_size=None, export_formats=("parquet",), repeat=3,
+                   skip=(), seed=0, work_dir=None, label="") -> dict:
+    """
+    Erzeugt die synthetischen Daten (oder nimmt sie aus work_dir) und misst alle Stufen.
+    skip: Stufen aus STAGES, die nicht gemessen werden (Einlesen/Stacks/Insel laufen dann
+    trotzdem einmal, weil spätere Stufen sie brauchen; "coupling" entfällt ganz).
+
+    Gibt den Ergebnis-Eintrag (dict, wie in results.jsonl) zurück.
+    """
+    unknown = [s for s in skip if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unbekannte Stufen: {unknown} (erlaubt: {list(STAGES)})")
+
+    params = {
+        "zones": int(zones), "years": int(years), "plants": int(plants), "freq": freq,
+        "smard_freq": smard_freq, "smard_format": smard_format,
+        "solver": solver or C.COUPLING_SOLVER,
+        "block_size": int(block_size or C.COUPLING_BLOCK_SIZE),
+        "export_formats": list(export_formats), "repeat": int(repeat),
+        "skip": sorted(skip), "seed": int(seed),
+    }
+    work_dir = Path(work_dir) if work_dir is not None else BENCH_DIR / "work"
+    case_dir = _case_dir(work_dir, params)
+
+    t0 = time.perf_counter()
+    case = make_case(case_dir, zones=zones, years=years, n_plants=plants,
+                     smard_freq=smard_freq, smard_format=smard_format, seed=seed)
+    setup_s = time.perf_counter() - t0
+    names = case["zones"]
+    print(f"Synthetische Daten {'wiederverwendet' if case['reused'] else 'erzeugt'}: "
+          f"{case_dir} ({setup_s:.1f} s)")
+
+    timings = {}
+
+    def stage(stage_name, bench_name, fn):
+        n = 1 if stage_name in skip else repeat
+        out, t = _timed(fn, n)
+        if stage_name not in skip:
+            timings[bench_name] = t
+            print(f"  {bench_name:<28s} best {t['best_s']:8.3f} s   median {t['median_s']:8.3f} s")
+        return out
+
+    print(f"Benchmark: {params}")
+
+    # --- Einlesen (ohne Cache: misst das Parsen) ---
+    def ingest():
+        return {
+            z: build_zone_timeseries(cfg["load_xlsx"], cfg["gen_xlsx"], freq, C.EE_NEEDLES)
+            for z, cfg in case["zones_cfg"].items()
+        }
+    built = stage("ingest", "build_zone_timeseries", ingest)
+    zone_ts = {z: ts for z, (ts, _, _) in built.items()}
+    zone_vre_tech = {z: vre for z, (_, vre, _) in built.items()}
+    dt_hours = next(iter(built.values()))[2]["dt_hours"]
+
+    # --- Plants-Stacks ---
+    stack_opts = dict(zone_col="ÜNB", cap_mode=C.CAP_MODE, filter_active_only=C.FILTER_ACTIVE_ONLY)
+    stage("plants", "build_plants_stack_for_zone",
+          lambda: {z: build_plants_stack_for_zone(case["plants"], z, **stack_opts) for z in names})
+    zone_plants = stage("plants", "build_plants_stacks",
+                        lambda: build_plants_stacks(case["plants"], names, **stack_opts))
+
+    # --- Insel ---
+    pricing = dict(
+        voll=C.VOLL,
+        scarcity_pricing_in_price=C.SCARCITY_PRICING_IN_PRICE,
+        price_nan_when_no_conv=C.PRICE_NAN_WHEN_NO_CONV,
+        reserve_price_max=C.RESERVE_PRICE_MAX,
+    )
+    zone_results = stage("island", "run_island_model", lambda: {
+        z: run_island_model(zone_ts[z], plants_info=zone_plants[z], dt_hours=dt_hours, **pricing)
+        for z in names
+    })
+
+    # --- Coupling ---
+    coupled = None
+    if "coupling" not in skip and len(names) > 1:
+        coupled = stage("coupling", "run_market_coupling", lambda: run_market_coupling(
+            zones=names, zone_ts=zone_results, zone_plants=zone_plants,
+            ntc_edges=ring_edges(names), dt_hours=dt_hours,
+            block_size=params["block_size"], solver=params["solver"], workers=1, **pricing,
+        ))
+
+    # --- KPIs ---
+    kpi_island_df = stage("kpi", "kpi_island", lambda: kpi_island(zone_results, zone_plants))
+    kpi_coupled_df = None
+    if coupled is not None:
+        kpi_coupled_df = stage("kpi", "kpi_coupled", lambda: kpi_coupled(coupled, names, dt_hours))
+
+    # --- Export ---
+    if "export" not in skip:
+        out_xlsx = case_dir / "export" / "UENB_Model_bench.xlsx"
+        stage("export", "export_all", lambda: export_all(
+            out_xlsx=out_xlsx,
+            kpi_island_df=kpi_island_df,
+            zone_results=zone_results,
+            zone_vre_tech=zone_vre_tech,
+            zone_plants=zone_plants,
+            coupled=coupled,
+            kpi_coupled_df=kpi_coupled_df,
+            formats=params["export_formats"],
+            meta={"scenario": "BENCH", "time_freq": freq, "dt_hours": dt_hours},
+        ))
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "label": label,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "params": params,
+        "steps": len(zone_ts[names[0]]),
+        "setup_s": setup_s,
+        "setup_reused": case["reused"],
+        "peak_rss_mb": peak_rss_mb(),
+        "timings": timings,
+    }
+
+
+def save_result(entry: dict, results_file=RESULTS_FILE) -> Path:
+    """Hängt einen Lauf als JSON-Zeile an results_file an."""
+    results_file = Path(results_file)
+    results_file.parent.mkdir(parents=True, exist_ok=True)
+    with open(results_file, "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+    return results_file
+
+
+def load_results(results_file=RESULTS_FILE) -> list:
+    results_file = Path(results_file)
+    if not results_file.exists():
+        return []
+    with open(results_file, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def compare(results_file=RESULTS_FILE, tolerance: float = 0.10, baseline=None, min_delta_s: float = 0.01) -> list:
+    """
+    Vergleicht den letzten Lauf mit dem letzten früheren Lauf mit denselben Parametern
+    (baseline: nur Läufe dieses Commits). Verglichen wird der Bestwert je Stufe;
+    Unterschiede unter min_delta_s (Messrauschen bei sehr kurzen Stufen) zählen nicht.
+
+    Gibt die Liste der Stufen zurück, die um mehr als tolerance langsamer sind.
+    """
+    entries = load_results(results_file)
+    if not entries:
+        print("Keine Benchmark-Ergebnisse vorhanden.")
+        return []
+
+    current = entries[-1]
+    previous = [
+        e for e in entries[:-1]
+        if e["params"] == current["params"] and (baseline is None or e.get("git_commit") == baseline)
+    ]
+    if not previous:
+        print("Kein früherer Lauf mit denselben Parametern zum Vergleichen.")
+        return []
+    ref = previous[-1]
+
+    print(f"\nVergleich: {ref.get('git_commit')} ({ref['created']}) -> "
+          f"{current.get('git_commit')} ({current['created']})")
+    regressions = []
+    for name, t in current["timings"].items():
+        if name not in ref["timings"]:
+            continue
+        old, new = ref["timings"][name]["best_s"], t["best_s"]
+        ratio = new / old if old > 0 else float("inf")
+        flag = ""
+        if abs(new - old) < min_delta_s:
+            pass
+        elif ratio > 1.0 + tolerance:
+            flag = "LANGSAMER"
+            regressions.append(name)
+        elif ratio < 1.0 - tolerance:
+            flag = "schneller"
+        print(f"  {name:<28s} {old:8.3f} s -> {new:8.3f} s   x{ratio:5.2f}  {flag}")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(prog="python -m bench", description="Benchmarks mit synthetischen Daten")
+    ap.add_argument("--zones", type=int, default=4)
+    ap.add_argument("--years", type=int, default=1)
+    ap.add_argument("--plants", type=int, default=400, help="Anlagen in der Kraftwerksliste (alle Zonen)")
+    ap.add_argument("--freq", default="h", help="Modell-Auflösung (TIME_FREQ): h oder 15min")
+    ap.add_argument("--smard-freq", default="15min", help="Auflösung der synthetischen SMARD-Dateien")
+    ap.add_argument("--smard-format", default="csv", choices=("csv", "xlsx"))
+    ap.add_argument("--solver", default=None, help="Coupling-Solver (Standard: config.COUPLING_SOLVER)")
+    ap.add_argument("--block-size", type=int, default=None, help="Standard: config.COUPLING_BLOCK_SIZE")
+    ap.add_argument("--export", default="parquet", help="Export-Formate, kommagetrennt (wie EXPORT_FORMATS)")
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--skip", default="", help=f"Stufen nicht messen, kommagetrennt: {','.join(STAGES)}")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--label", default="", help="frei wählbarer Name des Laufs")
+    ap.add_argument("--results", default=str(RESULTS_FILE))
+    ap.add_argument("--work-dir", default=None, help="Ordner für die synthetischen Dateien")
+    ap.add_argument("--tolerance", type=float, default=0.10, help="erlaubte Verlangsamung (0.10 = 10 %%)")
+    ap.add_argument("--baseline", default=None, help="mit dem letzten Lauf dieses Commits vergleichen")
+    ap.add_argument("--compare-only", action="store_true", help="nichts messen, nur vergleichen")
+    ap.add_argument("--check", action="store_true", help="Exit-Code 1, wenn eine Stufe langsamer ist")
+    args = ap.parse_args(argv)
+
+    if not args.compare_only:
+        entry = run_benchmarks(
+            zones=args.zones, years=args.years, plants=args.plants, freq=args.freq,
+            smard_freq=args.smard_freq, smard_format=args.smard_format,
+            solver=args.solver, block_size=args.block_size,
+            export_formats=[f.strip() for f in args.export.split(",") if f.strip()],
+            repeat=args.repeat, skip=[s.strip() for s in args.skip.split(",") if s.strip()],
+            seed=args.seed, work_dir=args.work_dir, label=args.label,
+        )
+        print(f"Ergebnis angehängt an: {save_result(entry, args.results)}")
+
+    regressions = compare(args.results, tolerance=args.tolerance, baseline=args.baseline)
+    if args.check and regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,268 @@
+"""
+Synthetische Eingangsdaten im Format der echten Dateien:
+- SMARD-Exports (Realisierter Stromverbrauch / Realisierte Erzeugung) pro Zone und Jahr,
+  Zeitachse "Datum von"/"Datum bis" in lokaler Zeit inkl. Zeitumstellung, Werte in MWh
+  pro Intervall, fehlende Werte als "-"
+- Kraftwerksliste mit denselben Spaltennamen wie Kraftwerksliste_Regelzonen.xlsx
+
+Die Profile sind grob realistisch (Tages-/Wochen-/Jahresgang der Last, PV mit
+Tageslänge, Wind als geglättetes Rauschen), damit Insel und Coupling ähnlich viel
+zu tun haben wie mit echten Daten. Alles ist über seed reproduzierbar.
+"""
+
+import json
+import pickle
+
+import numpy as np
+import pandas as pd
+from pathlib import Path
+
+SMARD_TZ = "Europe/Berlin"
+
+# Marker eines vollständig geschriebenen Falls (Parameter + Dateien) in out_dir
+CASE_FILE = "case.json"
+PLANTS_FILE = "plants.pkl"
+
+# Spaltennamen wie in den SMARD-Exports
+LOAD_COLS = ["Netzlast [MWh]", "Netzlast inkl. Pumpspeicher [MWh]", "Pumpspeicher [MWh]", "Residuallast [MWh]"]
+EE_COLS = {
+    "Biomasse": "Biomasse [MWh]",
+    "Wasser": "Wasserkraft [MWh]",
+    "Wind Offshore": "Wind Offshore [MWh]",
+    "Wind Onshore": "Wind Onshore [MWh]",
+    "PV": "Photovoltaik [MWh]",
+    "Sonstige EE": "Sonstige Erneuerbare [MWh]",
+}
+CONV_COLS = ["Kernenergie [MWh]", "Braunkohle [MWh]", "Steinkohle [MWh]", "Erdgas [MWh]",
+             "Pumpspeicher [MWh]", "Sonstige Konventionelle [MWh]"]
+
+# Spaltennamen der Kraftwerksliste (siehe plants.py)
+CAP_COLS = [
+    "Bruttoleistung [MW]",
+    "Netto-Nennleistung\n(elektrische Wirkleistung) [MW]",
+    "Mittlere verfügbare\nNetto-Nennleistung [MW]",
+]
+MC_COL = "Grenzkosten [EUR/MWHel]"
+
+# Energieträger: (Anteil an den Anlagen, Leistung MW von/bis, Grenzkosten EUR/MWh von/bis)
+CARRIERS = {
+    "Braunkohle": (0.08, 300, 1000, 25, 60),
+    "Steinkohle": (0.12, 150, 800, 60, 120),
+    "Erdgas": (0.45, 10, 500, 70, 220),
+    "Mineralölprodukte": (0.10, 5, 100, 150, 350),
+    "Pumpspeicher": (0.10, 50, 400, 40, 120),
+    "Sonstige": (0.15, 5, 150, 30, 200),
+}
+
+
+def time_axis(year: int, freq: str = "15min") -> pd.DatetimeIndex:
+    """Intervallanfänge eines Jahres in lokaler Zeit (März: 02:00 fehlt, Oktober: doppelt)."""
+    return pd.date_range(f"{year}-01-01", f"{year + 1}-01-01", freq=freq, tz=SMARD_TZ, inclusive="left")
+
+
+def _smooth_noise(rng, n, width, scale=1.0):
+    """Rauschen, über `width` Schritte geglättet (Wetter statt weißem Rauschen)."""
+    width = max(int(width), 1)
+    kernel = np.exp(-np.arange(width) / (width / 3.0))
+    x = np.convolve(rng.standard_normal(n + width), kernel, mode="full")[width:width + n]
+    return scale * x / (x.std() or 1.0)
+
+
+def zone_profiles(idx: pd.DatetimeIndex, rng, base_mw: float, offshore: bool = False) -> pd.DataFrame:
+    """Last und EE-Erzeugung einer Zone in MW (Spalten: load_mw + EE-Techs)."""
+    n = len(idx)
+    step_h = (idx[1] - idx[0]).total_seconds() / 3600.0
+    hour = np.asarray(idx.hour + idx.minute / 60.0)
+    doy = np.asarray(idx.dayofyear)
+    weekend = np.asarray(idx.dayofweek) >= 5
+
+    winter = np.cos(2 * np.pi * (doy - 15) / 365.0)            # +1 im Januar, -1 im Juli
+    daily = np.clip(np.sin(np.pi * (hour - 5) / 17.0), -0.3, None)
+    load = base_mw * (1.0 + 0.12 * winter + 0.18 * daily - 0.10 * weekend)
+    load *= 1.0 + _smooth_noise(rng, n, 6 / step_h, 0.02)
+
+    # PV: Tageslänge 8 h (Winter) bis 16 h (Sommer), Bewölkung als geglättetes Rauschen
+    day_len = 12.0 - 4.0 * winter
+    sun = np.clip(np.sin(np.pi * (hour - (13.0 - day_len / 2)) / day_len), 0.0, None)
+    clouds = np.clip(0.75 + _smooth_noise(rng, n, 12 / step_h, 0.2), 0.05, 1.0)
+    pv = 0.9 * base_mw * (0.55 - 0.25 * winter) * sun * clouds
+
+    wind_on = 1.0 * base_mw * 1.0 / (1.0 + np.exp(-(_smooth_noise(rng, n, 36 / step_h) + 0.3 * winter - 0.8)))
+    out = {
+        "load_mw": load,
+        "Biomasse": 0.06 * base_mw * (1.0 + _smooth_noise(rng, n, 24 / step_h, 0.03)),
+        "Wasser": 0.02 * base_mw * (1.0 + 0.3 * winter) * (1.0 + _smooth_noise(rng, n, 48 / step_h, 0.05)),
+        "Wind Onshore": wind_on,
+        "PV": pv,
+        "Sonstige EE": np.full(n, 0.005 * base_mw),
+    }
+    if offshore:
+        out["Wind Offshore"] = 0.4 * base_mw / (1.0 + np.exp(-(_smooth_noise(rng, n, 24 / step_h) - 0.2)))
+    return pd.DataFrame(out, index=idx)
+
+
+def smard_frames(profiles: pd.DataFrame):
+    """
+    MW-Profile -> (Last-Export, Erzeugungs-Export) wie von SMARD:
+    "Datum von"/"Datum bis" als Text, Werte in MWh pro Intervall, Kernenergie fehlt ("-").
+    """
+    idx = profiles.index
+    step = idx[1] - idx[0]
+    to_mwh = step.total_seconds() / 3600.0
+    times = {
+        "Datum von": idx.strftime("%d.%m.%Y %H:%M"),
+        "Datum bis": (idx + step).strftime("%d.%m.%Y %H:%M"),
+    }
+
+    load = profiles["load_mw"].to_numpy() * to_mwh
+    pump = np.clip(0.02 * load * np.sin(np.arange(len(idx)) / 7.0), 0.0, None)
+    vre = profiles.drop(columns="load_mw").sum(axis=1).to_numpy() * to_mwh
+    load_df = pd.DataFrame({
+        **times,
+        LOAD_COLS[0]: load,
+        LOAD_COLS[1]: load + pump,
+        LOAD_COLS[2]: pump,
+        LOAD_COLS[3]: load - vre,
+    })
+
+    gen = dict(times)
+    for tech, col in EE_COLS.items():
+        if tech in profiles.columns:
+            gen[col] = profiles[tech].to_numpy() * to_mwh
+    residual = np.clip(load - vre, 0.0, None)
+    for col, share in zip(CONV_COLS, (np.nan, 0.3, 0.2, 0.35, 0.05, 0.1)):
+        gen[col] = np.full(len(idx), np.nan) if np.isnan(share) else share * residual
+    return load_df, pd.DataFrame(gen)
+
+
+def write_smard(df: pd.DataFrame, path, fmt: str = "csv") -> Path:
+    """
+    Schreibt einen Export wie SMARD: "csv" (";" getrennt, Dezimalkomma, "-" = fehlend)
+    oder "xlsx" (langsam zu schreiben, aber dasselbe Format wie die echten Dateien).
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "csv":
+        df.to_csv(path, sep=";", decimal=",", index=False, na_rep="-", float_format="%.2f", encoding="utf-8-sig")
+    elif fmt == "xlsx":
+        df.round(2).astype(object).where(df.notna(), "-").to_excel(path, index=False)
+    else:
+        raise ValueError("fmt muss 'csv' oder 'xlsx' sein.")
+    return path
+
+
+def plant_list(zones, n_plants: int, seed: int = 0, zone_cap_mw=None,
+               reserve_share: float = 0.05, no_mc_share: float = 0.02, non_mo_share: float = 0.03) -> pd.DataFrame:
+    """
+    Kraftwerksliste mit n_plants Anlagen, zufällig auf zones verteilt (jede Zone mind. eine).
+    zone_cap_mw: optional {Zone: Ziel-Leistung}; die Leistungen einer Zone werden darauf skaliert.
+    Ein Teil der Anlagen ist Netzreserve, ohne Grenzkosten oder nicht Teil der Merit-Order.
+    """
+    rng = np.random.default_rng(seed)
+    zones = list(zones)
+    names = list(CARRIERS)
+    shares = np.array([CARRIERS[c][0] for c in names])
+    carrier = rng.choice(names, size=n_plants, p=shares / shares.sum())
+
+    zone = np.array(zones)[rng.integers(0, len(zones), n_plants)]
+    zone[:min(len(zones), n_plants)] = zones[:n_plants]
+
+    lo, hi, mc_lo, mc_hi = (np.array([CARRIERS[c][k] for c in carrier], dtype=float) for k in range(1, 5))
+    brutto = lo + (hi - lo) * rng.random(n_plants)
+    mc = mc_lo + (mc_hi - mc_lo) * rng.random(n_plants)
+
+    if zone_cap_mw is not None:
+        for z, target in zone_cap_mw.items():
+            m = zone == z
+            if m.any():
+                brutto[m] *= target / brutto[m].sum()
+
+    netto = brutto * rng.uniform(0.9, 0.97, n_plants)
+    mean_av = netto * rng.uniform(0.75, 0.95, n_plants)
+    # wie in der echten Liste: nicht jede Anlage hat jede Leistungsangabe
+    mean_av[rng.random(n_plants) < 0.1] = np.nan
+
+    status = np.where(rng.random(n_plants) < reserve_share, "Netzreserve", "In Betrieb")
+    mc[rng.random(n_plants) < no_mc_share] = np.nan
+    mo = np.where(rng.random(n_plants) < non_mo_share, "Nein", "Ja")
+
+    return pd.DataFrame({
+        "Teil der Merit-Order?": mo,
+        "ÜNB": zone,
+        "Status": status,
+        "Anzeige-Name": [f"Anlage {i + 1}" for i in range(n_plants)],
+        "Energieträger": carrier,
+        CAP_COLS[0]: brutto,
+        CAP_COLS[1]: netto,
+        CAP_COLS[2]: mean_av,
+        MC_COL: mc,
+    })
+
+
+def _load_case(out_dir: Path, params: dict):
+    """Fall aus out_dir, wenn er mit denselben Parametern vollständig geschrieben wurde; sonst None."""
+    try:
+        case = json.loads((out_dir / CASE_FILE).read_text(encoding="utf-8"))
+        if case.get("params") != params:
+            return None
+        files = [f for cfg in case["zones_cfg"].values() for f in cfg["load_xlsx"] + cfg["gen_xlsx"]]
+        if not all(Path(f).exists() for f in files):
+            return None
+        with open(out_dir / PLANTS_FILE, "rb") as f:
+            plants = pickle.load(f)
+    except (OSError, ValueError, KeyError, pickle.UnpicklingError):
+        return None
+    return {"zones_cfg": case["zones_cfg"], "plants": plants, "zones": case["zones"]}
+
+
+def make_case(out_dir, zones: int = 4, years: int = 1, start_year: int = 2023, n_plants: int = 400,
+              smard_freq: str = "15min", smard_format: str = "csv", seed: int = 0, reuse: bool = True) -> dict:
+    """
+    Schreibt SMARD-Dateien (ein Paar pro Zone und Jahr) nach out_dir und baut die Kraftwerksliste.
+    reuse=True: liegt in out_dir schon ein vollständiger Fall mit denselben Parametern
+    (case.json, wird als Letztes geschrieben), wird er geladen statt neu erzeugt.
+
+    Gibt ein dict zurück:
+    - zones_cfg: {Zone: {"load_xlsx": [..], "gen_xlsx": [..], "uenb": Zone}} wie config.ZONES_4
+    - plants: Kraftwerksliste (DataFrame, Zonenspalte "ÜNB")
+    - zones: Zonennamen
+    - reused: True, wenn der Fall aus out_dir geladen wurde
+    """
+    out_dir = Path(out_dir)
+    params = {"zones": zones, "years": years, "start_year": start_year, "n_plants": n_plants,
+              "smard_freq": smard_freq, "smard_format": smard_format, "seed": seed}
+    if reuse:
+        case = _load_case(out_dir, params)
+        if case is not None:
+            return {**case, "reused": True}
+
+    # Marker erst am Ende wieder schreiben -> abgebrochene Läufe gelten nicht als vollständig
+    (out_dir / CASE_FILE).unlink(missing_ok=True)
+    rng = np.random.default_rng(seed)
+    names = [f"Z{i + 1}" for i in range(zones)]
+
+    zones_cfg, peak = {}, {}
+    for i, z in enumerate(names):
+        base_mw = float(rng.uniform(4000, 12000))
+        loads, gens = [], []
+        peak[z] = 0.0
+        for year in range(start_year, start_year + years):
+            prof = zone_profiles(time_axis(year, smard_freq), rng, base_mw, offshore=(i % 2 == 0))
+            peak[z] = max(peak[z], float(prof["load_mw"].max()))
+            load_df, gen_df = smard_frames(prof)
+            stamp = f"{year}01010000_{year + 1}01010000"
+            loads.append(write_smard(load_df, out_dir / f"Realisierter_Stromverbrauch_{stamp}_{z}.{smard_format}", smard_format))
+            gens.append(write_smard(gen_df, out_dir / f"Realisierte_Erzeugung_{stamp}_{z}.{smard_format}", smard_format))
+        zones_cfg[z] = {"load_xlsx": loads, "gen_xlsx": gens, "uenb": z}
+
+    # Leistung pro Zone um die Spitzenlast herum -> mal knapp, mal reichlich (Handel lohnt sich)
+    cap = {z: peak[z] * float(rng.uniform(0.7, 1.1)) for z in names}
+    plants = plant_list(names, n_plants, seed=seed, zone_cap_mw=cap)
+
+    with open(out_dir / PLANTS_FILE, "wb") as f:
+        pickle.dump(plants, f, protocol=pickle.HIGHEST_PROTOCOL)
+    zones_cfg = {z: {k: [str(p) for p in v] if isinstance(v, list) else v for k, v in cfg.items()}
+                 for z, cfg in zones_cfg.items()}
+    (out_dir / CASE_FILE).write_text(
+        json.dumps({"params": params, "zones": names, "zones_cfg": zones_cfg}, indent=2), encoding="utf-8")
+    return {"zones_cfg": zones_cfg, "plants": plants, "zones": names, "reused": False}
@@ -3,6 +3,8 @@ Konfiguration für die Merit-Order Visualisierung.
 Definiert alle verfügbaren Szenarien und deren Parameter.
 """
 
+from pathlib import Path
+
 # Szenario-Konfigurationen
 SCENARIOS = {
     # Deutschland als einzelne Zone
@@ -88,6 +90,12 @@ DIFF_SCALE = {
 # ============================================================================
 # VISUALISIERUNGS-EINSTELLUNGEN
 # ============================================================================
+# Animation:
+# - 'profile': typischer Tagesverlauf je Monat (12 x 24 Frames, Mittelwerte)
+# - 'h':       jede einzelne Stunde (8760 Frames pro Jahr)
+# - '15min':   jede Viertelstunde (35040 Frames pro Jahr; braucht 15min-Modelldaten)
+ANIMATION_MODE = 'profile'
+
 VIS_SETTINGS = {
     'figsize': (14, 10),
     'dpi': 150,
@@ -105,4 +113,24 @@ VIDEO_SETTINGS = {
     'fps': 8,           # Frames pro Sekunde
     'dpi': 150,         # Auflösung
     'bitrate': 5000,    # Bitrate für Qualität
-}
\ No newline at end of file
+    'workers': None,    # Render-Prozesse (None = alle CPU-Kerne, 1 = ohne Zusatzprozesse)
+    'chunk': 8,         # Frames pro Render-Auftrag
+}
+# ============================================================================
+# DATEN-EINLESEN
+# ============================================================================
+# Anzahl Prozesse, wenn ein Szenario mehrere Excel-Dateien braucht
+# (Differenz-Szenarien: Insel + Coupled). 1 = nacheinander.
+LOAD_WORKERS = 2
+
+# ============================================================================
+# GEODATEN-CACHE
+# ============================================================================
+# Zonen-Geometrien (pro Szenario) und Hintergrundkarte werden einmal berechnet und
+# als GeoParquet abgelegt (braucht pyarrow). None = ohne Cache.
+GEO_CACHE_DIR = Path(__file__).resolve().parents[2] / "output" / "cache" / "geodata"
+
+# Vereinfachung der Umrisse in Grad (0.02 ~ 2 km, etwa ein bis zwei Pixel auf der Karte);
+# die Zonen werden vorher zu einer sauberen Coverage bereinigt, damit gemeinsame Grenzen
+# deckungsgleich bleiben (braucht shapely >= 2.1 / geopandas >= 1.1). 0 = Originalgeometrie.
+GEO_SIMPLIFY_TOLERANCE = 0.02
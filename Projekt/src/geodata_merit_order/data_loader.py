@@ -1,9 +1,20 @@
 import pandas as pd
 import numpy as np
 import glob
+import json
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+# SupplyCurve liegt im Modell-Ordner (src/Alex) -> wie dort über sys.path einbinden
+ALEX_DIR = Path(__file__).resolve().parent.parent / "Alex"
+if str(ALEX_DIR) not in sys.path:
+    sys.path.append(str(ALEX_DIR))
+
+from supply_curve import SupplyCurve, curves_dir_for
+from export_excel import TimeTable, load_results
+
 def find_scenario_excel(directory, keyword):
     """
     Findet die neueste Excel-Datei, die den Keyword enthält.
@@ -35,28 +46,84 @@ def find_scenario_excel(directory, keyword):
     print(f"  Gefunden: {result.name}")
     return result
 
-def load_merit_orders(excel_path, zone_names):
-    """Lädt die Merit-Order-Stacks aus der Excel-Datei."""
-    merit_orders = {}
+# Mapping für verschiedene Zonennamen in den Sheet-/Dateinamen
+# WICHTIG: Jede Zone hat ihr eigenes, eindeutiges Mapping
+ZONE_SHEET_MAP = {
+    'north': ['nord'],           # NUR 'nord', nicht 'n' (zu unspezifisch)
+    'south': ['sued', 'süd'],    # NUR 'sued'/'süd', nicht 'south' oder 's'
+    'de': ['de', 'deutschland', 'germany'],
+    '50hertz': ['50hertz', '50hz'],
+    'tennet': ['tennet'],
+    'amprion': ['amprion'],
+    'transnetbw': ['transnetbw', 'enbw']
+}
+
+def match_zone_curves(curves_by_name, zone_names, source=''):
+    """
+    Ordnet Kurven {Modell-Zonenname: SupplyCurve oder Pfad} den Visualizer-Zonen zu
+    (über ZONE_SHEET_MAP, Groß-/Kleinschreibung egal). Pfade werden per Memory-Map geladen.
+    Gibt nur die gefundenen Zonen zurück.
+    """
+    by_lower = {str(k).lower(): v for k, v in curves_by_name.items()}
+    curves = {}
+    for zone in zone_names:
+        possible_names = ZONE_SHEET_MAP.get(zone.lower(), [zone.lower()])
+        name = next((pn for pn in possible_names if pn in by_lower), None)
+        if name is None:
+            continue
+        curve = by_lower[name]
+        curves[zone] = curve if isinstance(curve, SupplyCurve) else SupplyCurve.load(curve)
+        print(f"  Zone '{zone}' geladen aus '{name}{source}': {len(curves[zone])} Segmente, max {curves[zone].total:.0f} MW")
+    return curves
+
+def load_supply_curves(excel_path, zone_names, curves_dir=None):
+    """
+    Lädt die binären Merit-Order-Kurven (<Excel>_curves/<Zone>.npy), die der
+    Excel-Export daneben ablegt. Memory-Map, keine Kopie.
+    Gibt nur die gefundenen Zonen zurück.
+    """
+    curves_dir = Path(curves_dir) if curves_dir is not None else curves_dir_for(excel_path)
+    if not curves_dir.is_dir():
+        return {}
+    
+    return match_zone_curves({f.stem: f for f in curves_dir.glob("*.npy")}, zone_names, source='.npy')
+
+def merit_orders_from_plants(zone_plants, zone_names):
+    """
+    Merit-Order-Kurven direkt aus den Stacks des Modells (zone_plants aus Alex/main.py),
+    dieselbe Kurve wie im Export (curve_effective = Sheet plants_cap).
+    """
+    print("Übernehme Merit-Order-Stacks aus dem Modell...")
+    merit_orders = match_zone_curves(
+        {z: info["curve_effective"] for z, info in zone_plants.items() if "curve_effective" in info},
+        zone_names,
+    )
+    for zone in zone_names:
+        if zone not in merit_orders:
+            print(f"  WARNUNG: Kein Merit-Order-Stack für Zone '{zone}' (Modell-Zonen: {list(zone_plants)})")
+    return merit_orders
+
+def load_merit_orders(excel_path, zone_names, xl=None):
+    """
+    Lädt die Merit-Order-Stacks als SupplyCurve pro Zone.
+    Bevorzugt die binären Kurven neben der Excel-Datei, sonst aus den Stack-Sheets.
+    xl: bereits geöffnete pd.ExcelFile (siehe load_workbook), sonst wird die Datei geöffnet.
+    """
     print("Lade Merit-Order-Stacks...")
-    xl = pd.ExcelFile(excel_path)
-    
-    # Mapping für verschiedene Zonennamen in den Sheet-Namen
-    # WICHTIG: Jede Zone hat ihr eigenes, eindeutiges Mapping
-    zone_sheet_map = {
-        'north': ['nord'],           # NUR 'nord', nicht 'n' (zu unspezifisch)
-        'south': ['sued', 'süd'],    # NUR 'sued'/'süd', nicht 'south' oder 's'
-        'de': ['de', 'deutschland', 'germany'],
-        '50hertz': ['50hertz', '50hz'],
-        'tennet': ['tennet'],
-        'amprion': ['amprion'],
-        'transnetbw': ['transnetbw', 'enbw']
-    }
+    merit_orders = load_supply_curves(excel_path, zone_names)
+    if len(merit_orders) == len(zone_names):
+        return merit_orders
+    
+    if xl is None:
+        xl = pd.ExcelFile(excel_path)
+    zone_sheet_map = ZONE_SHEET_MAP
     
     # Bereits verwendete Sheets tracken, um Duplikate zu vermeiden
     used_sheets = set()
     
     for zone in zone_names:
+        if zone in merit_orders:
+            continue
         sheet_name = None
         zone_lower = zone.lower()
         possible_names = zone_sheet_map.get(zone_lower, [zone_lower])
@@ -93,7 +160,7 @@ def load_merit_orders(excel_path, zone_names):
         used_sheets.add(sheet_name)
             
         try:
-            df = pd.read_excel(excel_path, sheet_name=sheet_name)
+            df = xl.parse(sheet_name)
             df.columns = df.columns.astype(str).str.lower()
             
             # Finde Kapazitäts- und Grenzkostenspalten
@@ -107,17 +174,13 @@ def load_merit_orders(excel_path, zone_names):
                 print(f"    Spalten: {list(df.columns)}")
                 continue
             
-            df = df[[cap_col, mc_col]].dropna()
-            df = df.sort_values(by=mc_col)
-            df['acum_mw'] = df[cap_col].cumsum()
-            df['mc'] = df[mc_col]
-            
-            stack = df[['acum_mw', 'mc']].copy()
-            start_row = pd.DataFrame({'acum_mw': [0], 'mc': [stack['mc'].iloc[0] if not stack.empty else 0]})
-            stack = pd.concat([start_row, stack], ignore_index=True)
+            stack = SupplyCurve.from_segments(
+                pd.to_numeric(df[cap_col], errors='coerce'),
+                pd.to_numeric(df[mc_col], errors='coerce'),
+            )
             
             merit_orders[zone] = stack
-            print(f"  Zone '{zone}' geladen aus Sheet '{sheet_name}': {len(stack)} Einträge, max {stack['acum_mw'].max():.0f} MW")
+            print(f"  Zone '{zone}' geladen aus Sheet '{sheet_name}': {len(stack)} Segmente, max {stack.total:.0f} MW")
             
         except Exception as e:
             print(f"  FEHLER beim Laden von '{sheet_name}': {e}")
@@ -132,9 +195,11 @@ def find_col(df, keywords):
                 return col
     return None
 
-def load_timeseries(excel_path, sheet_name, zone_names):
+def load_timeseries(excel_path, sheet_name, zone_names, xl=None, freq='h'):
     """
     Lädt und verarbeitet Zeitreihendaten aus der angegebenen Excel-Datei.
+    xl: bereits geöffnete pd.ExcelFile (siehe load_workbook), sonst wird die Datei geöffnet.
+    freq: Zeitauflösung des Ergebnisses ('h' = stündlich, '15min' = viertelstündlich).
     
     Gibt zurück:
         - res_loads: DataFrame mit Residuallast pro Zone (für Merit-Order-Berechnung)
@@ -143,23 +208,46 @@ def load_timeseries(excel_path, sheet_name, zone_names):
     print("Lade Zeitreihen...")
     
     try:
-        ts_raw = pd.read_excel(excel_path, sheet_name=sheet_name)
+        ts_raw = pd.read_excel(xl if xl is not None else excel_path, sheet_name=sheet_name)
         ts_raw.columns = ts_raw.columns.astype(str).str.lower()
     except Exception as e:
         print(f"  FEHLER: Sheet '{sheet_name}' konnte nicht geladen werden: {e}")
         try:
-            xl = pd.ExcelFile(excel_path)
+            if xl is None:
+                xl = pd.ExcelFile(excel_path)
             print(f"    Verfügbare Sheets: {xl.sheet_names}")
         except:
             pass
         return pd.DataFrame(), pd.DataFrame()
 
+    return timeseries_from_frame(ts_raw, zone_names, freq)
+
+
+def _resample(df, freq):
+    """Mittelwert je freq; sind die Daten gröber als freq, bleibt ihre Auflösung."""
+    step = pd.Series(df.index.unique().sort_values()).diff().median()
+    if pd.notna(step) and step > pd.Timedelta(pd.tseries.frequencies.to_offset(freq)):
+        print(f"  Hinweis: Daten sind gröber ({step}) als '{freq}' -> Originalauflösung")
+        return df.groupby(level=0).mean()
+    return df.resample(freq).mean()
+
+def timeseries_from_frame(ts_raw, zone_names, freq='h'):
+    """
+    Verarbeitet eine Zeitreihen-Tabelle (Spaltennamen klein geschrieben) wie aus dem
+    Excel-Sheet: langes INSEL-Format (zone-Spalte) oder breites COUPLED-Format.
+    
+    Gibt (res_loads, direct_prices) stündlich (bzw. in freq, z.B. '15min') zurück,
+    siehe load_timeseries.
+    """
     # Finde Zeitspalte
     time_col = find_col(ts_raw, ['time', 'date', 'zeit', 'timestamp'])
     if not time_col:
         time_col = ts_raw.columns[0]
     
     ts_raw[time_col] = pd.to_datetime(ts_raw[time_col], errors='coerce')
+    # tz-aware Zeit (Parquet/Feather, direkt aus dem Modell) -> lokale Uhrzeit wie im Excel
+    if getattr(ts_raw[time_col].dt, 'tz', None) is not None:
+        ts_raw[time_col] = ts_raw[time_col].dt.tz_localize(None)
     ts_raw = ts_raw.dropna(subset=[time_col])
     ts_raw = ts_raw.set_index(time_col)
     
@@ -263,14 +351,15 @@ def load_timeseries(excel_path, sheet_name, zone_names):
     if not direct_prices.empty and not isinstance(direct_prices.index, pd.DatetimeIndex):
         direct_prices.index = ts_raw.index[:len(direct_prices)]
     
-    # Resample zu stündlichen Werten
+    # Resample zu stündlichen Werten (bzw. freq)
     if not res_loads.empty:
-        res_loads = res_loads.resample('h').mean()
+        res_loads = _resample(res_loads, freq)
     if not direct_prices.empty:
-        direct_prices = direct_prices.resample('h').mean()
+        direct_prices = _resample(direct_prices, freq)
     
     total_hours = max(len(res_loads), len(direct_prices)) if not res_loads.empty or not direct_prices.empty else 0
-    print(f"Zeitreihen geladen: {total_hours} Stunden")
+    unit = "Stunden" if freq == 'h' else f"Zeitschritte ({freq})"
+    print(f"Zeitreihen geladen: {total_hours} {unit}")
     
     if not direct_prices.empty:
         print(f"  Direkte Preise verfügbar für: {list(direct_prices.columns)}")
@@ -284,4 +373,132 @@ def load_timeseries_simple(excel_path, sheet_name, zone_names):
     Gibt nur res_loads zurück.
     """
     res_loads, _ = load_timeseries(excel_path, sheet_name, zone_names)
-    return res_loads
\ No newline at end of file
+    return res_loads
+
+
+def load_workbook(excel_path, sheet_name, zone_names, freq='h'):
+    """
+    Öffnet die Excel-Datei EINMAL und liest daraus Merit-Orders (falls keine binären
+    Kurven daneben liegen) und das Zeitreihen-Sheet.
+    
+    Gibt (merit_orders, res_loads, direct_prices) zurück.
+    """
+    with pd.ExcelFile(excel_path) as xl:
+        merit_orders = load_merit_orders(excel_path, zone_names, xl=xl)
+        res_loads, direct_prices = load_timeseries(excel_path, sheet_name, zone_names, xl=xl, freq=freq)
+    return merit_orders, res_loads, direct_prices
+
+
+# =============================================================================
+# Datenquellen für main.run_single_scenario
+# =============================================================================
+# Jede Quelle hat load(cfg, zone_names, freq='h') -> (merit_orders, res_loads, direct_prices)
+# oder None, wenn für das Szenario nichts gefunden wurde. freq: Zeitauflösung der Zeitreihen.
+
+class ExcelSource:
+    """
+    Standard: neueste Excel-Datei mit dem file_keyword des Szenarios im data_dir.
+    Jede Datei wird einmal geöffnet (load_workbook) und das Ergebnis gemerkt;
+    prefetch() liest mehrere Dateien (z.B. Insel + Coupled für *_diff) parallel.
+    """
+    
+    def __init__(self, data_dir, workers=1):
+        self.data_dir = Path(data_dir)
+        self.workers = workers
+        self._loaded = {}
+    
+    def _path(self, cfg):
+        return find_scenario_excel(self.data_dir, cfg['file_keyword'])
+    
+    def prefetch(self, cfgs, zone_names, freq='h'):
+        """Liest die Dateien mehrerer Szenarien vorab, bei workers > 1 in eigenen Prozessen."""
+        jobs = {}
+        for cfg in cfgs:
+            excel_path = self._path(cfg)
+            key = (excel_path, cfg['sheet'], freq)
+            if excel_path and key not in self._loaded:
+                jobs[key] = cfg
+        if self.workers <= 1 or len(jobs) <= 1:
+            return
+        
+        print(f"Lese {len(jobs)} Excel-Dateien parallel...")
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as ex:
+            futures = {key: ex.submit(load_workbook, key[0], key[1], zone_names, freq) for key in jobs}
+            for key, fut in futures.items():
+                self._loaded[key] = fut.result()
+    
+    def load(self, cfg, zone_names, freq='h'):
+        excel_path = self._path(cfg)
+        if not excel_path:
+            return None
+        
+        print(f"Lade Daten aus: {excel_path.name}")
+        key = (excel_path, cfg['sheet'], freq)
+        if key not in self._loaded:
+            self._loaded[key] = load_workbook(excel_path, cfg['sheet'], zone_names, freq)
+        return self._loaded[key]
+
+
+class ResultsSource:
+    """
+    Ergebnisse direkt aus dem Modelllauf (Alex/main.py), ohne Excel:
+    - zone_results: {Zone: Insel-Zeitreihen} (Sheet timeseries_insel)
+    - coupled: Coupled-Zeitreihen oder None (Sheet timeseries_coupled)
+    - zone_plants: {Zone: Stack-Infos} mit curve_effective
+    Ein Lauf liefert beide Sheets, daher gehen auch die *_diff-Szenarien.
+    """
+    
+    def __init__(self, zone_results, zone_plants, coupled=None):
+        self.tables = {'timeseries_insel': TimeTable(zone_results, tz_naive=False)}
+        if coupled is not None:
+            self.tables['timeseries_coupled'] = TimeTable({None: coupled}, tz_naive=False, with_zone=False)
+        self.zone_plants = zone_plants
+    
+    def load(self, cfg, zone_names, freq='h'):
+        table = self.tables.get(cfg['sheet'])
+        if table is None:
+            print(f"  FEHLER: '{cfg['sheet']}' ist in diesem Modelllauf nicht enthalten "
+                  f"(vorhanden: {list(self.tables)})")
+            return None
+        
+        print(f"Übernehme Daten aus dem Modelllauf ({cfg['sheet']})...")
+        merit_orders = merit_orders_from_plants(self.zone_plants, zone_names)
+        ts_raw = table.to_frame()
+        ts_raw.columns = ts_raw.columns.astype(str).str.lower()
+        res_loads, direct_prices = timeseries_from_frame(ts_raw, zone_names, freq)
+        return merit_orders, res_loads, direct_prices
+
+
+class BundleSource:
+    """
+    Parquet/Feather-Export des Modells (Ordner <Name>_parquet/ bzw. _feather/ oder
+    dessen manifest.json). Kurven aus <Name>_curves/ daneben.
+    """
+    
+    def __init__(self, bundle_path):
+        p = Path(bundle_path)
+        self.manifest_path = p if p.suffix == '.json' else p / 'manifest.json'
+        self.manifest = json.loads(self.manifest_path.read_text(encoding='utf-8'))
+    
+    def curves_dir(self):
+        # neben dem Bundle (falls der Ordner verschoben wurde), sonst wie im Manifest
+        local = curves_dir_for(self.manifest_path.parent.parent / f"{self.manifest['source']}.xlsx")
+        return local if local.is_dir() else Path(self.manifest.get('curves_dir', local))
+    
+    def load(self, cfg, zone_names, freq='h'):
+        sheet = cfg['sheet']
+        if sheet not in self.manifest['tables']:
+            print(f"  FEHLER: Tabelle '{sheet}' fehlt im Export {self.manifest_path.parent.name} "
+                  f"(vorhanden: {list(self.manifest['tables'])})")
+            return None
+        
+        print(f"Lade Daten aus: {self.manifest_path.parent.name} ({self.manifest['format']})")
+        merit_orders = load_supply_curves(None, zone_names, curves_dir=self.curves_dir())
+        for zone in zone_names:
+            if zone not in merit_orders:
+                print(f"  WARNUNG: Keine Merit-Order-Kurve für Zone '{zone}' in {self.curves_dir()}")
+        ts_raw = load_results(self.manifest_path, [sheet])[sheet]
+        ts_raw.columns = ts_raw.columns.astype(str).str.lower()
+        res_loads, direct_prices = timeseries_from_frame(ts_raw, zone_names, freq)
+        return merit_orders, res_loads, direct_prices
+
@@ -1,15 +1,141 @@
+import hashlib
+import numpy as np
 import geopandas as gpd
+import shapely
 from shapely.geometry import Polygon, box
 from pathlib import Path
 
+from . import config
+
+# Pfad zur lokalen Bundesländer-GeoJSON-Datei
+GEOJSON_PATH = Path(__file__).resolve().parent / "resources" / "3_mittel.geo.json"
+
+# Kartenausschnitt für den Hintergrund (lon/lat)
+BACKGROUND_BOX = (3, 46, 17, 56)
+
+# erhöhen, wenn sich die Erzeugung der Geometrien ändert -> alte Cache-Dateien werden ignoriert
+GEO_CACHE_VERSION = 2
+
+# =============================================================================
+# Cache (GeoParquet, braucht pyarrow; ohne pyarrow wird ohne Cache gerechnet)
+# =============================================================================
+def _cache_path(name, tolerance, source=None):
+    """Cache-Datei für name; Schlüssel aus Toleranz, Version und Größe/mtime der Quelle."""
+    if config.GEO_CACHE_DIR is None:
+        return None
+    key = f"{GEO_CACHE_VERSION}|{tolerance}"
+    if source is not None:
+        st = Path(source).stat()
+        key += f"|{Path(source).resolve()}|{st.st_size}|{st.st_mtime_ns}"
+    tag = hashlib.sha1(key.encode("utf-8")).hexdigest()[:10]
+    return Path(config.GEO_CACHE_DIR) / f"{name}_{tag}.parquet"
+
+def _read_cache(path):
+    if path is None or not path.exists():
+        return None
+    try:
+        return gpd.read_parquet(path)
+    except Exception as e:
+        print(f"  [Geo-Cache] {path.name} nicht lesbar ({e}) -> neu berechnen")
+        return None
+
+def _write_cache(path, gdf):
+    if path is None:
+        return
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        print("  [Geo-Cache] pyarrow nicht installiert -> Cache deaktiviert.")
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    gdf.to_parquet(path)
+
+def clean_coverage(geoms):
+    """
+    Macht aus den Zonen eine saubere Coverage (keine Überlappungen, gemeinsame Grenzen
+    mit identischen Stützpunkten): alle Ränder werden verschnitten und zu Flächen
+    polygonisiert, jede Fläche geht an die erste Zone, die sie enthält. Die
+    Bundesländer-GeoJSON überlappt an einigen Grenzen leicht - ohne das läuft
+    simplify_coverage dort auseinander.
+    """
+    geoms = shapely.make_valid(np.asarray(geoms, dtype=object))
+    lines = shapely.get_parts(shapely.union_all(shapely.boundary(geoms)))
+    faces = shapely.get_parts(shapely.polygonize(lines))
+    points = shapely.point_on_surface(faces)
+    free = np.ones(len(faces), dtype=bool)
+    out = []
+    for geom in geoms:
+        mine = free & shapely.contains(geom, points)
+        free &= ~mine
+        out.append(shapely.union_all(faces[mine]))
+    return out
+
+def simplify_zones(gdf, tolerance):
+    """
+    Vereinfacht alle Geometrien gemeinsam (Toleranz in Grad). Vorher werden die Zonen
+    mit clean_coverage bereinigt, dann bleiben gemeinsame Grenzen benachbarter Zonen
+    deckungsgleich (simplify_coverage). Ältere geopandas/shapely-Versionen: pro
+    Geometrie mit preserve_topology=True - dort können sich Grenzen leicht
+    überlappen oder Lücken bekommen.
+    """
+    if not tolerance:
+        return gdf
+    out = gdf.copy()
+    try:
+        cleaned = gpd.GeoSeries(clean_coverage(gdf.geometry.values), index=gdf.index, crs=gdf.crs)
+        out['geometry'] = cleaned.simplify_coverage(tolerance)
+    except Exception:
+        out['geometry'] = gdf.geometry.simplify(tolerance, preserve_topology=True)
+    return out
+
 def create_germany_zones(scenario_id, zone_names):
-    """Erstellt die Geometrien für die Zonen basierend auf den Bundesländern."""
+    """
+    Erstellt die Geometrien für die Zonen basierend auf den Bundesländern.
+    Das Ergebnis wird pro Szenario (und config.GEO_SIMPLIFY_TOLERANCE) gecacht;
+    ein zweiter Aufruf liest nur noch die Cache-Datei.
+    """
+    tolerance = config.GEO_SIMPLIFY_TOLERANCE
+    cache_path = _cache_path(f"zones_{scenario_id}", tolerance, GEOJSON_PATH) if GEOJSON_PATH.exists() else None
+    zones_gdf = _read_cache(cache_path)
+    if zones_gdf is not None:
+        print(f"Lade Zonen-Geometrien aus Cache ({cache_path.name})...")
+        return zones_gdf
+    
+    zones_gdf = _build_germany_zones(scenario_id)
+    if zones_gdf is None:
+        return create_fallback_rectangles(zone_names)
+    
+    zones_gdf = simplify_zones(zones_gdf, tolerance)
+    _write_cache(cache_path, zones_gdf)
+    return zones_gdf
+
+def load_background_map():
+    """
+    Hintergrundkarte (Natural Earth, auf BACKGROUND_BOX zugeschnitten), gecacht wie
+    die Zonen. None, wenn die Daten nicht verfügbar sind (geopandas >= 1.0 liefert
+    naturalearth_lowres nicht mehr mit).
+    """
+    tolerance = config.GEO_SIMPLIFY_TOLERANCE
+    cache_path = _cache_path("background", tolerance)
+    bg_map = _read_cache(cache_path)
+    if bg_map is not None:
+        return bg_map
+    
+    try:
+        world_map = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
+        bg_map = world_map.clip(box(*BACKGROUND_BOX))[['geometry']]
+    except Exception:
+        return None
+    
+    bg_map = simplify_zones(bg_map, tolerance)
+    _write_cache(cache_path, bg_map)
+    return bg_map
+
+def _build_germany_zones(scenario_id):
+    """Zonen-Geometrien aus der GeoJSON-Datei (dissolve, NS-Teilung); None bei Fehlern."""
     print("Generiere Deutschland-Karte aus Bundesländern...")
     try:
-        # Pfad zur lokalen Bundesländer-GeoJSON-Datei
-        script_dir = Path(__file__).resolve().parent
-        # Korrigierter Dateiname, passend zu Ihrer Projektstruktur
-        local_geojson_path = script_dir / "resources" / "3_mittel.geo.json"
+        local_geojson_path = GEOJSON_PATH
         
         if not local_geojson_path.exists():
             raise FileNotFoundError("Lokale Bundesländer-GeoJSON-Datei nicht gefunden.")
@@ -38,7 +164,7 @@ def create_germany_zones(scenario_id, zone_names):
 
     except Exception as e:
         print(f"WARNUNG: Geodaten konnten nicht geladen werden ({e}). Nutze Fallback-Rechtecke.")
-        return create_fallback_rectangles(zone_names)
+        return None
 
     # --- Szenario-spezifische Anpassung ---
     if scenario_id.startswith('ns_'):
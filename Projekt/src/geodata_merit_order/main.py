@@ -2,30 +2,40 @@ from pathlib import Path
 
 from . import gui, config, data_loader, geodata, visualization
 
-def run_single_scenario(scenario_id, cfg, script_dir, output_dir):
-    """Führt ein einzelnes Szenario aus."""
+def run_single_scenario(scenario_id, cfg, script_dir, output_dir, source=None, mode=None):
+    """
+    Führt ein einzelnes Szenario aus.
+    source: woher die Daten kommen (siehe data_loader: ExcelSource, ResultsSource,
+    BundleSource); Standard = neueste Excel-Datei im resources-Ordner.
+    mode: 'profile' | 'h' | '15min' (siehe config.ANIMATION_MODE), None = aus config.
+    """
     print(f"\nSzenario '{scenario_id}' wird geladen...")
     
+    mode = mode or config.ANIMATION_MODE
+    freq = 'h' if mode == 'profile' else mode
+    
     zone_names = cfg['zones']
     gdf = geodata.create_germany_zones(scenario_id, zone_names)
     
     # GEÄNDERT: Daten liegen jetzt im resources-Ordner
-    data_dir = script_dir / "resources"
+    if source is None:
+        source = data_loader.ExcelSource(script_dir / "resources", workers=config.LOAD_WORKERS)
     
     # --- Differenz-Szenario ---
     if scenario_id.endswith('_diff'):
         print("Lade Daten für Differenz-Analyse...")
         base_scenario = scenario_id.replace('_diff', '')
+        cfg_insel = config.SCENARIOS[f"{base_scenario}_insel"]
+        cfg_coupled = config.SCENARIOS[f"{base_scenario}_coupled"]
+        if hasattr(source, 'prefetch'):
+            source.prefetch([cfg_insel, cfg_coupled], zone_names, freq)
         
         # INSEL-Daten
-        cfg_insel = config.SCENARIOS[f"{base_scenario}_insel"]
-        excel_insel = data_loader.find_scenario_excel(data_dir, cfg_insel['file_keyword'])
-        if not excel_insel:
-            print(f"FEHLER: Excel für {base_scenario}_insel nicht gefunden!")
+        loaded = source.load(cfg_insel, zone_names, freq)
+        if loaded is None:
+            print(f"FEHLER: Daten für {base_scenario}_insel nicht gefunden!")
             return
-        
-        merit_orders = data_loader.load_merit_orders(excel_insel, zone_names)
-        res_loads_insel, _ = data_loader.load_timeseries(excel_insel, cfg_insel['sheet'], zone_names)
+        merit_orders, res_loads_insel, _ = loaded
         
         if res_loads_insel.empty:
             print("FEHLER: Keine INSEL-Zeitreihen geladen!")
@@ -36,15 +46,11 @@ def run_single_scenario(scenario_id, cfg, script_dir, output_dir):
         )
         
         # COUPLED-Daten
-        cfg_coupled = config.SCENARIOS[f"{base_scenario}_coupled"]
-        excel_coupled = data_loader.find_scenario_excel(data_dir, cfg_coupled['file_keyword'])
-        if not excel_coupled:
-            print(f"FEHLER: Excel für {base_scenario}_coupled nicht gefunden!")
+        loaded = source.load(cfg_coupled, zone_names, freq)
+        if loaded is None:
+            print(f"FEHLER: Daten für {base_scenario}_coupled nicht gefunden!")
             return
-        
-        res_loads_coupled, direct_prices_coupled = data_loader.load_timeseries(
-            excel_coupled, cfg_coupled['sheet'], zone_names
-        )
+        _, res_loads_coupled, direct_prices_coupled = loaded
         
         # Für COUPLED: Verwende direkte Preise wenn vorhanden
         if not direct_prices_coupled.empty:
@@ -62,14 +68,11 @@ def run_single_scenario(scenario_id, cfg, script_dir, output_dir):
     
     # --- Einzelnes Szenario (INSEL oder COUPLED) ---
     else:
-        excel_path = data_loader.find_scenario_excel(data_dir, cfg['file_keyword'])
-        if not excel_path:
-            print(f"FEHLER: Keine Datei für Szenario '{scenario_id}' gefunden!")
+        loaded = source.load(cfg, zone_names, freq)
+        if loaded is None:
+            print(f"FEHLER: Keine Daten für Szenario '{scenario_id}' gefunden!")
             return
-        
-        print(f"Lade Daten aus: {excel_path.name}")
-        merit_orders = data_loader.load_merit_orders(excel_path, zone_names)
-        res_loads, direct_prices = data_loader.load_timeseries(excel_path, cfg['sheet'], zone_names)
+        merit_orders, res_loads, direct_prices = loaded
         
         if res_loads.empty and direct_prices.empty:
             print("FEHLER: Es konnten keine Zeitreihen-Daten geladen werden.")
@@ -93,18 +96,46 @@ def run_single_scenario(scenario_id, cfg, script_dir, output_dir):
         print("FEHLER: Keine gültigen Preisdaten berechnet!")
         return
     
-    gdf_list, monthly_profiles = visualization.create_animation_frames(gdf, hourly_prices)
+    if mode == 'profile':
+        frames, monthly_profiles = visualization.create_animation_frames(gdf, hourly_prices)
+    else:
+        frames, monthly_profiles = visualization.create_timeseries_frames(gdf, hourly_prices), None
     
-    if not gdf_list:
+    if not frames:
         print("FEHLER: Keine Animations-Frames erstellt!")
         return
     
-    visualization.run_visualization(gdf_list, monthly_profiles, zone_names, scenario_id, script_dir)
+    visualization.run_visualization(frames, monthly_profiles, zone_names, scenario_id, script_dir)
 
-def main():
-    script_dir = Path(__file__).parent
+def _default_dirs(script_dir=None):
+    script_dir = Path(script_dir) if script_dir is not None else Path(__file__).parent
     output_dir = script_dir.parent.parent / "output" / "figures"
     output_dir.mkdir(parents=True, exist_ok=True)
+    return script_dir, output_dir
+
+def run_from_results(scenario_id, zone_results, zone_plants, coupled=None, script_dir=None, mode=None):
+    """
+    Karte direkt nach einem Modelllauf öffnen, ohne Excel-Umweg.
+    zone_results, zone_plants, coupled: die Objekte aus Alex/main.py.
+    scenario_id: Schlüssel aus config.SCENARIOS (z.B. 'z4_coupled', 'ns_diff').
+    """
+    script_dir, output_dir = _default_dirs(script_dir)
+    source = data_loader.ResultsSource(zone_results, zone_plants, coupled=coupled)
+    run_single_scenario(scenario_id, config.SCENARIOS[scenario_id], script_dir, output_dir,
+                        source=source, mode=mode)
+
+def run_from_bundle(scenario_id, bundle_path, script_dir=None, mode=None):
+    """
+    Karte aus einem Parquet/Feather-Export (EXPORT_FORMATS "parquet"/"feather")
+    statt aus der Excel-Datei.
+    """
+    script_dir, output_dir = _default_dirs(script_dir)
+    source = data_loader.BundleSource(bundle_path)
+    run_single_scenario(scenario_id, config.SCENARIOS[scenario_id], script_dir, output_dir,
+                        source=source, mode=mode)
+
+def main():
+    script_dir, output_dir = _default_dirs()
 
     scenario_ids = list(config.SCENARIOS.keys())
     
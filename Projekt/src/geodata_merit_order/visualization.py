@@ -2,15 +2,20 @@ import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patheffects
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+from matplotlib.transforms import Bbox
 from matplotlib.widgets import Slider
-from shapely.geometry import box
-import geopandas as gpd
 from pathlib import Path
 from tqdm import tqdm
 import imageio
-import tempfile
 import os
-from . import gui, config
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from . import gui, config, geodata
 
 def calculate_hourly_prices(res_loads, merit_orders, zone_names, direct_prices=None):
     """Berechnet die stuendlichen Preise."""
@@ -32,29 +37,65 @@ def calculate_hourly_prices(res_loads, merit_orders, zone_names, direct_prices=N
             continue
             
         stack = merit_orders.get(zone)
-        if stack is None or stack.empty:
+        if stack is None or len(stack) == 0:
             hourly_prices[zone] = np.nan
             continue
         
-        x_cap = stack['acum_mw'].values
-        y_price = stack['mc'].values
-        
+        # SupplyCurve: Last ueber Kapazitaet -> teuerstes Segment, Last <= 0 -> 0
         loads = res_loads[zone].fillna(0).values
-        loads_clipped = np.clip(loads, 0, x_cap[-1])
-        
-        indices = np.searchsorted(x_cap, loads_clipped)
-        indices = np.clip(indices, 0, len(y_price) - 1)
-        
-        prices = y_price[indices].copy()
-        prices[loads <= 0] = 0
+        prices = stack.price_at(loads, below=0.0, above=stack.mc[-1])
         
         hourly_prices[zone] = prices
         print(f"  Zone '{zone}': Merit-Order-Lookup, Bereich {prices.min():.1f} - {prices.max():.1f} EUR/MWh")
     
     return hourly_prices
 
+GERMAN_MONTHS = {
+    1: "Januar", 2: "Februar", 3: "Maerz", 4: "April", 
+    5: "Mai", 6: "Juni", 7: "Juli", 8: "August",
+    9: "September", 10: "Oktober", 11: "November", 12: "Dezember"
+}
+
+class AnimationFrames:
+    """
+    Alle Frames der Animation ohne Kopien der Geometrie:
+    - gdf:    Zonen-Geometrien (einmal, Spalten zone + geometry)
+    - prices: (n_frames, n_zones) Preise, Spalten in der Zeilenreihenfolge von gdf (NaN = keine Daten)
+    - labels: Zeitangabe pro Frame (zweite Titelzeile), z.B. "Mai 2024 - 07:00 Uhr"
+    - months, hours: Monat/Stunde pro Frame
+    Speicher haengt nur von n_frames x n_zones ab, nicht von der Geometrie.
+    """
+    
+    __slots__ = ("gdf", "prices", "labels", "months", "hours")
+    
+    # Pfeil hoch/runter springt um so viele Frames (24 = ein Monat im Tagesprofil)
+    day_step = 24
+    
+    def __init__(self, gdf, prices, labels, months, hours):
+        self.gdf = gdf
+        self.prices = np.asarray(prices, dtype=float)
+        self.labels = np.asarray(labels, dtype=object)
+        self.months = np.asarray(months, dtype=np.int64)
+        self.hours = np.asarray(hours, dtype=np.int64)
+    
+    def __len__(self):
+        return len(self.prices)
+    
+    def label(self, i):
+        """Zeitangabe von Frame i (zweite Titelzeile)."""
+        return self.labels[i]
+    
+    def frame(self, i):
+        """Ein Frame als GeoDataFrame (Spalten wie frueher: price, label_title, month, hour)."""
+        out = self.gdf.copy()
+        out['price'] = self.prices[i]
+        out['label_title'] = self.label(i)
+        out['month'] = self.months[i]
+        out['hour'] = self.hours[i]
+        return out
+
 def create_animation_frames(gdf, hourly_prices):
-    """Erstellt die Daten fuer jeden Frame der Animation."""
+    """Erstellt die Daten fuer jeden Frame der Animation (AnimationFrames)."""
     print("Berechne typische Tagesverlaeufe (Durchschnitt pro Stunde je Monat)...")
     
     gdf_zones = list(gdf['zone'].unique())
@@ -68,55 +109,377 @@ def create_animation_frames(gdf, hourly_prices):
     
     if not zone_cols:
         print(f"  FEHLER: Keine uebereinstimmenden Zonen gefunden!")
-        return [], pd.DataFrame()
+        return AnimationFrames(gdf, np.empty((0, len(gdf))), [], [], []), pd.DataFrame()
     
     print(f"  Zonen fuer Animation: {zone_cols}")
     
     monthly_profiles = hourly_prices.groupby(['year', 'month', 'hour'])[zone_cols].mean()
     
     print("Erstelle Animations-Frames...")
-    gdf_list = []
-    german_months = {
-        1: "Januar", 2: "Februar", 3: "Maerz", 4: "April", 
-        5: "Mai", 6: "Juni", 7: "Juli", 8: "August",
-        9: "September", 10: "Oktober", 11: "November", 12: "Dezember"
-    }
+    # eine Spalte pro gdf-Zeile (Zonen ohne Daten -> NaN)
+    prices = monthly_profiles.reindex(columns=list(gdf['zone'])).to_numpy(dtype=float)
+    years = monthly_profiles.index.get_level_values('year')
+    months = monthly_profiles.index.get_level_values('month')
+    hours = monthly_profiles.index.get_level_values('hour')
+    labels = [
+        f"{GERMAN_MONTHS.get(m, str(m))} {y} - {h:02d}:00 Uhr"
+        for y, m, h in zip(years, months, hours)
+    ]
+    
+    frames = AnimationFrames(gdf[['zone', 'geometry']], prices, labels, months, hours)
+    if len(frames):
+        print(f"  {len(frames)} Frames erstellt")
+    
+    return frames, monthly_profiles
 
-    for (year, month, hour), row in monthly_profiles.iterrows():
-        temp_gdf = gdf.copy()
-        
-        prices = []
-        for zone in temp_gdf['zone']:
-            if zone in row.index:
-                prices.append(row[zone])
-            else:
-                prices.append(np.nan)
-        
-        temp_gdf['price'] = prices
-        
-        m_name = german_months.get(month, str(month))
-        temp_gdf['label_title'] = f"{m_name} {year} - {hour:02d}:00 Uhr"
-        temp_gdf['month'] = month
-        temp_gdf['hour'] = hour
+class TimeSeriesFrames(AnimationFrames):
+    """
+    Ein Frame pro Zeitschritt (stuendlich oder viertelstuendlich), ohne Mittelung.
+    prices ist direkt das Preis-Array (n_zeitschritte, n_zones); die Titel werden
+    erst erzeugt, wenn Slider oder Video-Export einen Frame anfordern.
+    """
+    
+    __slots__ = ("index", "day_step")
+    
+    def __init__(self, gdf, prices, index):
+        super().__init__(gdf, prices, None, index.month, index.hour)
+        self.index = index
+        # Pfeil hoch/runter = ein Tag
+        step = index[1] - index[0] if len(index) > 1 else pd.Timedelta(hours=1)
+        self.day_step = max(int(pd.Timedelta(days=1) / step), 1)
+    
+    def label(self, i):
+        t = self.index[i]
+        return f"{t.day}. {GERMAN_MONTHS.get(t.month, str(t.month))} {t.year} - {t:%H:%M} Uhr"
+
+def create_timeseries_frames(gdf, hourly_prices):
+    """
+    Frames fuer jeden einzelnen Zeitschritt von hourly_prices (TimeSeriesFrames).
+    Nichts wird vorab pro Frame erzeugt - nur das (n_zeitschritte, n_zones) Preis-Array.
+    """
+    zone_cols = [c for c in hourly_prices.columns if c in set(gdf['zone'])]
+    if not zone_cols:
+        print(f"  FEHLER: Keine uebereinstimmenden Zonen gefunden!")
+        return TimeSeriesFrames(gdf, np.empty((0, len(gdf))), pd.DatetimeIndex([]))
+    
+    print(f"  Zonen fuer Animation: {zone_cols}")
+    prices = hourly_prices.reindex(columns=list(gdf['zone'])).to_numpy(dtype=float)
+    frames = TimeSeriesFrames(gdf[['zone', 'geometry']], prices, hourly_prices.index)
+    print(f"  {len(frames)} Frames (ein Frame pro Zeitschritt)")
+    return frames
+
+SCENARIO_TITLES = {
+    'de_single': 'Deutschland (eine Zone)',
+    'z4_insel': '4 Zonen - Inselbetrachtung',
+    'z4_coupled': '4 Zonen - Gekoppelt',
+    'z4_diff': '4 Zonen - Preisdifferenz',
+    'ns_insel': 'Nord-Sued - Inselbetrachtung',
+    'ns_coupled': 'Nord-Sued - Gekoppelt',
+    'ns_diff': 'Nord-Sued - Preisdifferenz',
+}
+
+# Verschiebung der Beschriftung gegenueber representative_point() (Grad)
+LABEL_OFFSETS = {
+    "TenneT": (0, -0.5),
+    "50Hertz": (0.2, -0.3),
+    "de": (0, 0),
+    "north": (0, 0.5),
+    "south": (0, -0.3),
+}
+
+DISPLAY_NAMES = {
+    'de': 'DEUTSCHLAND',
+    'north': 'NORD',
+    'south': 'SUED',
+}
+
+def _price_text(p, is_diff_scenario):
+    if pd.isna(p):
+        return "-"
+    return f"{p:+.1f} EUR/MWh" if is_diff_scenario else f"{p:.1f} EUR/MWh"
+
+def _build_map(ax, gdf, bg_map, cmap, norm, scenario_title, animated=False):
+    """
+    Zeichnet Hintergrund, Zonen und Beschriftungen EINMAL.
+    Gibt die Artists zurueck, die sich pro Frame aendern (siehe _show_frame):
+    Zonen-Collection (Farbe ueber set_array), Preis-Texte und Titel.
+    animated=True: Zonenflaechen ohne Rand; Raender ('edges') und Zonennamen
+    liegen darueber und werden beim Blitting nur einmal gerendert (siehe _Blitter),
+    alles Genannte wird nur per Blitting gezeichnet.
+    """
+    if bg_map is not None:
+        bg_map.plot(ax=ax, facecolor='#dce6f2', edgecolor='#999999', linewidth=0.5)
+    
+    # Zonen als eine Collection; aeltere geopandas-Versionen zerlegen MultiPolygone
+    # in Teilflaechen -> part_rows ordnet jeden Pfad seiner Zeile in gdf zu
+    n_before = len(ax.collections)
+    if animated:
+        gdf.plot(ax=ax, alpha=0.85, edgecolor='none', linewidth=0)
+    else:
+        gdf.plot(ax=ax, alpha=0.85, edgecolor='#005b96', linewidth=2)
+    zones = ax.collections[n_before]
+    if len(zones.get_paths()) == len(gdf):
+        part_rows = np.arange(len(gdf))
+    else:
+        part_rows = np.repeat(np.arange(len(gdf)), gdf.geometry.count_geometries().to_numpy())
+    zones.set_cmap(plt.get_cmap(cmap).with_extremes(bad='#cccccc'))
+    zones.set_norm(norm)
+    zones.set_array(np.ma.masked_invalid(np.full(len(part_rows), np.nan)))
+    
+    stroke = [matplotlib.patheffects.withStroke(linewidth=3, foreground='white')]
+    name_texts = []
+    value_texts = []
+    for zone_name, geom in zip(gdf['zone'], gdf.geometry):
+        pt = geom.representative_point()
+        dx, dy = LABEL_OFFSETS.get(zone_name, (0, 0))
+        pt_x, pt_y = pt.x + dx, pt.y + dy
         
-        gdf_list.append(temp_gdf)
+        name_texts.append(ax.text(
+            pt_x, pt_y + 0.3,
+            DISPLAY_NAMES.get(zone_name, zone_name),
+            ha='center', va='bottom',
+            fontsize=10,
+            color='#000000',
+            fontweight='bold',
+            path_effects=stroke,
+            zorder=10
+        ))
+        value_texts.append(ax.text(
+            pt_x, pt_y - 0.2,
+            "-",
+            ha='center', va='top',
+            fontsize=12,
+            fontweight='bold',
+            color='#000000',
+            path_effects=stroke,
+            zorder=10
+        ))
+    
+    ax.set_xlim(5, 16)
+    ax.set_ylim(47, 55.5)
+    title = ax.set_title(scenario_title, fontsize=14, fontweight='bold')
+    ax.axis('off')
+    
+    # Reihenfolge = Zeichenreihenfolge beim Blitting (Namen liegen ueber den Zonen)
+    artists = {'zones': zones, 'part_rows': part_rows, 'names': name_texts,
+               'values': value_texts, 'title': title, 'edges': None}
+    if animated:
+        # Raender separat (aendern sich nie) -> Teil des Overlays, siehe _Blitter
+        n_before = len(ax.collections)
+        gdf.boundary.plot(ax=ax, color='#005b96', linewidth=2, alpha=0.85)
+        artists['edges'] = ax.collections[n_before]
+        for a in [zones, artists['edges'], *name_texts, *value_texts, title]:
+            a.set_animated(True)
+    return artists
+
+def _show_frame(artists, prices, label_title, scenario_title, is_diff_scenario):
+    """Setzt Farben, Preis-Texte und Titel eines Frames (ohne neu zu zeichnen)."""
+    prices = np.asarray(prices, dtype=float)
+    artists['zones'].set_array(np.ma.masked_invalid(prices[artists['part_rows']]))
+    for text, p in zip(artists['values'], prices):
+        text.set_text(_price_text(p, is_diff_scenario))
+    artists['title'].set_text(f"{scenario_title}\n{label_title}")
+
+class _Blitter:
+    """
+    Blitting (wie in der Matplotlib-Doku): der statische Teil der Figure wird nach
+    jedem vollen Zeichnen gespeichert, pro Frame werden nur die animierten Artists
+    darauf gezeichnet und nur die Bereiche aus regions() ins Fenster kopiert.
+    
+    under / over: Artists, die pro Frame neu gezeichnet werden (unter bzw. ueber dem Overlay).
+    overlay: Artists, die sich nie aendern, aber ueber `under` liegen muessen (Zonenraender,
+    Zonennamen). Sie werden nach jedem vollen Zeichnen einmal auf transparentem Grund
+    gerendert; pro Frame werden nur deren (wenige) Pixel in den Agg-Puffer geblendet.
+    regions: Funktion -> Liste von Bboxes (Pixel), die pro Frame kopiert werden.
+    """
+    
+    def __init__(self, canvas, under, overlay=(), over=(), regions=None):
+        self.canvas = canvas
+        self.under = list(under)
+        self.overlay = list(overlay)
+        self.over = list(over)
+        self.regions = regions or (lambda: [canvas.figure.bbox])
+        self.background = None
+        self.overlay_px = None
+        canvas.mpl_connect('draw_event', self._on_draw)
     
-    if gdf_list:
-        print(f"  {len(gdf_list)} Frames erstellt")
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        if self.overlay:
+            self._render_overlay()
+        self._draw_animated()
     
-    return gdf_list, monthly_profiles
+    def _render_overlay(self):
+        # Renderer leeren (transparent), nur das Overlay zeichnen, belegte Pixel merken
+        renderer = self.canvas.get_renderer()
+        renderer.clear()
+        for a in self.overlay:
+            self.canvas.figure.draw_artist(a)
+        buf = np.asarray(self.canvas.buffer_rgba())
+        rows, cols = np.nonzero(buf[..., 3])
+        alpha = buf[rows, cols, 3:4].astype(np.float32) / 255.0
+        self.overlay_px = (rows, cols, buf[rows, cols, :3].astype(np.float32) * alpha, alpha)
+        self.canvas.restore_region(self.background)
+    
+    def _blend_overlay(self):
+        # Agg-Puffer ist RGBA ohne Vormultiplikation; Hintergrund der Karte ist deckend
+        rows, cols, color, alpha = self.overlay_px
+        buf = np.asarray(self.canvas.buffer_rgba())
+        below = buf[rows, cols, :3].astype(np.float32)
+        buf[rows, cols, :3] = (color + below * (1.0 - alpha) + 0.5).astype(np.uint8)
+    
+    def _draw_animated(self):
+        fig = self.canvas.figure
+        for a in self.under:
+            fig.draw_artist(a)
+        if self.overlay_px is not None:
+            self._blend_overlay()
+        for a in self.over:
+            fig.draw_artist(a)
+    
+    def update(self):
+        if self.background is None:
+            self.canvas.draw()
+            return
+        self.canvas.restore_region(self.background)
+        self._draw_animated()
+        for bbox in self.regions():
+            self.canvas.blit(bbox)
+        self.canvas.flush_events()
 
-def run_visualization(gdf_list, monthly_profiles, zone_names, scenario_id, script_dir):
+# ============================================================================
+# VIDEO-EXPORT
+# ============================================================================
+# Frames werden off-screen (Agg) gerendert und als RGB-Arrays direkt an den
+# ffmpeg-Writer gegeben - keine PNG-Dateien. Mit workers > 1 rendert jeder
+# Prozess mit einer eigenen Figure Bloecke von Frames, das Schreiben bleibt in
+# der richtigen Reihenfolge.
+
+_VIDEO_WORKER = {}
+
+def _video_figure(gdf, bg_map, cmap, vmin, vmax, cbar_label, scenario_title, longest_label):
+    """
+    Off-screen-Figure fuer den Video-Export (10 x 14 Zoll, 100 dpi) und der
+    Bildausschnitt wie bei savefig(bbox_inches='tight', pad_inches=0.1),
+    auf gerade Pixelzahlen gekuerzt (H.264).
+    """
+    fig = Figure(figsize=(10, 14), dpi=100)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    
+    sm = ScalarMappable(cmap=cmap, norm=Normalize(vmin=vmin, vmax=vmax))
+    cbar = fig.colorbar(sm, ax=ax, orientation='horizontal', pad=0.05, aspect=40, shrink=0.8)
+    cbar.set_label(cbar_label, fontsize=10)
+    artists = _build_map(ax, gdf, bg_map, cmap, sm.norm, scenario_title)
+    
+    # Ausschnitt einmal mit dem breitesten Titel bestimmen -> fuer alle Frames gleich
+    artists['title'].set_text(f"{scenario_title}\n{longest_label}")
+    canvas.draw()
+    bbox = fig.get_tightbbox(canvas.get_renderer()).padded(0.1)
+    height, width = canvas.get_width_height()[::-1]
+    c0 = max(int(np.floor(bbox.x0 * fig.dpi)), 0)
+    c1 = min(int(np.ceil(bbox.x1 * fig.dpi)), width)
+    r0 = max(height - int(np.ceil(bbox.y1 * fig.dpi)), 0)
+    r1 = min(height - int(np.floor(bbox.y0 * fig.dpi)), height)
+    c1 -= (c1 - c0) % 2
+    r1 -= (r1 - r0) % 2
+    return canvas, artists, (r0, r1, c0, c1)
+
+def _video_worker_init(*figure_args):
+    _VIDEO_WORKER['figure'] = _video_figure(*figure_args)
+
+def _render_frames(prices, labels, scenario_title, is_diff_scenario):
+    """Rendert einen Block von Frames mit der Figure dieses Prozesses -> Liste von RGB-Arrays."""
+    canvas, artists, (r0, r1, c0, c1) = _VIDEO_WORKER['figure']
+    frames = []
+    for frame_prices, label in zip(prices, labels):
+        _show_frame(artists, frame_prices, label, scenario_title, is_diff_scenario)
+        canvas.draw()
+        frames.append(np.asarray(canvas.buffer_rgba())[r0:r1, c0:c1, :3].copy())
+    return frames
+
+def export_video(output_path, gdf, frame_prices, frame_labels, bg_map, cmap, vmin, vmax,
+                 cbar_label, scenario_title, is_diff_scenario, fps, workers=1, chunk=8):
+    """
+    Schreibt die Animation als MP4 (libx264, yuv420p).
+    
+    gdf: Zonen-Geometrien (Spalten zone, geometry)
+    frame_prices: (n_frames, n_zones) Preise in der Zeilenreihenfolge von gdf
+    frame_labels: Funktion Frame-Index -> Zeitangabe (zweite Titelzeile), z.B. frames.label;
+                  wird blockweise aufgerufen, es gibt keine Liste aller Titel
+    workers: Anzahl Render-Prozesse (1 = im aktuellen Prozess), chunk: Frames pro Auftrag
+    
+    Gibt (Breite, Hoehe) der Frames zurueck.
+    """
+    frame_prices = np.asarray(frame_prices, dtype=float)
+    n_frames = len(frame_prices)
+    longest_label = max((frame_labels(i) for i in range(n_frames)), key=len)
+    figure_args = (gdf[['zone', 'geometry']], bg_map, cmap, vmin, vmax, cbar_label,
+                   scenario_title, longest_label)
+    starts = range(0, n_frames, chunk)
+    
+    writer = imageio.get_writer(
+        str(output_path),
+        fps=fps,
+        codec='libx264',
+        quality=8,
+        pixelformat='yuv420p',
+        macro_block_size=1,  # Groesse ist schon gerade, nicht auf 16 hochskalieren
+    )
+    bar = tqdm(total=n_frames, desc="  Rendering", unit="frame", ncols=70,
+               bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]')
+    size = None
+    
+    def block_labels(i):
+        return [frame_labels(k) for k in range(i, min(i + chunk, n_frames))]
+    
+    def write(frames):
+        nonlocal size
+        for frame in frames:
+            writer.append_data(frame)
+        size = (frames[-1].shape[1], frames[-1].shape[0])
+        bar.update(len(frames))
+    
+    try:
+        if workers <= 1:
+            _video_worker_init(*figure_args)
+            try:
+                for i in starts:
+                    write(_render_frames(frame_prices[i:i + chunk], block_labels(i),
+                                         scenario_title, is_diff_scenario))
+            finally:
+                _VIDEO_WORKER.clear()
+        else:
+            # hoechstens 2 Auftraege pro Prozess unterwegs -> Speicher bleibt begrenzt
+            with ProcessPoolExecutor(max_workers=workers, initializer=_video_worker_init,
+                                     initargs=figure_args) as ex:
+                pending = deque()
+                todo = iter(starts)
+                
+                def submit(i):
+                    pending.append(ex.submit(_render_frames, frame_prices[i:i + chunk],
+                                             block_labels(i), scenario_title, is_diff_scenario))
+                
+                for i in islice(todo, 2 * workers):
+                    submit(i)
+                while pending:
+                    frames = pending.popleft().result()
+                    nxt = next(todo, None)
+                    if nxt is not None:
+                        submit(nxt)
+                    write(frames)
+    finally:
+        bar.close()
+        writer.close()
+    return size
+
+def run_visualization(frames, monthly_profiles, zone_names, scenario_id, script_dir):
     """Startet die Matplotlib-Visualisierung."""
     
     is_diff_scenario = 'diff' in scenario_id
     
-    # Hintergrundkarte laden
-    try:
-        world_map = gpd.read_file(gpd.datasets.get_path('naturalearth_lowres'))
-        bg_map = world_map.clip(box(3, 46, 17, 56))
-    except:
-        bg_map = None
+    # Hintergrundkarte laden (gecacht, siehe geodata.load_background_map)
+    bg_map = geodata.load_background_map()
 
     # Einheitliche Farbskala aus config.py
     if is_diff_scenario:
@@ -134,15 +497,7 @@ def run_visualization(gdf_list, monthly_profiles, zone_names, scenario_id, scrip
 
     sm = plt.cm.ScalarMappable(cmap=cmap, norm=plt.Normalize(vmin=vmin, vmax=vmax))
 
-    scenario_titles = {
-        'de_single': 'Deutschland (eine Zone)',
-        'z4_insel': '4 Zonen - Inselbetrachtung',
-        'z4_coupled': '4 Zonen - Gekoppelt',
-        'z4_diff': '4 Zonen - Preisdifferenz',
-        'ns_insel': 'Nord-Sued - Inselbetrachtung',
-        'ns_coupled': 'Nord-Sued - Gekoppelt',
-        'ns_diff': 'Nord-Sued - Preisdifferenz',
-    }
+    scenario_title = SCENARIO_TITLES.get(scenario_id, scenario_id)
 
     fig, ax = plt.subplots(figsize=(10, 12))
     fig.canvas.manager.set_window_title(f'Merit-Order Visualisierung - {scenario_id}')
@@ -153,94 +508,37 @@ def run_visualization(gdf_list, monthly_profiles, zone_names, scenario_id, scrip
     cbar = fig.colorbar(sm, ax=ax, orientation='horizontal', pad=0.02, aspect=40, shrink=0.8)
     cbar.set_label(cbar_label, fontsize=10)
 
+    # Karte einmal zeichnen; pro Frame nur Farben + Texte tauschen (Blitting)
+    map_artists = _build_map(ax, frames.gdf, bg_map, cmap, sm.norm, scenario_title, animated=True)
+
+    # valfmt: einfacher Text statt Mathtext (der Standard-Formatter parst bei jedem Frame)
+    slider = Slider(ax_slider, 'Frame', 0, len(frames) - 1, valinit=0, valstep=1, valfmt='%d')
+    slider.drawon = False  # kein volles Neuzeichnen bei jeder Bewegung
+    slider_artists = [a for a in (slider.poly, getattr(slider, '_handle', None), slider.valtext) if a is not None]
+    for a in slider_artists:
+        a.set_animated(True)
+    
+    def blit_regions():
+        # Karte + Titel (Streifen bis zum oberen Rand) und Slider, nicht die ganze Figure
+        top = Bbox.from_extents(fig.bbox.x0, ax.bbox.y0, fig.bbox.x1, fig.bbox.y1)
+        return [top, ax_slider.bbox]
+    
+    blitter = _Blitter(
+        fig.canvas,
+        under=[map_artists['zones']],
+        overlay=[map_artists['edges'], *map_artists['names']],
+        over=[*map_artists['values'], map_artists['title'], *slider_artists],
+        regions=blit_regions,
+    )
+
     def update_plot(frame_idx):
         frame_idx = int(frame_idx)
-        ax.clear()
-        
-        data = gdf_list[frame_idx]
-        title_str = data['label_title'].iloc[0]
-        scenario_title = scenario_titles.get(scenario_id, scenario_id)
-        
-        if bg_map is not None:
-            bg_map.plot(ax=ax, facecolor='#dce6f2', edgecolor='#999999', linewidth=0.5)
-        
-        data.plot(
-            column='price', 
-            ax=ax, 
-            cmap=cmap, 
-            vmin=vmin, 
-            vmax=vmax,
-            alpha=0.85, 
-            edgecolor='#005b96',
-            linewidth=2,
-            missing_kwds={'color': '#cccccc'}
-        )
-        
-        for _, geo_row in data.iterrows():
-            zone_name = geo_row['zone']
-            p = geo_row['price']
-            
-            pt = geo_row['geometry'].representative_point()
-            pt_x, pt_y = pt.x, pt.y
-            
-            offsets = {
-                "TenneT": (0, -0.5),
-                "50Hertz": (0.2, -0.3),
-                "de": (0, 0),
-                "north": (0, 0.5),
-                "south": (0, -0.3),
-            }
-            dx, dy = offsets.get(zone_name, (0, 0))
-            pt_x += dx
-            pt_y += dy
-            
-            display_names = {
-                'de': 'DEUTSCHLAND',
-                'north': 'NORD',
-                'south': 'SUED',
-            }
-            display_name = display_names.get(zone_name, zone_name)
-            
-            if pd.notna(p):
-                if is_diff_scenario:
-                    val_txt = f"{p:+.1f} EUR/MWh"
-                else:
-                    val_txt = f"{p:.1f} EUR/MWh"
-            else:
-                val_txt = "-"
-            
-            ax.text(
-                pt_x, pt_y + 0.3, 
-                display_name, 
-                ha='center', va='bottom',
-                fontsize=10, 
-                color='#000000', 
-                fontweight='bold',
-                path_effects=[matplotlib.patheffects.withStroke(linewidth=3, foreground='white')],
-                zorder=10
-            )
-            
-            ax.text(
-                pt_x, pt_y - 0.2, 
-                val_txt, 
-                ha='center', va='top',
-                fontsize=12, 
-                fontweight='bold', 
-                color='#000000',
-                path_effects=[matplotlib.patheffects.withStroke(linewidth=3, foreground='white')],
-                zorder=10
-            )
-        
-        ax.set_xlim(5, 16)
-        ax.set_ylim(47, 55.5)
-        ax.set_title(f"{scenario_title}\n{title_str}", fontsize=14, fontweight='bold')
-        ax.axis('off')
-
-    slider = Slider(ax_slider, 'Frame', 0, len(gdf_list) - 1, valinit=0, valstep=1)
+        _show_frame(map_artists, frames.prices[frame_idx], frames.label(frame_idx),
+                    scenario_title, is_diff_scenario)
     
     def on_slider_change(val):
         update_plot(val)
-        fig.canvas.draw_idle()
+        blitter.update()
     
     slider.on_changed(on_slider_change)
 
@@ -263,135 +561,44 @@ def run_visualization(gdf_list, monthly_profiles, zone_names, scenario_id, scrip
         output_path = output_dir / video_filename
         
         print(f"  Ziel: {output_path}")
-        print(f"  Frames: {len(gdf_list)}")
+        print(f"  Frames: {len(frames)}")
         print(f"  FPS: {config.VIDEO_SETTINGS['fps']}")
         print("-"*60)
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            frame_paths = []
-            
-            # Figure mit fester Groesse (durch 2 teilbar fuer H.264!)
-            fig_video, ax_video = plt.subplots(figsize=(10, 14), dpi=100)
-            
-            cbar_video = fig_video.colorbar(sm, ax=ax_video, orientation='horizontal', 
-                                            pad=0.05, aspect=40, shrink=0.8)
-            cbar_video.set_label(cbar_label, fontsize=10)
-            
-            print("\nErstelle Frames...")
-            for i in tqdm(range(len(gdf_list)), desc="  Rendering", unit="frame", 
-                         ncols=70, bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]'):
-                
-                ax_video.clear()
-                data = gdf_list[i]
-                title_str = data['label_title'].iloc[0]
-                scenario_title = scenario_titles.get(scenario_id, scenario_id)
-                
-                if bg_map is not None:
-                    bg_map.plot(ax=ax_video, facecolor='#dce6f2', edgecolor='#999999', linewidth=0.5)
-                
-                data.plot(
-                    column='price', 
-                    ax=ax_video, 
-                    cmap=cmap, 
-                    vmin=vmin, 
-                    vmax=vmax,
-                    alpha=0.85, 
-                    edgecolor='#005b96',
-                    linewidth=2,
-                    missing_kwds={'color': '#cccccc'}
-                )
-                
-                for _, geo_row in data.iterrows():
-                    zone_name = geo_row['zone']
-                    p = geo_row['price']
-                    pt = geo_row['geometry'].representative_point()
-                    pt_x, pt_y = pt.x, pt.y
-                    
-                    offsets = {"TenneT": (0, -0.5), "50Hertz": (0.2, -0.3), 
-                              "north": (0, 0.5), "south": (0, -0.3)}
-                    dx, dy = offsets.get(zone_name, (0, 0))
-                    pt_x += dx
-                    pt_y += dy
-                    
-                    display_names = {'de': 'DEUTSCHLAND', 'north': 'NORD', 'south': 'SUED'}
-                    display_name = display_names.get(zone_name, zone_name)
-                    
-                    if pd.notna(p):
-                        val_txt = f"{p:+.1f} EUR/MWh" if is_diff_scenario else f"{p:.1f} EUR/MWh"
-                    else:
-                        val_txt = "-"
-                    
-                    ax_video.text(pt_x, pt_y + 0.3, display_name, ha='center', va='bottom',
-                                 fontsize=10, color='black', fontweight='bold',
-                                 path_effects=[matplotlib.patheffects.withStroke(linewidth=3, foreground='white')])
-                    ax_video.text(pt_x, pt_y - 0.2, val_txt, ha='center', va='top',
-                                 fontsize=12, fontweight='bold', color='black',
-                                 path_effects=[matplotlib.patheffects.withStroke(linewidth=3, foreground='white')])
-                
-                ax_video.set_xlim(5, 16)
-                ax_video.set_ylim(47, 55.5)
-                ax_video.set_title(f"{scenario_title}\n{title_str}", fontsize=14, fontweight='bold')
-                ax_video.axis('off')
-                
-                frame_path = os.path.join(temp_dir, f"frame_{i:04d}.png")
-                fig_video.savefig(frame_path, dpi=100, bbox_inches='tight', pad_inches=0.1)
-                frame_paths.append(frame_path)
-            
-            plt.close(fig_video)
-            
-            # Bilder laden und Groesse anpassen (durch 2 teilbar)
-            print("\nErstelle Video...")
+        workers = config.VIDEO_SETTINGS.get('workers') or os.cpu_count() or 1
+        print(f"  Render-Prozesse: {workers}")
+        
+        try:
+            w, h = export_video(
+                output_path, frames.gdf, frames.prices, frames.label, bg_map, cmap, vmin, vmax,
+                cbar_label, scenario_title, is_diff_scenario,
+                fps=config.VIDEO_SETTINGS['fps'],
+                workers=workers,
+                chunk=config.VIDEO_SETTINGS.get('chunk', 8),
+            )
+            print(f"  Bildgroesse: {w}x{h} (H.264 kompatibel)")
             
-            # Erstes Bild laden um Groesse zu pruefen
-            first_frame = imageio.imread(frame_paths[0])
-            h, w = first_frame.shape[:2]
+            file_size = output_path.stat().st_size / 1024 / 1024
+            duration = len(frames) / config.VIDEO_SETTINGS['fps']
             
-            # Auf gerade Zahlen runden (H.264 Anforderung)
-            new_h = h if h % 2 == 0 else h - 1
-            new_w = w if w % 2 == 0 else w - 1
+            print("\n" + "="*60)
+            print("VIDEO ERFOLGREICH GESPEICHERT!")
+            print("="*60)
+            print(f"  Pfad: {output_path}")
+            print(f"  Groesse: {file_size:.1f} MB")
+            print(f"  Dauer: {duration:.1f} Sekunden")
+            print("="*60 + "\n")
             
-            print(f"  Bildgroesse: {w}x{h} -> {new_w}x{new_h} (H.264 kompatibel)")
+            gui.show_info(
+                "Video-Export erfolgreich", 
+                f"Video gespeichert unter:\n\n{output_path}\n\n"
+                f"Groesse: {file_size:.1f} MB\n"
+                f"Dauer: {duration:.1f} Sekunden"
+            )
             
-            try:
-                writer = imageio.get_writer(
-                    str(output_path), 
-                    fps=config.VIDEO_SETTINGS['fps'],
-                    codec='libx264',
-                    quality=8,
-                    pixelformat='yuv420p',
-                    output_params=['-vf', f'scale={new_w}:{new_h}']
-                )
-                
-                for frame_path in tqdm(frame_paths, desc="  Encoding", unit="frame",
-                                      ncols=70, bar_format='{l_bar}{bar}| {n_fmt}/{total_fmt} [{elapsed}<{remaining}]'):
-                    frame = imageio.imread(frame_path)
-                    # Zuschneiden auf gerade Groesse
-                    frame = frame[:new_h, :new_w]
-                    writer.append_data(frame)
-                
-                writer.close()
-                
-                file_size = output_path.stat().st_size / 1024 / 1024
-                duration = len(gdf_list) / config.VIDEO_SETTINGS['fps']
-                
-                print("\n" + "="*60)
-                print("VIDEO ERFOLGREICH GESPEICHERT!")
-                print("="*60)
-                print(f"  Pfad: {output_path}")
-                print(f"  Groesse: {file_size:.1f} MB")
-                print(f"  Dauer: {duration:.1f} Sekunden")
-                print("="*60 + "\n")
-                
-                gui.show_info(
-                    "Video-Export erfolgreich", 
-                    f"Video gespeichert unter:\n\n{output_path}\n\n"
-                    f"Groesse: {file_size:.1f} MB\n"
-                    f"Dauer: {duration:.1f} Sekunden"
-                )
-                
-            except Exception as e:
-                print(f"\nFEHLER beim Video-Export: {e}")
-                gui.show_error("Export fehlgeschlagen", f"Fehler: {e}")
+        except Exception as e:
+            print(f"\nFEHLER beim Video-Export: {e}")
+            gui.show_error("Export fehlgeschlagen", f"Fehler: {e}")
 
     def on_key(event):
         curr = slider.val
@@ -400,9 +607,13 @@ def run_visualization(gdf_list, monthly_profiles, zone_names, scenario_id, scrip
         elif event.key == 'left':
             slider.set_val(max(curr - 1, slider.valmin))
         elif event.key == 'up':
-            slider.set_val(min(curr + 24, slider.valmax))
+            slider.set_val(min(curr + frames.day_step, slider.valmax))
         elif event.key == 'down':
-            slider.set_val(max(curr - 24, slider.valmin))
+            slider.set_val(max(curr - frames.day_step, slider.valmin))
+        elif event.key == 'pageup':
+            slider.set_val(min(curr + 7 * frames.day_step, slider.valmax))
+        elif event.key == 'pagedown':
+            slider.set_val(max(curr - 7 * frames.day_step, slider.valmin))
         elif event.key == 'home':
             slider.set_val(0)
         elif event.key == 'end':
@@ -421,8 +632,13 @@ def run_visualization(gdf_list, monthly_profiles, zone_names, scenario_id, scrip
     print(f"Farbskala: {vmin} - {vmax} EUR/MWh (EINHEITLICH)")
     print("-"*50)
     print("Steuerung:")
-    print("  <- ->    Stunde vor/zurueck")
-    print("  Pfeil hoch/runter  Monat vor/zurueck (+/-24 Frames)")
+    if isinstance(frames, TimeSeriesFrames):
+        print("  <- ->    Zeitschritt vor/zurueck")
+        print(f"  Pfeil hoch/runter  Tag vor/zurueck (+/-{frames.day_step} Frames)")
+        print("  Bild hoch/runter   Woche vor/zurueck")
+    else:
+        print("  <- ->    Stunde vor/zurueck")
+        print("  Pfeil hoch/runter  Monat vor/zurueck (+/-24 Frames)")
     print("  Home     Zum Anfang")
     print("  End      Zum Ende")
     print("  V        VIDEO EXPORTIEREN (MP4)")